@@ -12,20 +12,45 @@ Usage:
     arr-maintenance.py --dry-run        # Preview changes without applying
     arr-maintenance.py --debug          # Verbose output
 
+Instances are maintained concurrently, each with its log output kept
+together and a per-instance deadline:
+    ARR_MAINTENANCE_WORKERS=4           # Instances worked on at once
+    ARR_MAINTENANCE_DEADLINE=900        # Seconds per instance (0 disables)
+
+Queue output paths are probed concurrently, each directory with a timeout
+so a hung FUSE mount (zurg, decypharr) can't block the run:
+    ARR_MAINTENANCE_PROBE_WORKERS=16    # Directories probed at once
+    ARR_MAINTENANCE_PROBE_TIMEOUT=10    # Seconds before a mount counts as hung
+
 Designed to run after mdblist-sync.py via systemd timer.
 """
 
 import json
 import os
+import queue
 import re
 import sys
+import threading
 import time
-import xml.etree.ElementTree as ET
+import unicodedata
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+
+# Shared helpers live in the repo's lib/ (or the /opt/swizzin-scripts checkout)
+for _lib_dir in (
+    Path(__file__).resolve().parent / "lib",
+    Path("/opt/swizzin-extras/lib"),
+    Path("/opt/swizzin-scripts/lib"),
+):
+    if (_lib_dir / "http_utils.py").is_file():
+        sys.path.insert(0, str(_lib_dir))
+        break
+
+from http_utils import HTTPClient, RetryPolicy, iter_json_array  # noqa: E402
+from metrics import Metrics  # noqa: E402
+import arr_registry  # noqa: E402
 
 # =============================================================================
 # Configuration
@@ -39,6 +64,24 @@ ALL_MODE = not DEDUP_ONLY and not QUEUE_ONLY
 
 LOG_FILE = "/var/log/arr-maintenance.log"
 
+# Prometheus textfile with per-endpoint latency and phase timings (empty disables)
+METRICS_FILE = os.environ.get(
+    "ARR_MAINTENANCE_METRICS",
+    "/opt/swizzin-extras/metrics/arr-maintenance.prom",
+)
+METRICS = Metrics("arr_maintenance", METRICS_FILE)
+
+# Instances maintained concurrently, and how long each may take (seconds,
+# 0 = no limit). Requests are cut short at the deadline; a task still stuck
+# DEADLINE_GRACE seconds later (e.g. in a hung filesystem call) is abandoned.
+WORKERS = max(1, int(os.environ.get("ARR_MAINTENANCE_WORKERS", "4")))
+DEADLINE = max(0, int(os.environ.get("ARR_MAINTENANCE_DEADLINE", "900")))
+DEADLINE_GRACE = 30
+
+# Concurrent output path probes in queue cleanup, and how long one may take
+PROBE_WORKERS = max(1, int(os.environ.get("ARR_MAINTENANCE_PROBE_WORKERS", "16")))
+PROBE_TIMEOUT = max(1, int(os.environ.get("ARR_MAINTENANCE_PROBE_TIMEOUT", "10")))
+
 
 # =============================================================================
 # Logging
@@ -52,19 +95,34 @@ class Colors:
     NC = "\033[0m"
 
 
-def log(msg: str):
-    ts = time.strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{ts}] {msg}"
-    print(line, flush=True)
+# Worker threads maintaining an instance capture their output here so each
+# instance's log lines are printed as one contiguous block.
+_log_local = threading.local()
+
+
+def _write(lines: List[str]):
+    for line in lines:
+        print(line, flush=True)
     try:
         with open(LOG_FILE, "a") as f:
-            # Strip ANSI codes for log file
-            clean = re.sub(r"\033\[[0-9;]*m", "", line)
-            f.write(clean + "\n")
+            for line in lines:
+                # Strip ANSI codes for log file
+                clean = re.sub(r"\033\[[0-9;]*m", "", line)
+                f.write(clean + "\n")
     except OSError:
         pass
 
 
+def log(msg: str):
+    ts = time.strftime("%Y-%m-%d %H:%M:%S")
+    line = f"[{ts}] {msg}"
+    buffer = getattr(_log_local, "buffer", None)
+    if buffer is not None:
+        buffer.append(line)
+    else:
+        _write([line])
+
+
 def log_debug(msg: str):
     if DEBUG:
         log(f"  [debug] {msg}")
@@ -86,180 +144,402 @@ def log_success(msg: str):
 # Arr API client
 # =============================================================================
 
+def log_retry(method: str, url: str, attempt: int, delay: float, reason: str):
+    # Path only: the API key is in the query string
+    log_warn(f"{method} {url.split('?')[0]} failed ({reason}), retry {attempt} in {delay:.1f}s")
+
+
+# One keep-alive connection pool shared by every instance client. Transient
+# errors (restarting instance, 5xx) are retried with backoff; a host that
+# keeps failing trips its circuit breaker instead of stalling the run.
+HTTP = HTTPClient(
+    timeout=120,
+    user_agent="arr-maintenance/1.0",
+    retry=RetryPolicy(max_attempts=3, retry_budget=30, on_retry=log_retry),
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of sending a request once the instance's deadline has passed."""
+
+
+class TaskAbandoned(DeadlineExceeded):
+    """Raised instead of a mutating request once the run has given up on the task."""
+
+
 class ArrAPI:
     def __init__(self, base_url: str, api_key: str, timeout: int = 120):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
-
-    def _request(self, method: str, path: str, data: dict = None) -> any:
+        # time.monotonic() value after which no more requests are made
+        self.deadline: Optional[float] = None
+        # Set by the main thread when it abandons this instance's task; from
+        # then on nothing is changed on the instance
+        self.abandoned = False
+
+    def _timeout(self) -> float:
+        """Request timeout, shortened so no request outlives the deadline."""
+        if self.deadline is None:
+            return self.timeout
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"{self.base_url}: deadline exceeded")
+        return min(self.timeout, remaining)
+
+    def _url(self, path: str) -> str:
         sep = "&" if "?" in path else "?"
-        url = f"{self.base_url}/api/v3{path}{sep}apikey={self.api_key}"
+        return f"{self.base_url}/api/v3{path}{sep}apikey={self.api_key}"
+
+    def _send(self, method: str, path: str, body: bytes = None, headers: dict = None):
+        self.check_abandoned(method)
+        with METRICS.request("arr", method, path) as call:
+            resp = HTTP.request(method, self._url(path), body=body, headers=headers, timeout=self._timeout())
+            call.bytes = len(resp.body)
+        return resp
+
+    def check_abandoned(self, method: str = "DELETE"):
+        """Raise TaskAbandoned for a mutating request after the task was abandoned."""
+        if self.abandoned and method != "GET":
+            raise TaskAbandoned(f"{self.base_url}: task abandoned, not sending {method}")
+
+    def _request(self, method: str, path: str, data: dict = None) -> Any:
+        self.check_abandoned(method)
         body = json.dumps(data).encode() if data else None
         headers = {"Content-Type": "application/json"} if data else {}
-        req = Request(url, data=body, headers=headers, method=method)
-        resp = urlopen(req, timeout=self.timeout)
+        resp = self._send(method, path, body, headers)
         if resp.status == 200:
-            return json.loads(resp.read())
+            return resp.json()
         return None
 
-    def get(self, path: str) -> any:
+    def get(self, path: str) -> Any:
         return self._request("GET", path)
 
+    def iter_json(self, path: str) -> Iterator[Any]:
+        """
+        GET an endpoint returning a JSON array and yield its elements as
+        they are parsed, without holding the whole response in memory.
+        """
+        with METRICS.request("arr", "GET", path) as call:
+            with HTTP.stream("GET", self._url(path), timeout=self._timeout()) as chunks:
+                def counted():
+                    for chunk in chunks:
+                        call.bytes += len(chunk)
+                        yield chunk
+                yield from iter_json_array(counted())
+
     def delete(self, path: str) -> bool:
         try:
-            sep = "&" if "?" in path else "?"
-            url = f"{self.base_url}/api/v3{path}{sep}apikey={self.api_key}"
-            req = Request(url, method="DELETE")
-            urlopen(req, timeout=self.timeout)
+            self._send("DELETE", path)
             return True
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             log_error(f"DELETE {path} failed: {e}")
             return False
 
-    def delete_bulk(self, path: str, data: dict) -> bool:
+    def delete_bulk(self, path: str, data: dict) -> Optional[Exception]:
+        """DELETE with a JSON body. Returns None on success, else the error (HTTPError carries .code)."""
         try:
-            sep = "&" if "?" in path else "?"
-            url = f"{self.base_url}/api/v3{path}{sep}apikey={self.api_key}"
-            req = Request(
-                url,
-                data=json.dumps(data).encode(),
+            self._send(
+                "DELETE",
+                path,
+                body=json.dumps(data).encode(),
                 headers={"Content-Type": "application/json"},
-                method="DELETE",
             )
-            urlopen(req, timeout=self.timeout)
-            return True
+            return None
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             log_error(f"DELETE BULK {path} failed: {e}")
-            return False
+            return e
 
 
 # =============================================================================
 # Instance discovery
 # =============================================================================
 
-def get_master_user() -> str:
-    """Get the swizzin master username."""
-    try:
-        with open("/root/.master.info") as f:
-            return f.read().strip().split(":")[0]
-    except FileNotFoundError:
-        # Fallback: first user in /home
-        for d in sorted(Path("/home").iterdir()):
-            if d.is_dir() and not d.name.startswith("."):
-                return d.name
-    return ""
-
-
-def discover_arr_instance(config_path: str) -> Optional[Tuple[str, str, str]]:
-    """Parse config.xml to get (port, api_key, url_base)."""
-    try:
-        tree = ET.parse(config_path)
-        root = tree.getroot()
-        port = root.findtext("Port", "")
-        api_key = root.findtext("ApiKey", "")
-        url_base = root.findtext("UrlBase", "")
-        if port and api_key:
-            return port, api_key, url_base or ""
-    except Exception:
-        pass
-    return None
-
-
 def discover_all_instances() -> Tuple[List[Tuple[str, ArrAPI]], List[Tuple[str, ArrAPI]]]:
-    """Find all running Radarr and Sonarr instances."""
-    user = get_master_user()
+    """
+    Find the master user's running Radarr and Sonarr instances (shared
+    registry, probed concurrently). Other users' instances are left alone.
+    """
     radarr_instances = []
     sonarr_instances = []
 
-    config_dir = Path(f"/home/{user}/.config")
-    if not config_dir.exists():
-        return [], []
-
-    for d in sorted(config_dir.iterdir()):
-        if not d.is_dir():
+    master = arr_registry.master_user()
+    found = [
+        inst for inst in arr_registry.discover()
+        if inst.kind in ("radarr", "sonarr") and inst.user == master
+    ]
+    for inst, status, error in arr_registry.probe(found, client=HTTP):
+        if status is None:
+            log_warn(f"{inst.name} on port {inst.port} not reachable ({error}), skipping")
             continue
-        name = d.name.lower()
+        api = ArrAPI(inst.url(), inst.api_key)
+        if inst.kind == "radarr":
+            radarr_instances.append((inst.name, api))
+            log_debug(f"Found Radarr instance: {inst.name} on port {inst.port} (v{status.get('version', '?')})")
+        else:
+            sonarr_instances.append((inst.name, api))
+            log_debug(f"Found Sonarr instance: {inst.name} on port {inst.port} (v{status.get('version', '?')})")
 
-        config_xml = d / "config.xml"
-        if not config_xml.exists():
-            continue
+    return radarr_instances, sonarr_instances
 
-        result = discover_arr_instance(str(config_xml))
-        if not result:
-            continue
 
-        port, api_key, url_base = result
-        base_url = f"http://127.0.0.1:{port}"
-        if url_base:
-            base_url += f"/{url_base}"
+# =============================================================================
+# Radarr Dedup
+# =============================================================================
 
-        api = ArrAPI(base_url, api_key)
+# Title normalization for dedup blocking: accents, case, "&" vs "and",
+# punctuation, leading/trailing articles and roman numeral sequel numbers
+# are folded away, so "Amélie" == "Amelie", "The Matrix" == "Matrix, The"
+# and "Rocky II" == "Rocky 2"
+_NON_WORD = re.compile(r"[\W_]+")
+_ARTICLES = {"the", "a", "an"}
+_ROMAN = {
+    numeral: str(value)
+    for value, numeral in enumerate(
+        ["", "i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x",
+         "xi", "xii", "xiii", "xiv", "xv", "xvi", "xvii", "xviii", "xix", "xx"]
+    )
+    if value >= 2
+}
+
+# Near-year and same-collection matches are only flagged when one entry is
+# clearly inferior: fewer than this many IMDb votes AND < 10% of the other's
+INFERIOR_VOTES = 500
+
+# Same-collection, same-year movies only match when their titles share at
+# least this fraction of words (and differ in no number: "Part 1" vs "Part 2")
+COLLECTION_TITLE_SIMILARITY = 0.6
+
+# Movies per DELETE /movie/editor request
+MOVIE_DELETE_CHUNK = 100
+
+
+def normalize_title(title: str) -> str:
+    """Blocking key for a title; empty if nothing but punctuation is left."""
+    if not title.isascii():
+        title = "".join(c for c in unicodedata.normalize("NFKD", title) if not unicodedata.combining(c))
+    words = _NON_WORD.sub(" ", title.casefold().replace("&", " and ")).split()
+    if len(words) > 1 and words[0] in _ARTICLES:
+        words = words[1:]
+    if len(words) > 1 and words[-1] == "the":
+        words = words[:-1]
+    # Sequel numbers follow the title ("Rocky II"); a leading one is the title ("X")
+    return " ".join(words[:1] + [_ROMAN.get(w, w) for w in words[1:]])
+
+
+class Movie:
+    """
+    The fields of a Radarr /movie entry that dedup uses. Everything else
+    (images, overview, paths...) is dropped as each entry is parsed off the
+    stream; original and alternate titles are kept only as normalized keys.
+    """
 
-        if "radarr" in name:
-            radarr_instances.append((d.name, api))
-            log_debug(f"Found Radarr instance: {d.name} on port {port}")
-        elif "sonarr" in name:
-            sonarr_instances.append((d.name, api))
-            log_debug(f"Found Sonarr instance: {d.name} on port {port}")
+    __slots__ = ("id", "title", "year", "tmdb_id", "imdb_id", "has_file", "size_on_disk",
+                 "imdb_votes", "imdb_rating", "title_key", "aliases", "collection")
+
+    def __init__(self, data: dict):
+        imdb = (data.get("ratings") or {}).get("imdb") or {}
+        self.id = data["id"]
+        self.title = data.get("title") or ""
+        self.year = data.get("year") or 0
+        self.tmdb_id = data.get("tmdbId", "?")
+        self.imdb_id = data.get("imdbId", "?")
+        self.has_file = bool(data.get("hasFile"))
+        self.size_on_disk = data.get("sizeOnDisk") or 0
+        self.imdb_votes = imdb.get("votes") or 0
+        self.imdb_rating = imdb.get("value") or 0
+        self.title_key = normalize_title(self.title)
+        aliases = {normalize_title(data.get("originalTitle") or "")}
+        for alt in data.get("alternateTitles") or []:
+            if isinstance(alt, dict):
+                aliases.add(normalize_title(alt.get("title") or ""))
+        aliases.discard("")
+        aliases.discard(self.title_key)
+        self.aliases = tuple(aliases)
+        self.collection = ((data.get("collection") or {}).get("tmdbId")) or None
+
+    def __repr__(self) -> str:
+        return f"Movie({self.id}, {self.title!r}, {self.year})"
+
+
+class DuplicateGroup:
+    """Movies judged to be one title, with the reasons their pairs matched."""
+
+    __slots__ = ("movies", "reasons")
+
+    def __init__(self, movies: List[Movie], reasons: List[str]):
+        self.movies = movies
+        self.reasons = reasons
+
+    @property
+    def label(self) -> str:
+        first = min(self.movies, key=lambda m: m.id)
+        return f"{first.title} ({first.year})"
+
+
+def fetch_movies(api: ArrAPI) -> List[Movie]:
+    """
+    Stream /movie into compact Movie records. Peak memory is one raw entry
+    plus a read chunk on top of the records, whatever the library size.
+    """
+    return [Movie(m) for m in api.iter_json("/movie") if isinstance(m, dict) and "id" in m]
 
-    return radarr_instances, sonarr_instances
 
+def clearly_inferior(a: Movie, b: Movie) -> bool:
+    """One of the two has few IMDb votes and under 10% of the other's."""
+    max_v = max(a.imdb_votes, b.imdb_votes)
+    min_v = min(a.imdb_votes, b.imdb_votes)
+    return min_v < INFERIOR_VOTES and max_v > 0 and min_v < max_v * 0.1
 
-# =============================================================================
-# Radarr Dedup
-# =============================================================================
 
-def find_radarr_duplicates(api: ArrAPI) -> Dict[str, List[dict]]:
+def same_exact_title(a: Movie, b: Movie) -> bool:
+    """Main titles equal as Radarr shows them, apart from case and a trailing dot."""
+    return a.title.casefold().rstrip(".") == b.title.casefold().rstrip(".")
+
+
+def similar_titles(a: Movie, b: Movie) -> bool:
     """
-    Find duplicate movies:
-    1. Exact: same title + year, different TMDB IDs
-    2. Near-year: same title, year ±1, where one is clearly inferior
+    Whether any title of one (main, original or alternate) is close to any
+    title of the other: word-set Jaccard similarity of at least
+    COLLECTION_TITLE_SIMILARITY, with no differing numbers.
     """
-    movies = api.get("/movie")
-    if not movies:
-        return {}
+    for ka in (a.title_key,) + a.aliases:
+        wa = set(ka.split())
+        for kb in (b.title_key,) + b.aliases:
+            wb = set(kb.split())
+            if not wa or not wb:
+                continue
+            if any(w.isdigit() for w in wa ^ wb):
+                continue
+            if len(wa & wb) / len(wa | wb) >= COLLECTION_TITLE_SIMILARITY:
+                return True
+    return False
 
-    # Exact title+year duplicates
-    by_key = defaultdict(list)
-    for m in movies:
-        title = (m.get("title") or "").lower().rstrip(".")
-        year = m.get("year", 0)
-        by_key[(title, year)].append(m)
-
-    dupes = {}
-    for k, v in by_key.items():
-        if len(v) > 1:
-            dupes[f"{k[0]}|{k[1]}"] = v
-
-    # Near-year duplicates (same title, year ±1)
-    by_title = defaultdict(list)
-    for m in movies:
-        by_title[(m.get("title") or "").lower().rstrip(".")].append(m)
-
-    for title, entries in by_title.items():
-        if len(entries) < 2:
-            continue
-        # Check each pair for year ±1
-        for i, a in enumerate(entries):
-            for b in entries[i + 1:]:
-                ya, yb = a.get("year", 0), b.get("year", 0)
-                if abs(ya - yb) > 1 or ya == yb:
-                    continue
-                key = f"{title}|{ya}-{yb}"
-                if key not in dupes:
-                    # Only flag if one is clearly inferior (< 500 votes AND < 10% of other)
-                    va = (a.get("ratings", {}).get("imdb", {}).get("votes", 0) or 0)
-                    vb = (b.get("ratings", {}).get("imdb", {}).get("votes", 0) or 0)
-                    max_v = max(va, vb)
-                    min_v = min(va, vb)
-                    if min_v < 500 and max_v > 0 and min_v < max_v * 0.1:
-                        dupes[key] = [a, b]
 
-    return dupes
+def find_duplicates(movies: List[Movie]) -> List[DuplicateGroup]:
+    """
+    Group duplicate movies using a multi-key blocking index: candidates are
+    only compared within a block (same normalized title/original/alternate
+    title, same IMDb id or same TMDB collection), so cost grows with block
+    sizes rather than the square of the library. The blocks only choose
+    which pairs are compared; pairs match when they have:
+
+    1. The same IMDb id (different TMDB entries of one film)
+    2. The same main title (apart from case) and year
+    3. The same normalized title ("The Thing" / "Thing", "Amélie" /
+       "Amelie"), or an original/alternate title equal to the other's main
+       title, and the same year, where one is clearly inferior
+    4. The same normalized title, year ±1, where one is clearly inferior
+    5. The same collection and year with similar titles (similar_titles),
+       where one is clearly inferior. Collection is only a blocking key:
+       different films of one collection released the same year never
+       match on it alone.
+
+    Matches are merged transitively (union-find) into groups.
+    """
+    titles = defaultdict(list)
+    imdb_ids = defaultdict(list)
+    collections = defaultdict(list)
+    for i, m in enumerate(movies):
+        if m.title_key:
+            titles[m.title_key].append((i, True))
+        for alias in m.aliases:
+            titles[alias].append((i, False))
+        if m.imdb_id and m.imdb_id != "?":
+            imdb_ids[m.imdb_id].append(i)
+        if m.collection:
+            collections[m.collection].append(i)
+
+    parent = list(range(len(movies)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    edges = []
+
+    def match(i, j, reason):
+        edges.append((i, reason))
+        ri, rj = root(i), root(j)
+        if ri != rj:
+            parent[rj] = ri
+
+    for members in imdb_ids.values():
+        for j in members[1:]:
+            match(members[0], j, "same IMDb id")
+
+    for members in titles.values():
+        if len(members) < 2:
+            continue
+        by_year = defaultdict(list)
+        for i, is_main in members:
+            by_year[movies[i].year].append((i, is_main))
+        for year, same in by_year.items():
+            later = by_year.get(year + 1, [])
+            for n, (i, main_i) in enumerate(same):
+                for j, main_j in same[n + 1:]:
+                    # Two aliases alone (e.g. the same translated title) aren't enough
+                    if i == j or not (main_i or main_j):
+                        continue
+                    a, b = movies[i], movies[j]
+                    # Distinct films can share a normalized or alternate
+                    # title; only an entry that is barely known is taken
+                    # for a duplicate of the other
+                    if main_i and main_j and same_exact_title(a, b):
+                        match(i, j, "same title")
+                    elif clearly_inferior(a, b):
+                        match(i, j, "same normalized title" if main_i and main_j else "alternate title")
+                for j, main_j in later:
+                    if i != j and (main_i or main_j) and clearly_inferior(movies[i], movies[j]):
+                        match(i, j, "same title, year ±1")
+
+    for members in collections.values():
+        if len(members) < 2:
+            continue
+        by_year = defaultdict(list)
+        for i in members:
+            by_year[movies[i].year].append(i)
+        for same in by_year.values():
+            for n, i in enumerate(same):
+                for j in same[n + 1:]:
+                    a, b = movies[i], movies[j]
+                    if clearly_inferior(a, b) and similar_titles(a, b):
+                        match(i, j, "similar title in same collection and year")
+
+    members_of = defaultdict(list)
+    for i in range(len(movies)):
+        members_of[root(i)].append(movies[i])
+    reasons_of = defaultdict(list)
+    for i, reason in edges:
+        reasons = reasons_of[root(i)]
+        if reason not in reasons:
+            reasons.append(reason)
+
+    groups = [
+        DuplicateGroup(group, reasons_of[r])
+        for r, group in members_of.items()
+        if len(group) > 1
+    ]
+    groups.sort(key=lambda g: (g.movies[0].title_key, g.movies[0].year))
+    return groups
+
+
+def find_radarr_duplicates(api: ArrAPI) -> List[DuplicateGroup]:
+    """Fetch a Radarr library and group its duplicate movies (see find_duplicates)."""
+    movies = fetch_movies(api)
+    log_debug(f"Loaded {len(movies)} movies")
+    if not movies:
+        return []
+    return find_duplicates(movies)
 
 
-def pick_best_movie(entries: List[dict]) -> dict:
+def pick_best_movie(entries: List[Movie]) -> Movie:
     """
     Pick the best movie from a set of same-title duplicates.
 
@@ -270,14 +550,80 @@ def pick_best_movie(entries: List[dict]) -> dict:
     4. Lower TMDB ID (usually the canonical entry)
     """
     def score(m):
-        has_file = 1_000_000 if m.get("hasFile") else 0
-        imdb_votes = (m.get("ratings", {}).get("imdb", {}).get("votes", 0) or 0)
-        imdb_rating = (m.get("ratings", {}).get("imdb", {}).get("value", 0) or 0) * 100
-        return has_file + imdb_votes + imdb_rating
+        has_file = 1_000_000 if m.has_file else 0
+        return has_file + m.imdb_votes + m.imdb_rating * 100
 
     return max(entries, key=score)
 
 
+def remove_movies(name: str, api: ArrAPI, movies: List[Movie]) -> int:
+    """
+    Remove movies (files kept, import exclusions added) through Radarr's
+    bulk DELETE /movie/editor, MOVIE_DELETE_CHUNK at a time. Returns the
+    number removed.
+
+    How a failed bulk delete is handled depends on why it failed:
+    - 404/405 (no bulk editor on this version): every remaining movie is
+      deleted one by one.
+    - other 4xx (the editor rejected something in the chunk): the chunk is
+      split in half and retried, so only the movies that actually fail end
+      up deleted one by one.
+    - 5xx or no response: the instance is in trouble, so removal stops and
+      the rest is left for the next run.
+    """
+    bulk = True
+    stopped: List[Exception] = []
+
+    def delete_chunk(chunk: List[Movie]) -> Tuple[int, int]:
+        """Returns (removed, individual deletes attempted)."""
+        nonlocal bulk
+        if stopped:
+            return 0, 0
+        if len(chunk) > 1 and bulk:
+            error = api.delete_bulk(
+                "/movie/editor",
+                {"movieIds": [m.id for m in chunk], "deleteFiles": False, "addImportExclusion": True},
+            )
+            if error is None:
+                return len(chunk), 0
+            status = error.code if isinstance(error, HTTPError) else None
+            if status in (404, 405):
+                log_warn(f"  {name}: bulk movie editor not available (HTTP {status}), removing one by one")
+                bulk = False
+            elif status is None or status >= 500:
+                stopped.append(error)
+                return 0, 0
+        if bulk and len(chunk) > 2:
+            half = len(chunk) // 2
+            first, second = delete_chunk(chunk[:half]), delete_chunk(chunk[half:])
+            return first[0] + second[0], first[1] + second[1]
+        done = 0
+        for m in chunk:
+            if api.delete(f"/movie/{m.id}?deleteFiles=false&addImportExclusion=true"):
+                done += 1
+            else:
+                log_error(f"  Failed to remove movie id={m.id} ({m.title})")
+        return done, len(chunk)
+
+    removed = 0
+    movies = sorted(movies, key=lambda m: m.id)
+    chunks = [movies[i:i + MOVIE_DELETE_CHUNK] for i in range(0, len(movies), MOVIE_DELETE_CHUNK)]
+    for n, chunk in enumerate(chunks, 1):
+        api.check_abandoned()
+        started = time.monotonic()
+        done, single = delete_chunk(chunk)
+        removed += done
+        if stopped:
+            left = len(movies) - (n - 1) * MOVIE_DELETE_CHUNK - done
+            log_error(f"  {name}: bulk delete failed ({stopped[0]}), stopping with {left} movies left")
+            break
+        fallback = f" ({single} one by one{' after a rejected bulk delete' if bulk else ''})" if single else ""
+        log(f"  Chunk {n}/{len(chunks)}: removed {done}/{len(chunk)} movies "
+            f"in {time.monotonic() - started:.1f}s{fallback}")
+    return removed
+
+
+@METRICS.phase("dedup_radarr")
 def dedup_radarr(name: str, api: ArrAPI) -> int:
     """Find and remove duplicate movies from a Radarr instance."""
     log(f"\n{Colors.BOLD}Deduplicating {name}...{Colors.NC}")
@@ -288,24 +634,26 @@ def dedup_radarr(name: str, api: ArrAPI) -> int:
         return 0
 
     log(f"  Found {len(dupes)} duplicate groups")
-    removed = 0
+    approved = []
 
-    for (title, year), entries in sorted(dupes.items()):
-        best = pick_best_movie(entries)
-        to_remove = [e for e in entries if e["id"] != best["id"]]
+    for group in dupes:
+        best = pick_best_movie(group.movies)
+        to_remove = [e for e in group.movies if e.id != best.id]
+        why = ", ".join(group.reasons)
+        log_debug(f"  {group.label}: {len(group.movies)} entries ({why})")
 
         for m in to_remove:
-            has_file = m.get("hasFile", False)
-            size_gb = (m.get("sizeOnDisk", 0) or 0) / 1024**3
-            imdb = m.get("imdbId", "?")
-            tmdb = m.get("tmdbId", "?")
-            m_votes = m.get("ratings", {}).get("imdb", {}).get("votes", 0) or 0
-            best_votes = best.get("ratings", {}).get("imdb", {}).get("votes", 0) or 0
+            title, year = m.title, m.year
+            size_gb = m.size_on_disk / 1024**3
+            imdb = m.imdb_id
+            tmdb = m.tmdb_id
+            m_votes = m.imdb_votes
+            best_votes = best.imdb_votes
 
             # Skip entries with files — always needs manual review
-            if has_file:
+            if m.has_file:
                 log_warn(
-                    f"  {title.title()} ({year}): SKIP removal of tmdb={tmdb} "
+                    f"  {title} ({year}): SKIP removal of tmdb={tmdb} "
                     f"(has file, {size_gb:.1f}GB) — manual review needed"
                 )
                 continue
@@ -313,20 +661,20 @@ def dedup_radarr(name: str, api: ArrAPI) -> int:
             # Flag when removing a much more popular entry (likely wrong choice)
             if m_votes > best_votes * 10 and m_votes > 1000:
                 log_warn(
-                    f"  {title.title()} ({year}): SKIP removal of tmdb={tmdb} "
+                    f"  {title} ({year}): SKIP removal of tmdb={tmdb} "
                     f"({m_votes} IMDB votes vs {best_votes}) — kept entry may be wrong movie"
                 )
                 continue
 
             action = "WOULD REMOVE" if DRY_RUN else "Removing"
-            log(f"  {action}: {title.title()} ({year}) tmdb={tmdb} imdb={imdb}")
-            log_debug(f"    Keeping: tmdb={best['tmdbId']} imdb={best.get('imdbId','?')}")
+            log(f"  {action}: {title} ({year}) tmdb={tmdb} imdb={imdb} [{why}]")
+            log_debug(f"    Keeping: tmdb={best.tmdb_id} imdb={best.imdb_id}")
+            approved.append(m)
 
-            if not DRY_RUN:
-                if api.delete(f"/movie/{m['id']}?deleteFiles=false&addImportExclusion=true"):
-                    removed += 1
-                else:
-                    log_error(f"  Failed to remove movie id={m['id']}")
+    # Removals are collected across all groups and submitted in bulk
+    removed = 0
+    if approved and not DRY_RUN:
+        removed = remove_movies(name, api, approved)
 
     if removed:
         log_success(f"  {name}: removed {removed} duplicate movies")
@@ -337,67 +685,196 @@ def dedup_radarr(name: str, api: ArrAPI) -> int:
 # Sonarr Queue Cleanup
 # =============================================================================
 
-def clean_sonarr_queue(name: str, api: ArrAPI) -> int:
-    """Remove importBlocked and missing-path items from Sonarr queue."""
-    log(f"\n{Colors.BOLD}Cleaning queue for {name}...{Colors.NC}")
+# Queue records fetched per page, and ids per DELETE /queue/bulk
+QUEUE_PAGE_SIZE = 200
+QUEUE_DELETE_CHUNK = 200
 
-    total_removed = 0
-    max_rounds = 5
-    consecutive_failures = 0
 
-    for round_num in range(1, max_rounds + 1):
-        try:
-            data = api.get("/queue?pageSize=200&page=1&includeUnknownSeriesItems=true")
-        except Exception as e:
-            log_error(f"  Failed to fetch queue: {e}")
-            break
+def fetch_queue(api: ArrAPI) -> Tuple[List[Tuple[int, str, str]], int]:
+    """
+    Walk every queue page. Returns ([(id, trackedDownloadState, outputPath)], totalRecords);
+    the rest of each record is dropped.
+    """
+    records: Dict[int, Tuple[int, str, str]] = {}
+    total = 0
+    page = 1
+    while True:
+        data = api.get(f"/queue?pageSize={QUEUE_PAGE_SIZE}&page={page}&includeUnknownSeriesItems=true") or {}
+        batch = data.get("records") or []
+        total = data.get("totalRecords", 0) or 0
+        for r in batch:
+            if "id" in r:
+                records[r["id"]] = (r["id"], r.get("trackedDownloadState", ""), r.get("outputPath") or "")
+        if len(batch) < QUEUE_PAGE_SIZE or page * QUEUE_PAGE_SIZE >= total:
+            return list(records.values()), total
+        page += 1
+
+
+def _read_mounts() -> List[str]:
+    """Mount points, longest first (read from /proc, so no mount is touched)."""
+    try:
+        with open("/proc/self/mounts") as f:
+            points = {line.split()[1].replace("\\040", " ") for line in f if len(line.split()) > 1}
+    except OSError:
+        points = set()
+    return sorted(points | {"/"}, key=len, reverse=True)
 
-        if not data:
-            break
 
-        total = data.get("totalRecords", 0)
-        records = data.get("records", [])
-        if not records:
-            break
+def _mount_of(path: str, mounts: List[str]) -> str:
+    for point in mounts:
+        if path == point or path.startswith(point.rstrip("/") + "/"):
+            return point
+    return "/"
 
-        blocked_ids = []
-        missing_ids = []
 
-        for r in records:
-            rid = r["id"]
-            state = r.get("trackedDownloadState", "")
+def _probe_dir(parent: str, names: set) -> Dict[str, bool]:
+    """
+    Existence of each name under parent. Several names share one listing
+    of the directory; a lone name costs a single lstat. Like lstat, Any
+    error other than "exists" counts as missing.
+    """
+    if len(names) > 1:
+        try:
+            present = set(os.listdir(parent))
+            return {n: n in present for n in names}
+        except (FileNotFoundError, NotADirectoryError):
+            return dict.fromkeys(names, False)
+        except OSError:
+            pass
+    found = {}
+    for n in names:
+        try:
+            os.lstat(os.path.join(parent, n) if n else parent)
+            found[n] = True
+        except OSError:
+            found[n] = False
+    return found
 
-            if state == "importBlocked":
-                blocked_ids.append(rid)
-                continue
 
-            # Check for missing output paths
-            path = r.get("outputPath", "")
-            if path:
-                try:
-                    os.lstat(path)
-                except (FileNotFoundError, OSError):
-                    missing_ids.append(rid)
-
-        remove_ids = blocked_ids + missing_ids
-        if not remove_ids:
-            log(f"  No blocked/missing items in {name} (queue: {total})")
-            break
+def probe_paths(paths: List[str]) -> Dict[str, Optional[bool]]:
+    """
+    Check which paths exist, PROBE_WORKERS directories at a time. Paths are
+    grouped per parent directory so each directory is read once. A probe
+    still running after PROBE_TIMEOUT seconds (a hung FUSE mount) is
+    abandoned on its daemon thread, and the directories left on that mount
+    are not probed at all. Their paths come back as None (unknown).
+    """
+    groups: Dict[str, set] = defaultdict(set)
+    for path in set(paths):
+        clean = os.path.normpath(path)
+        parent, name = os.path.split(clean)
+        if not name:
+            parent, name = clean, ""
+        groups[parent].add(name)
+    if not groups:
+        return {}
+
+    mounts = _read_mounts()
+    pending = queue.Queue()
+    for parent, names in groups.items():
+        pending.put((parent, names))
+    lock = threading.Lock()
+    results: Dict[str, Optional[Dict[str, bool]]] = {}
+    running: Dict[str, float] = {}
+    hung_mounts = set()
+
+    def worker():
+        while True:
+            try:
+                parent, names = pending.get_nowait()
+            except queue.Empty:
+                return
+            with lock:
+                if _mount_of(parent, mounts) in hung_mounts:
+                    results[parent] = None
+                    continue
+                running[parent] = time.monotonic()
+            found = _probe_dir(parent, names)
+            with lock:
+                if running.pop(parent, None) is not None:
+                    results[parent] = found
+
+    def start_worker():
+        threading.Thread(target=worker, daemon=True, name="queue-probe").start()
+
+    started = time.monotonic()
+    for _ in range(min(PROBE_WORKERS, len(groups))):
+        start_worker()
+    while True:
+        with lock:
+            if len(results) == len(groups):
+                break
+            now = time.monotonic()
+            for parent, since in list(running.items()):
+                if now - since > PROBE_TIMEOUT:
+                    del running[parent]
+                    results[parent] = None
+                    mount = _mount_of(parent, mounts)
+                    if mount not in hung_mounts:
+                        hung_mounts.add(mount)
+                        log_warn(f"  Probing {parent} timed out after {PROBE_TIMEOUT}s, skipping {mount}")
+                    start_worker()
+        time.sleep(0.02)
+
+    log_debug(f"  Probed {len(set(paths))} paths in {len(groups)} directories "
+              f"in {time.monotonic() - started:.1f}s")
+    exists: Dict[str, Optional[bool]] = {}
+    for path in set(paths):
+        clean = os.path.normpath(path)
+        parent, name = os.path.split(clean)
+        if not name:
+            parent, name = clean, ""
+        found = results.get(parent)
+        exists[path] = None if found is None else found[name]
+    return exists
+
+
+@METRICS.phase("clean_sonarr_queue")
+def clean_sonarr_queue(name: str, api: ArrAPI) -> int:
+    """
+    Remove importBlocked and missing-path items from a Sonarr queue: every
+    page is read, output paths are probed concurrently (see probe_paths)
+    and the removals go out in bulk.
+    """
+    log(f"\n{Colors.BOLD}Cleaning queue for {name}...{Colors.NC}")
+
+    try:
+        records, total = fetch_queue(api)
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        log_error(f"  Failed to fetch queue: {e}")
+        return 0
 
-        action = "WOULD REMOVE" if DRY_RUN else "Removing"
-        log(f"  Round {round_num}: {action} {len(blocked_ids)} blocked + "
-            f"{len(missing_ids)} missing-path items (queue: {total})")
+    blocked_ids = [rid for rid, state, _ in records if state == "importBlocked"]
+    # Check for missing output paths
+    outputs = {rid: path for rid, state, path in records if state != "importBlocked" and path}
+    exists = probe_paths(list(outputs.values()))
+    missing_ids = [rid for rid, path in outputs.items() if exists.get(path) is False]
+    unknown = sum(1 for path in outputs.values() if exists.get(path) is None)
+    if unknown:
+        log_warn(f"  {unknown} items left alone: their output path could not be checked")
+
+    remove_ids = blocked_ids + missing_ids
+    if not remove_ids:
+        log(f"  No blocked/missing items in {name} (queue: {total})")
+        return 0
 
-        if DRY_RUN:
-            total_removed += len(remove_ids)
-            break
+    action = "WOULD REMOVE" if DRY_RUN else "Removing"
+    log(f"  {action} {len(blocked_ids)} blocked + {len(missing_ids)} missing-path items (queue: {total})")
+    if DRY_RUN:
+        return len(remove_ids)
 
-        # Try bulk delete; on persistent 500s, skip this instance
+    # Bulk delete in chunks; on persistent 500s, skip this instance
+    total_removed = 0
+    consecutive_failures = 0
+    for i in range(0, len(remove_ids), QUEUE_DELETE_CHUNK):
+        chunk = remove_ids[i:i + QUEUE_DELETE_CHUNK]
         if api.delete_bulk(
             "/queue/bulk?removeFromClient=false&blocklist=false&skipRedownload=true",
-            {"ids": remove_ids},
-        ):
-            total_removed += len(remove_ids)
+            {"ids": chunk},
+        ) is None:
+            total_removed += len(chunk)
             consecutive_failures = 0
         else:
             consecutive_failures += 1
@@ -405,13 +882,123 @@ def clean_sonarr_queue(name: str, api: ArrAPI) -> int:
                 log_warn(f"  {name}: persistent API errors, skipping remaining cleanup")
                 break
 
-        time.sleep(1)
-
     if total_removed:
         log_success(f"  {name}: removed {total_removed} stale queue items")
     return total_removed
 
 
+# =============================================================================
+# Concurrent instance tasks
+# =============================================================================
+
+class InstanceTask:
+    """One maintenance job (dedup or queue cleanup) on one instance."""
+
+    def __init__(self, job: str, name: str, api: ArrAPI, fn):
+        self.job = job
+        self.name = name
+        self.api = api
+        self.fn = fn
+        self.lines: List[str] = []
+        self.removed = 0
+        # Written only by the worker thread running the task
+        self.status = "pending"
+        self.error: Optional[Exception] = None
+        self.started: Optional[float] = None
+        self.elapsed = 0.0
+        self.done = threading.Event()
+        # Written only by the main thread: seconds in when it gave up on the
+        # task (None while it hasn't), and how many log lines it has printed
+        self.abandoned_after: Optional[float] = None
+        self.printed = 0
+
+    def abandon(self):
+        """Give up on a hung task; its thread can no longer change the instance."""
+        self.abandoned_after = time.monotonic() - self.started
+        self.api.abandoned = True
+
+    @property
+    def complete(self) -> bool:
+        return self.abandoned_after is None and self.status == "ok"
+
+    def run_time(self) -> float:
+        return self.elapsed if self.abandoned_after is None else self.abandoned_after
+
+    def run(self, deadline: int):
+        _log_local.buffer = self.lines
+        self.started = time.monotonic()
+        self.api.deadline = self.started + deadline if deadline else None
+        try:
+            self.removed = self.fn(self.name, self.api)
+            self.status = "ok"
+        except DeadlineExceeded:
+            self.status = "deadline"
+        except Exception as e:
+            self.status, self.error = "failed", e
+        finally:
+            self.elapsed = time.monotonic() - self.started
+            _log_local.buffer = None
+            self.done.set()
+
+    def outcome(self) -> str:
+        if self.abandoned_after is not None:
+            return "abandoned, no response after the deadline"
+        if self.status == "ok":
+            return f"{self.removed} removed"
+        if self.status == "deadline":
+            return f"stopped at the {DEADLINE}s deadline"
+        return f"failed: {self.error}"
+
+
+def run_instance_tasks(tasks: List[InstanceTask], workers: int, deadline: int):
+    """
+    Run tasks on up to `workers` daemon threads, printing each task's
+    buffered log in task order as it finishes. A task still running
+    DEADLINE_GRACE seconds past its deadline is abandoned (its thread is
+    left behind and a fresh worker takes its place), so one stuck instance
+    can't hold up the others or the timer. An abandoned task's thread can't
+    make further changes (TaskAbandoned); whatever it logs after that is
+    printed once every task has been waited for.
+    """
+    pending = queue.Queue()
+    for task in tasks:
+        pending.put(task)
+
+    def worker():
+        while True:
+            try:
+                task = pending.get_nowait()
+            except queue.Empty:
+                return
+            task.run(deadline)
+
+    def start_worker():
+        threading.Thread(target=worker, daemon=True, name="arr-maintenance").start()
+
+    for _ in range(max(1, min(workers, len(tasks)))):
+        start_worker()
+
+    def flush(task: InstanceTask):
+        lines = task.lines[task.printed:]
+        task.printed += len(lines)
+        _write(lines)
+
+    for task in tasks:
+        while not task.done.wait(1):
+            if deadline and task.started and time.monotonic() - task.started > deadline + DEADLINE_GRACE:
+                task.abandon()
+                start_worker()
+                break
+        flush(task)
+        if task.abandoned_after is not None or task.status == "deadline":
+            log_warn(f"  {task.name}: {task.job} {task.outcome()}")
+        elif task.status == "failed":
+            log_error(f"  {task.name}: {task.job} failed: {task.error}")
+
+    for task in tasks:
+        if task.abandoned_after is not None and len(task.lines) > task.printed:
+            log_warn(f"  {task.name}: logged after it was abandoned:")
+            flush(task)
 
 
 # =============================================================================
@@ -432,22 +1019,30 @@ def main():
 
     log(f"Found: {len(radarr_apis)} Radarr, {len(sonarr_apis)} Sonarr instances")
 
-    total_dedup = 0
-    total_queue = 0
-
+    tasks = []
     # Radarr dedup
     if ALL_MODE or DEDUP_ONLY:
-        for name, api in radarr_apis:
-            total_dedup += dedup_radarr(name, api)
-
+        tasks += [InstanceTask("dedup", name, api, dedup_radarr) for name, api in radarr_apis]
     # Sonarr queue cleanup
     if ALL_MODE or QUEUE_ONLY:
-        for name, api in sonarr_apis:
-            total_queue += clean_sonarr_queue(name, api)
+        tasks += [InstanceTask("queue", name, api, clean_sonarr_queue) for name, api in sonarr_apis]
+
+    if tasks:
+        limit = f", {DEADLINE}s deadline each" if DEADLINE else ""
+        log(f"Running {len(tasks)} tasks ({min(WORKERS, len(tasks))} workers{limit})")
+        run_instance_tasks(tasks, WORKERS, DEADLINE)
+
+    total_dedup = sum(t.removed for t in tasks if t.job == "dedup")
+    total_queue = sum(t.removed for t in tasks if t.job == "queue")
 
     # Summary
     log(f"\n{'='*60}")
+    for task in tasks:
+        log(f"  {task.name:<20} {task.job:<6} {task.outcome()} ({task.run_time():.1f}s)")
     log(f"Summary: {total_dedup} duplicates removed, {total_queue} queue items cleaned")
+    incomplete = [t.name for t in tasks if not t.complete]
+    if incomplete:
+        log_warn(f"Incomplete: {', '.join(incomplete)}")
     log(f"{'='*60}\n")
 
 
@@ -455,4 +1050,4 @@ if __name__ == "__main__":
     if "--help" in sys.argv or "-h" in sys.argv:
         print(__doc__)
         sys.exit(0)
-    main()
+    METRICS.run(main, on_error=log_warn)
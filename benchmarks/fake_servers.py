@@ -0,0 +1,473 @@
+"""
+Local stand-ins for MDBList and Sonarr/Radarr used by the benchmark suite.
+
+Each fake is a ThreadingHTTPServer (HTTP/1.1 keep-alive, optional gzip)
+that serves a deterministic, seeded dataset and records how many requests
+hit each endpoint. Latency and error rates are configurable so slow or
+flaky upstreams can be reproduced locally.
+
+    with FakeMDBList(lists=500, latency_ms=20) as mdb, \\
+         FakeArr("radarr", movies=50000) as radarr:
+        ...  # point the scripts at mdb.url / radarr.url
+        print(mdb.counts(), radarr.counts())
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Words used to build list names, so the default mdblist-sync SEARCH_TERMS
+# (netflix, horror, anime, ...) all find something
+LIST_WORDS = [
+    "netflix", "disney", "hbo", "amazon prime", "hulu", "apple tv", "paramount",
+    "peacock", "crunchyroll", "trending", "top rated", "imdb", "anime", "sci-fi",
+    "horror", "thriller", "documentary", "romance", "comedy", "action", "crime",
+    "new releases", "best 2026", "oscar", "mystery", "fantasy",
+]
+TITLE_WORDS = [
+    "the", "last", "night", "star", "dark", "city", "love", "war", "king", "road",
+    "blood", "house", "man", "girl", "ghost", "river", "fire", "storm", "moon", "game",
+]
+
+# Endpoint labels: ids in paths are collapsed so counts group per endpoint
+_ID_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(method: str, path: str) -> str:
+    return f"{method} {_ID_RE.sub('/{id}', path)}"
+
+
+class _FakeServer:
+    """Shared plumbing: threaded server, latency/error injection, counters."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 seed: int = 42, use_gzip: bool = True):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.use_gzip = use_gzip
+        self.rng = random.Random(seed)
+        self._counts = Counter()
+        self._bytes = Counter()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # Subclasses implement: handle(method, path, query, body) -> (status, payload, headers)
+    def handle(self, method: str, path: str, query: Dict[str, str], body: any, headers) -> Tuple[int, any, dict]:
+        raise NotImplementedError
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def bytes_sent(self) -> int:
+        with self._lock:
+            return sum(self._bytes.values())
+
+    def reset_counts(self):
+        with self._lock:
+            self._counts.clear()
+            self._bytes.clear()
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method):
+                parts = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except json.JSONDecodeError:
+                    body = None
+
+                label = endpoint_label(method, parts.path)
+                with fake._lock:
+                    fake._counts[label] += 1
+                    inject_error = fake.error_rate and fake.rng.random() < fake.error_rate
+                    delay = fake.latency_ms + (fake.rng.uniform(0, fake.jitter_ms) if fake.jitter_ms else 0)
+                if delay:
+                    time.sleep(delay / 1000)
+
+                if inject_error:
+                    status, payload, extra = 503, {"message": "injected error"}, {"Retry-After": "0"}
+                else:
+                    status, payload, extra = fake.handle(method, parts.path, query, body, self.headers)
+                self._respond(label, status, payload, extra)
+
+            def _respond(self, label, status, payload, extra):
+                if isinstance(payload, (bytes, bytearray)):
+                    data = bytes(payload)
+                elif payload is None:
+                    data = b""
+                else:
+                    data = json.dumps(payload).encode()
+                self.send_response(status)
+                for key, value in extra.items():
+                    self.send_header(key, value)
+                if data and fake.use_gzip and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                    data = gzip.compress(data, compresslevel=1)
+                    self.send_header("Content-Encoding", "gzip")
+                if data:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if data and status != 304:
+                    self.wfile.write(data)
+                with fake._lock:
+                    fake._bytes[label] += len(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def log_message(self, fmt, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# =============================================================================
+# MDBList
+# =============================================================================
+
+class FakeMDBList(_FakeServer):
+    """
+    Fake api.mdblist.com: /user, /lists/top, /lists/search, /lists/{id} and
+    /lists/{id}/items. Responses carry an ETag and honour If-None-Match.
+    Also serves the public list JSON Sonarr/Radarr poll
+    (/lists/{user}/{slug}/json), which costs no API quota.
+    """
+
+    def __init__(self, lists: int = 500, items_per_list: int = 100, title_pool: int = 5000,
+                 rate_limit: int = 1000, **kwargs):
+        super().__init__(**kwargs)
+        self.rate_limit = rate_limit
+        self.rate_limit_remaining = rate_limit
+        self.lists: Dict[int, dict] = {}
+        self.items: Dict[int, List[int]] = {}
+        self.by_slug: Dict[Tuple[str, str], int] = {}
+
+        rng = random.Random(kwargs.get("seed", 42))
+        for list_id in range(1, lists + 1):
+            topic = LIST_WORDS[list_id % len(LIST_WORDS)]
+            mediatype = "show" if list_id % 3 == 0 else "movie"
+            count = rng.randint(max(1, items_per_list // 4), items_per_list)
+            self.lists[list_id] = {
+                "id": list_id,
+                "name": f"{topic.title()} {rng.choice(TITLE_WORDS).title()} #{list_id}",
+                "slug": f"{topic.replace(' ', '-')}-{list_id}",
+                "user_id": 1000 + list_id % 97,
+                "user_name": f"curator{list_id % 97}",
+                "description": f"A {topic} list for benchmarking. " * rng.randint(1, 8),
+                "mediatype": mediatype,
+                "likes": int(rng.paretovariate(1.2) * 5),
+                "items": count,
+                "dynamic": bool(list_id % 2),
+                "private": False,
+            }
+            # Lists on the same topic draw from a narrow slice of the title
+            # pool, so "near-identical" lists overlap heavily
+            base = (list_id % len(LIST_WORDS)) * (title_pool // len(LIST_WORDS))
+            spread = max(count, title_pool // len(LIST_WORDS))
+            self.items[list_id] = sorted(rng.sample(range(base, base + spread), count))
+            self.by_slug[(self.lists[list_id]["user_name"], self.lists[list_id]["slug"])] = list_id
+
+    def handle(self, method, path, query, body, headers):
+        if path == "/user":
+            return 200, {
+                "username": "benchmark",
+                "rate_limit": self.rate_limit,
+                "rate_limit_remaining": self.rate_limit_remaining,
+            }, {}
+
+        m = re.fullmatch(r"/lists/([^/]+)/([^/]+)/json", path)
+        if m:
+            list_id = self.by_slug.get((m.group(1), m.group(2)))
+            if list_id is None:
+                return 404, {"error": "not found"}, {}
+            return 200, self._public_payload(list_id), {}
+
+        with self._lock:
+            self.rate_limit_remaining = max(0, self.rate_limit_remaining - 1)
+            remaining = self.rate_limit_remaining
+        quota = {"X-RateLimit-Limit": str(self.rate_limit), "X-RateLimit-Remaining": str(remaining)}
+        if remaining <= 0:
+            quota["X-RateLimit-Reset"] = str(int(time.time()) + 86400)
+            return 429, {"error": "rate limit exceeded"}, quota
+
+        if path == "/lists/top":
+            payload = sorted(self.lists.values(), key=lambda x: -x["likes"])[:100]
+        elif path == "/lists/search":
+            term = (query.get("query") or "").lower()
+            payload = [lst for lst in self.lists.values() if term in lst["name"].lower()][:50]
+        else:
+            m = re.fullmatch(r"/lists/(\d+)(/items)?", path)
+            if not m or int(m.group(1)) not in self.lists:
+                return 404, {"error": "not found"}, quota
+            list_id = int(m.group(1))
+            if m.group(2):
+                payload = self._items_payload(list_id, query)
+            else:
+                payload = [self.lists[list_id]]
+
+        data = json.dumps(payload).encode()
+        etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        quota["ETag"] = etag
+        if headers.get("If-None-Match") == etag:
+            return 304, None, quota
+        return 200, data, quota
+
+    def _public_payload(self, list_id: int) -> list:
+        show = self.lists[list_id]["mediatype"] == "show"
+        return [
+            {
+                "id": title_id,
+                "rank": rank,
+                "title": f"Title {title_id}",
+                "imdb_id": f"tt{title_id:07d}",
+                "tvdbid": title_id if show else None,
+                "tmdbid": None if show else title_id,
+                "mediatype": self.lists[list_id]["mediatype"],
+                "release_year": 1970 + title_id % 56,
+            }
+            for rank, title_id in enumerate(self.items[list_id], start=1)
+        ]
+
+    def _items_payload(self, list_id: int, query: Dict[str, str]) -> dict:
+        lst = self.lists[list_id]
+        offset = int(query.get("offset") or 0)
+        limit = int(query.get("limit") or len(self.items[list_id]))
+        entries = []
+        for rank, title_id in enumerate(self.items[list_id][offset:offset + limit], start=offset + 1):
+            entries.append({
+                "id": title_id,
+                "rank": rank,
+                "title": f"Title {title_id}",
+                "imdb_id": f"tt{title_id:07d}",
+                "tvdb_id": title_id if lst["mediatype"] == "show" else None,
+                "mediatype": lst["mediatype"],
+                "release_year": 1970 + title_id % 56,
+            })
+        key = "shows" if lst["mediatype"] == "show" else "movies"
+        return {"movies": [], "shows": [], key: entries}
+
+
+# =============================================================================
+# Sonarr / Radarr
+# =============================================================================
+
+class FakeArr(_FakeServer):
+    """
+    Fake Sonarr/Radarr v3 API: system/status, importlist (+schema, CRUD, bulk delete),
+    qualityprofile, rootfolder, movie (+editor bulk delete) and paged queue
+    (+bulk delete). `duplicate_rate` seeds same-title/different-TMDB movies
+    (some with punctuation/article variants of the title) for the Radarr
+    dedup path; queue items mix importBlocked, missing and
+    existing output paths for the Sonarr queue cleanup path.
+    """
+
+    def __init__(self, kind: str = "radarr", movies: int = 0, queue: int = 0,
+                 import_lists: int = 0, duplicate_rate: float = 0.02,
+                 existing_path: str = "/", **kwargs):
+        super().__init__(**kwargs)
+        self.kind = kind
+        self.api_key = f"{kind}-benchmark-key"
+        self.import_lists: Dict[int, dict] = {}
+        self.movies: Dict[int, dict] = {}
+        self.queue: Dict[int, dict] = {}
+        self._next_id = 1
+        self._movies_json: Optional[bytes] = None
+
+        rng = random.Random(kwargs.get("seed", 42))
+        for i in range(import_lists):
+            self._add_import_list({
+                "name": f"Manual list {i}",
+                "implementation": "RadarrListImport" if kind == "radarr" else "CustomImport",
+                "fields": [{"name": "url", "value": f"https://example.invalid/list/{i}"}],
+            })
+        for movie_id in range(1, movies + 1):
+            title = " ".join(rng.choice(TITLE_WORDS) for _ in range(3)).title()
+            self.movies[movie_id] = _movie_record(movie_id, title, 1950 + movie_id % 76, rng)
+        for movie_id in range(1, int(movies * duplicate_rate) + 1):
+            original = self.movies[rng.randint(1, movies)]
+            dupe_id = movies + movie_id
+            # Same film under a differently punctuated/articled title
+            title = rng.choice((original["title"], f"The {original['title']}", original["title"].replace(" ", ": ", 1)))
+            dupe = _movie_record(dupe_id, title, original["year"] + rng.choice((0, 0, 1)), rng)
+            dupe["hasFile"] = False
+            dupe["sizeOnDisk"] = 0
+            self.movies[dupe_id] = dupe
+        for qid in range(1, queue + 1):
+            roll = rng.random()
+            state = "importBlocked" if roll < 0.1 else "importPending" if roll < 0.3 else "downloading"
+            path = f"/nonexistent/benchmark/{qid}" if roll > 0.8 else existing_path
+            self.queue[qid] = {
+                "id": qid,
+                "seriesId": qid % 500,
+                "episodeId": qid,
+                "title": f"Show.S01E{qid % 24:02d}.1080p",
+                "status": "completed",
+                "trackedDownloadState": state,
+                "trackedDownloadStatus": "warning" if state == "importBlocked" else "ok",
+                "outputPath": path,
+                "size": rng.randint(10**8, 10**10),
+                "statusMessages": [{"title": "benchmark", "messages": ["x" * 40]}],
+            }
+
+    def _add_import_list(self, payload: dict) -> dict:
+        with self._lock:
+            record = dict(payload)
+            record["id"] = self._next_id
+            self._next_id += 1
+            self.import_lists[record["id"]] = record
+        return record
+
+    def handle(self, method, path, query, body, headers):
+        if query.get("apikey", headers.get("X-Api-Key")) != self.api_key:
+            return 401, {"message": "Unauthorized"}, {}
+        if not path.startswith("/api/v3"):
+            return 404, None, {}
+        path = path[len("/api/v3"):]
+
+        if path == "/system/status":
+            return 200, {"appName": self.kind.title(), "version": "5.0.0.0-benchmark"}, {}
+        if path == "/qualityprofile":
+            return 200, [{"id": 1, "name": "HD-1080p"}, {"id": 2, "name": "Ultra-HD"}], {}
+        if path == "/rootfolder":
+            return 200, [{"id": 1, "path": f"/data/{self.kind}", "freeSpace": 10**12}], {}
+        if path == "/importlist/schema":
+            return 200, [{
+                "implementation": "RadarrListImport" if self.kind == "radarr" else "CustomImport",
+                "configContract": "RadarrListSettings" if self.kind == "radarr" else "CustomSettings",
+                "fields": [{"name": "url" if self.kind == "radarr" else "baseUrl"}],
+            }], {}
+        if path == "/importlist":
+            if method == "POST":
+                return 201, self._add_import_list(body or {}), {}
+            return 200, list(self.import_lists.values()), {}
+        if path == "/importlist/bulk" and method == "DELETE":
+            with self._lock:
+                for list_id in (body or {}).get("ids", []):
+                    self.import_lists.pop(list_id, None)
+            return 200, {}, {}
+        m = re.fullmatch(r"/importlist/(\d+)", path)
+        if m and method == "DELETE":
+            with self._lock:
+                found = self.import_lists.pop(int(m.group(1)), None)
+            return (200, {}, {}) if found else (404, {"message": "NotFound"}, {})
+
+        if path == "/movie" and method == "GET":
+            return 200, self._movies_payload(), {}
+        m = re.fullmatch(r"/movie/(\d+)", path)
+        if m and method == "DELETE":
+            return self._delete_movies([int(m.group(1))])
+        if path == "/movie/editor" and method == "DELETE":
+            return self._delete_movies((body or {}).get("movieIds", []))
+
+        if path == "/queue" and method == "GET":
+            return 200, self._queue_page(query), {}
+        if path == "/queue/bulk" and method == "DELETE":
+            with self._lock:
+                for qid in (body or {}).get("ids", []):
+                    self.queue.pop(qid, None)
+            return 200, {}, {}
+
+        return 404, {"message": f"unknown endpoint {path}"}, {}
+
+    def _movies_payload(self) -> bytes:
+        with self._lock:
+            if self._movies_json is None:
+                self._movies_json = json.dumps(list(self.movies.values())).encode()
+            return self._movies_json
+
+    def _delete_movies(self, ids: List[int]):
+        with self._lock:
+            missing = [i for i in ids if i not in self.movies]
+            for movie_id in ids:
+                self.movies.pop(movie_id, None)
+            self._movies_json = None
+        if missing and len(ids) == 1:
+            return 404, {"message": "NotFound"}, {}
+        return 200, {}, {}
+
+    def _queue_page(self, query: Dict[str, str]) -> dict:
+        page = max(1, int(query.get("page") or 1))
+        size = max(1, int(query.get("pageSize") or 10))
+        with self._lock:
+            records = sorted(self.queue.values(), key=lambda r: r["id"])
+        return {
+            "page": page,
+            "pageSize": size,
+            "totalRecords": len(records),
+            "records": records[(page - 1) * size:page * size],
+        }
+
+
+def _movie_record(movie_id: int, title: str, year: int, rng: random.Random) -> dict:
+    """A Radarr /movie entry with the bulky fields a real library returns."""
+    has_file = rng.random() < 0.6
+    return {
+        "id": movie_id,
+        "title": title,
+        "originalTitle": title,
+        "sortTitle": title.lower(),
+        "year": year,
+        "tmdbId": 100000 + movie_id,
+        "imdbId": f"tt{movie_id:07d}",
+        "hasFile": has_file,
+        "sizeOnDisk": rng.randint(10**9, 6 * 10**10) if has_file else 0,
+        "monitored": True,
+        "path": f"/data/movies/{title} ({year})",
+        "overview": "Lorem ipsum dolor sit amet. " * 12,
+        "genres": ["Drama", "Thriller"],
+        "alternateTitles": [{"title": f"{title} Alt", "sourceType": "tmdb"}],
+        "images": [
+            {"coverType": kind, "url": f"/MediaCover/{movie_id}/{kind}.jpg",
+             "remoteUrl": f"https://image.tmdb.org/t/p/original/{movie_id}-{kind}.jpg"}
+            for kind in ("poster", "fanart")
+        ],
+        "ratings": {
+            "imdb": {"votes": int(rng.paretovariate(1.1) * 100), "value": round(rng.uniform(3, 9), 1)},
+            "tmdb": {"votes": rng.randint(0, 5000), "value": round(rng.uniform(3, 9), 1)},
+        },
+    }
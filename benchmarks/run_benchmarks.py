@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks for mdblist-sync and arr-maintenance.
+
+Starts local fake MDBList and Sonarr/Radarr servers, runs the real scripts
+against them in a child process and reports wall time, peak RSS and the
+number of requests each endpoint received. Nothing touches a production
+instance or the real MDBList quota.
+
+Usage:
+    benchmarks/run_benchmarks.py [options]
+
+Options:
+    --scenario NAME     Run only this scenario (repeatable). Default: all
+    --lists N           MDBList lists in the fake catalogue (default: 500)
+    --movies N          Movies in the fake Radarr library (default: 5000)
+    --queue N           Items in the fake Sonarr queue (default: 500)
+    --latency-ms MS     Added latency per request (default: 20)
+    --jitter-ms MS      Random extra latency per request (default: 0)
+    --error-rate R      Fraction of requests answered with 503 (default: 0)
+    --repeat N          Run each scenario N times, report the median (default: 1)
+    --json FILE         Also write the results as JSON
+    --verbose           Show script output
+
+Scenarios:
+    sync-cold           mdblist-sync with empty state and --no-cache
+    sync-warm           mdblist-sync again, reusing state and response cache
+    cleanup             mdblist-sync --cleanup
+    maintenance         arr-maintenance (Radarr dedup + Sonarr queue cleanup)
+
+Example:
+    benchmarks/run_benchmarks.py --movies 50000 --queue 5000 --latency-ms 50
+"""
+
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_servers import FakeArr, FakeMDBList  # noqa: E402
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+RUNNER = Path(__file__).resolve().parent / "script_runner.py"
+SCENARIOS = ["sync-cold", "sync-warm", "cleanup", "maintenance"]
+
+
+def parse_args(argv: List[str]) -> dict:
+    opts = {
+        "scenarios": [],
+        "lists": 500,
+        "movies": 5000,
+        "queue": 500,
+        "latency_ms": 20.0,
+        "jitter_ms": 0.0,
+        "error_rate": 0.0,
+        "repeat": 1,
+        "json": None,
+        "verbose": False,
+    }
+    numeric = {
+        "--lists": ("lists", int), "--movies": ("movies", int), "--queue": ("queue", int),
+        "--latency-ms": ("latency_ms", float), "--jitter-ms": ("jitter_ms", float),
+        "--error-rate": ("error_rate", float), "--repeat": ("repeat", int),
+    }
+    args = iter(argv)
+    for arg in args:
+        if arg in ("-h", "--help"):
+            print(__doc__.strip())
+            sys.exit(0)
+        elif arg == "--verbose":
+            opts["verbose"] = True
+        elif arg == "--scenario":
+            name = next(args, "")
+            if name not in SCENARIOS:
+                sys.exit(f"Unknown scenario '{name}' (choose from: {', '.join(SCENARIOS)})")
+            opts["scenarios"].append(name)
+        elif arg == "--json":
+            opts["json"] = next(args, None)
+        elif arg in numeric:
+            key, cast = numeric[arg]
+            try:
+                opts[key] = cast(next(args))
+            except (StopIteration, ValueError):
+                sys.exit(f"{arg} needs a numeric value")
+        else:
+            sys.exit(f"Unknown option: {arg}")
+    opts["scenarios"] = opts["scenarios"] or list(SCENARIOS)
+    return opts
+
+
+def run_script(script: str, argv: List[str], env: Dict[str, str], target: dict, verbose: bool) -> dict:
+    """Run one script in a child process; return wall time, peak RSS and exit code."""
+    child_env = dict(os.environ, **env)
+    child_env["BENCH_TARGET"] = json.dumps(dict(target, script=str(REPO_DIR / script), argv=argv))
+    output = None if verbose else subprocess.DEVNULL
+
+    start = time.monotonic()
+    proc = subprocess.Popen([sys.executable, str(RUNNER)], env=child_env, stdout=output, stderr=output)
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.monotonic() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    return {
+        "wall_seconds": round(wall, 3),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "exit_code": proc.returncode,
+    }
+
+
+def run_scenarios(opts: dict) -> List[dict]:
+    fake_opts = {"latency_ms": opts["latency_ms"], "jitter_ms": opts["jitter_ms"], "error_rate": opts["error_rate"]}
+    results = []
+
+    for repeat in range(opts["repeat"]):
+        workdir = Path(tempfile.mkdtemp(prefix="mdblist-bench-"))
+        mdb = FakeMDBList(lists=opts["lists"], rate_limit=100000, **fake_opts).start()
+        radarr = FakeArr("radarr", movies=opts["movies"], **fake_opts).start()
+        sonarr = FakeArr("sonarr", queue=opts["queue"], existing_path=str(workdir), **fake_opts).start()
+        sonarr_anime = FakeArr("sonarr", **fake_opts).start()
+        fakes = {"mdblist": mdb, "radarr": radarr, "sonarr": sonarr, "sonarr-anime": sonarr_anime}
+
+        target = {
+            "mdblist_url": mdb.url,
+            "log_file": str(workdir / "arr-maintenance.log"),
+            "instances": {
+                "radarr": [radarr.url, radarr.api_key],
+                "sonarr": [sonarr.url, sonarr.api_key],
+                "sonarr-anime": [sonarr_anime.url, sonarr_anime.api_key],
+            },
+        }
+        env = {
+            "MDBLIST_API_KEY": "benchmark",
+            "MDBLIST_SYNC_CONFIG": str(workdir / "mdblist-sync.conf"),
+            "MDBLIST_SYNC_STATE": str(workdir / "mdblist-sync.state.json"),
+            "MDBLIST_SYNC_CACHE": str(workdir / "mdblist-sync.cache"),
+            "METRICS_TEXTFILE": str(workdir / "mdblist-sync.prom"),
+            "ARR_MAINTENANCE_METRICS": str(workdir / "arr-maintenance.prom"),
+        }
+        # Sync state must exist before cleanup can remove anything
+        plan = {
+            "sync-cold": ("mdblist-sync.py", ["--no-cache"]),
+            "sync-warm": ("mdblist-sync.py", []),
+            "cleanup": ("mdblist-sync.py", ["--cleanup"]),
+            "maintenance": ("arr-maintenance.py", []),
+        }
+
+        try:
+            for name in SCENARIOS:
+                if name not in opts["scenarios"]:
+                    continue
+                for fake in fakes.values():
+                    fake.reset_counts()
+                script, argv = plan[name]
+                prom = workdir / script.replace(".py", ".prom")
+                prom.unlink(missing_ok=True)
+                if opts["verbose"]:
+                    print(f"\n--- {name} (run {repeat + 1}) ---", flush=True)
+                result = run_script(script, argv, env, target, opts["verbose"])
+                result["scenario"] = name
+                result["requests"] = {
+                    server: fake.counts() for server, fake in fakes.items() if fake.counts()
+                }
+                result["bytes_sent"] = sum(fake.bytes_sent() for fake in fakes.values())
+                result["phases"] = read_phases(prom)
+                results.append(result)
+        finally:
+            for fake in fakes.values():
+                fake.stop()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return summarize(results, opts["repeat"])
+
+
+def read_phases(prom: Path) -> Dict[str, float]:
+    """Phase timings (seconds) from the script's Prometheus textfile."""
+    phases = {}
+    if not prom.exists():
+        return phases
+    for line in prom.read_text().splitlines():
+        match = re.match(r'\w+_phase_duration_seconds\{phase="([^"]+)"\} ([\d.]+)', line)
+        if match:
+            phases[match.group(1)] = float(match.group(2))
+    return phases
+
+
+def summarize(results: List[dict], repeat: int) -> List[dict]:
+    """Collapse repeated runs to the median wall time / RSS per scenario."""
+    if repeat <= 1:
+        return results
+    summary = []
+    for name in SCENARIOS:
+        runs = [r for r in results if r["scenario"] == name]
+        if not runs:
+            continue
+        merged = dict(runs[-1])
+        merged["wall_seconds"] = round(statistics.median(r["wall_seconds"] for r in runs), 3)
+        merged["peak_rss_mb"] = round(statistics.median(r["peak_rss_mb"] for r in runs), 1)
+        merged["runs"] = len(runs)
+        summary.append(merged)
+    return summary
+
+
+def print_report(results: List[dict], opts: dict):
+    print(
+        f"\nBenchmark: {opts['lists']} lists, {opts['movies']} movies, {opts['queue']} queue items, "
+        f"{opts['latency_ms']:g}ms latency, {opts['error_rate']:.0%} errors"
+    )
+    print(f"{'='*72}")
+    print(f"{'Scenario':<14} {'Wall (s)':>10} {'Peak RSS (MB)':>15} {'Requests':>10} {'KB sent':>10} {'Exit':>6}")
+    print(f"{'-'*72}")
+    for r in results:
+        total = sum(sum(counts.values()) for counts in r["requests"].values())
+        print(
+            f"{r['scenario']:<14} {r['wall_seconds']:>10.2f} {r['peak_rss_mb']:>15.1f} "
+            f"{total:>10} {r['bytes_sent'] / 1024:>10.0f} {r['exit_code']:>6}"
+        )
+    for r in results:
+        if r["phases"]:
+            phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in r["phases"].items())
+            print(f"\n{r['scenario']} phases: {phases}")
+        print(f"\n{r['scenario']} requests per endpoint:")
+        for server, counts in r["requests"].items():
+            for endpoint, count in sorted(counts.items(), key=lambda x: (-x[1], x[0])):
+                print(f"  {server:<13} {endpoint:<40} {count:>6}")
+    print()
+
+
+def main():
+    opts = parse_args(sys.argv[1:])
+    results = run_scenarios(opts)
+    print_report(results, opts)
+    if opts["json"]:
+        with open(opts["json"], "w") as f:
+            json.dump({"options": opts, "results": results}, f, indent=2)
+        print(f"Results written to {opts['json']}")
+    if any(r["exit_code"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Child-process entry point for the benchmark suite.
+
+Loads mdblist-sync.py or arr-maintenance.py as a module, repoints instance
+discovery and the MDBList base URL at the fake servers, then calls main().
+Runs in its own process so the parent can read its peak RSS via wait4().
+
+The target is described by the BENCH_TARGET environment variable (JSON):
+    {"script": "...", "argv": [...], "mdblist_url": "...",
+     "instances": {"radarr": ["http://127.0.0.1:port", "api-key"], ...},
+     "log_file": "..."}
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+
+def load_module(path: str, argv: list):
+    # arr-maintenance reads its flags from sys.argv at import time
+    sys.argv = [path] + argv
+    name = os.path.basename(path).replace("-", "_").rsplit(".", 1)[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def patch_mdblist_sync(module, target: dict):
+    module.MDBLIST_API_BASE = target["mdblist_url"]
+    # Import lists (and poll cost probes) fetch the public list JSON from the fake too
+    module.MDBLIST_LIST_BASE = f"{target['mdblist_url']}/lists"
+    instances = target["instances"]
+
+    def find_arr_instances(kind):
+        return {name: (url, api_key, "") for name, (url, api_key) in instances.items() if kind in name}
+
+    module.find_arr_instances = find_arr_instances
+
+
+def patch_arr_maintenance(module, target: dict):
+    module.LOG_FILE = target["log_file"]
+    instances = target["instances"]
+
+    def discover_all_instances():
+        radarr, sonarr = [], []
+        for name, (url, api_key) in instances.items():
+            api = module.ArrAPI(url, api_key)
+            (radarr if "radarr" in name else sonarr).append((name, api))
+        return radarr, sonarr
+
+    module.discover_all_instances = discover_all_instances
+
+
+def main():
+    target = json.loads(os.environ["BENCH_TARGET"])
+    module = load_module(target["script"], target.get("argv", []))
+    if hasattr(module, "MDBListAPI"):
+        patch_mdblist_sync(module, target)
+    else:
+        patch_arr_maintenance(module, target)
+    try:
+        # METRICS.run() writes the Prometheus textfile the report reads phases from
+        module.METRICS.run(module.main)
+    except SystemExit as e:
+        sys.exit(e.code)
+
+
+if __name__ == "__main__":
+    main()
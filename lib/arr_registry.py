@@ -0,0 +1,307 @@
+"""
+Shared *arr instance registry for the swizzin-scripts Python tools.
+
+Finds every Sonarr/Radarr/Lidarr/Readarr/Prowlarr/Whisparr instance from
+its config.xml under /home/<user>/.config/ (Radarr, radarr-4k, Radarr4k,
+sonarr-anime, ...) and parses port, API key and URL base once. The result
+is cached as JSON together with the mtimes of /home, each user's .config
+directory and every config.xml, so later runs only stat a handful of paths
+and reuse the cache until an instance is added, removed or reconfigured.
+
+    import arr_registry
+
+    for inst in arr_registry.discover():
+        print(inst.name, inst.kind, inst.url(), inst.api_key)
+
+    radarr = arr_registry.find("radarr-4k")
+
+    # Concurrent reachability check (GET /api/<v>/system/status), over the
+    # caller's http_utils.HTTPClient when given
+    for inst, status, error in arr_registry.probe(arr_registry.discover("radarr"), client=HTTP):
+        ...
+
+Import from a script:
+    sys.path.insert(0, "<repo>/lib")
+    import arr_registry
+"""
+
+import json
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+
+from http_utils import HTTPClient
+
+HOME = "/home"
+
+# Cache location; tools that can't write it (non-root) just rescan
+CACHE_PATH = os.environ.get("ARR_REGISTRY_CACHE", "/opt/swizzin-extras/arr-registry.json")
+CACHE_VERSION = 1
+
+# Instance kinds and the API version their /system/status lives under
+ARR_KINDS = {
+    "sonarr": "v3",
+    "radarr": "v3",
+    "whisparr": "v3",
+    "lidarr": "v1",
+    "readarr": "v1",
+    "prowlarr": "v1",
+}
+
+# Client for probe() when the caller doesn't pass its own (no retries: an
+# unreachable instance should be reported, not waited for)
+HTTP = HTTPClient(timeout=5, user_agent="arr-registry/1.0")
+
+# Config directory -> kind + suffix: Radarr, radarr-4k, Radarr4k, sonarr_anime
+_DIR_RE = re.compile(r"^(%s)[-_]?([a-z0-9][a-z0-9-]*)?$" % "|".join(ARR_KINDS))
+
+
+class ArrInstance:
+    """One *arr instance as described by its config.xml."""
+
+    __slots__ = ("name", "kind", "port", "api_key", "url_base", "config_path", "user")
+
+    def __init__(self, name: str, kind: str, port: str, api_key: str, url_base: str = "",
+                 config_path: str = "", user: str = ""):
+        self.name = name
+        self.kind = kind
+        self.port = str(port)
+        self.api_key = api_key
+        self.url_base = url_base
+        self.config_path = config_path
+        self.user = user
+
+    @property
+    def api_version(self) -> str:
+        return ARR_KINDS.get(self.kind, "v3")
+
+    def url(self, host: str = "127.0.0.1", with_base: bool = True) -> str:
+        """Local URL of the instance, with its URL base unless told otherwise."""
+        url = f"http://{host}:{self.port}"
+        return url + self.url_base if with_base else url
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ArrInstance":
+        return cls(**{k: data.get(k, "") for k in cls.__slots__})
+
+    def __repr__(self) -> str:
+        return f"ArrInstance({self.name!r}, {self.kind!r}, port={self.port})"
+
+
+def instance_name(dirname: str) -> Optional[Tuple[str, str]]:
+    """Canonical (name, kind) for a config directory name, or None if not an *arr."""
+    m = _DIR_RE.match(dirname.lower())
+    if not m:
+        return None
+    kind, suffix = m.groups()
+    return (f"{kind}-{suffix}" if suffix else kind), kind
+
+
+def normalize_url_base(url_base: str) -> str:
+    """"radarr/" or "/radarr" -> "/radarr"; empty stays empty."""
+    url_base = (url_base or "").strip().strip("/")
+    return f"/{url_base}" if url_base else ""
+
+
+def parse_config(path: str) -> Optional[Tuple[str, str, str]]:
+    """(port, api_key, url_base) from an *arr config.xml, or None."""
+    try:
+        root = ET.parse(path).getroot()
+    except (ET.ParseError, OSError):
+        return None
+    port = root.findtext("Port", "")
+    api_key = root.findtext("ApiKey", "")
+    if not port or not api_key:
+        return None
+    return port, api_key, normalize_url_base(root.findtext("UrlBase", ""))
+
+
+def _master_user() -> str:
+    try:
+        with open("/root/.master.info") as f:
+            return f.read().strip().split(":")[0]
+    except OSError:
+        return ""
+
+
+def master_user(home: str = HOME) -> str:
+    """The swizzin master user, else the first user under home."""
+    master = _master_user()
+    if master:
+        return master
+    try:
+        users = sorted(e.name for e in os.scandir(home) if e.is_dir() and not e.name.startswith("."))
+    except OSError:
+        return ""
+    return users[0] if users else ""
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def scan(home: str = HOME) -> Tuple[List[ArrInstance], Dict[str, int]]:
+    """
+    Walk /home/*/.config for *arr config.xml files.
+
+    Returns (instances, stamps) where stamps maps every path whose change
+    could change the result to its mtime. The master user's instances come
+    first; a name already seen for another user is skipped.
+    """
+    stamps = {home: _mtime(home)}
+    try:
+        users = sorted(e.name for e in os.scandir(home) if e.is_dir() and not e.name.startswith("."))
+    except OSError:
+        return [], stamps
+    master = _master_user()
+    if master in users:
+        users.remove(master)
+        users.insert(0, master)
+
+    instances, seen = [], set()
+    for user in users:
+        config_dir = os.path.join(home, user, ".config")
+        stamps[config_dir] = _mtime(config_dir)
+        try:
+            entries = sorted(e.name for e in os.scandir(config_dir) if e.is_dir())
+        except OSError:
+            continue
+        for dirname in entries:
+            named = instance_name(dirname)
+            if not named:
+                continue
+            # The directory's mtime changes when config.xml appears in it
+            instance_dir = os.path.join(config_dir, dirname)
+            stamps[instance_dir] = _mtime(instance_dir)
+            path = os.path.join(instance_dir, "config.xml")
+            mtime = _mtime(path)
+            if mtime is None:
+                continue
+            stamps[path] = mtime
+            name, kind = named
+            parsed = parse_config(path)
+            if not parsed or name in seen:
+                continue
+            seen.add(name)
+            port, api_key, url_base = parsed
+            instances.append(ArrInstance(name, kind, port, api_key, url_base, path, user))
+    return instances, stamps
+
+
+def _load_cache(path: str, home: str) -> Optional[List[ArrInstance]]:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != CACHE_VERSION or data.get("home") != home:
+        return None
+    stamps = data.get("stamps") or {}
+    if not stamps or any(_mtime(p) != mtime for p, mtime in stamps.items()):
+        return None
+    return [ArrInstance.from_dict(d) for d in data.get("instances", [])]
+
+
+def _save_cache(path: str, home: str, instances: List[ArrInstance], stamps: Dict[str, int]):
+    data = {
+        "version": CACHE_VERSION,
+        "home": home,
+        "stamps": stamps,
+        "instances": [inst.to_dict() for inst in instances],
+    }
+    tmp_path = None
+    try:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".arr-registry-", suffix=".tmp", dir=directory)
+        # Holds API keys
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+# Per-process memo, so repeated discover()/find() calls don't re-stat
+_memo: Dict[Tuple[str, str], List[ArrInstance]] = {}
+
+
+def discover(kind: Optional[str] = None, refresh: bool = False, home: str = HOME,
+             cache_path: Optional[str] = None) -> List[ArrInstance]:
+    """
+    All *arr instances (or only those of one kind), from the cache when no
+    config.xml or .config directory changed since it was written.
+    """
+    cache_path = CACHE_PATH if cache_path is None else cache_path
+    key = (home, cache_path)
+    instances = None if refresh else _memo.get(key)
+    if instances is None and not refresh and cache_path:
+        instances = _load_cache(cache_path, home)
+    if instances is None:
+        instances, stamps = scan(home)
+        if cache_path:
+            _save_cache(cache_path, home, instances, stamps)
+    _memo[key] = instances
+    if kind:
+        return [inst for inst in instances if inst.kind == kind]
+    return list(instances)
+
+
+def find(name: str, **kwargs) -> Optional[ArrInstance]:
+    """Instance by canonical name (e.g. "radarr-4k"); accepts directory spellings too."""
+    named = instance_name(name)
+    if named:
+        name = named[0]
+    return next((inst for inst in discover(**kwargs) if inst.name == name), None)
+
+
+def _status(inst: ArrInstance, host: str, timeout: float, client: HTTPClient) -> dict:
+    resp = client.request(
+        "GET",
+        f"{inst.url(host)}/api/{inst.api_version}/system/status",
+        headers={"X-Api-Key": inst.api_key, "Accept": "application/json"},
+        timeout=timeout,
+    )
+    return resp.json() or {}
+
+
+def probe(instances: List[ArrInstance], timeout: float = 5.0, host: str = "127.0.0.1",
+          max_workers: int = 8, client: Optional[HTTPClient] = None) -> List[Tuple[ArrInstance, Optional[dict], str]]:
+    """
+    Check every instance at once via /system/status, over `client` (the
+    caller's shared http_utils client, so the connections are reused for
+    the requests that follow) or this module's own. Returns
+    (instance, status, error) in input order; status is None when the
+    instance is unreachable or rejected the API key, with error saying why.
+    """
+    if not instances:
+        return []
+    client = client or HTTP
+
+    def check(inst):
+        try:
+            return inst, _status(inst, host, timeout, client), ""
+        except HTTPError as e:
+            return inst, None, f"HTTP {e.code}"
+        except URLError as e:
+            return inst, None, str(e.reason)
+        except (OSError, ValueError) as e:
+            return inst, None, str(e) or type(e).__name__
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(instances))) as pool:
+        return list(pool.map(check, instances))
@@ -0,0 +1,605 @@
+"""
+Shared HTTP client for the swizzin-scripts Python tools.
+
+Keeps persistent (keep-alive) connections per host so a run that makes
+hundreds of calls to api.mdblist.com or a local Sonarr/Radarr pays the TCP
+and TLS setup once per connection instead of once per request. Responses
+are transparently gzip/deflate decoded.
+
+An optional RetryPolicy retries transient failures (429, 5xx, refused
+connections) with jittered exponential backoff, honouring Retry-After and
+X-RateLimit-* headers, and trips a per-host circuit breaker when a host
+keeps failing.
+
+Large responses can be streamed instead: stream() yields decoded body
+chunks without holding the whole body, and iter_json_array() turns such a
+stream of a top-level JSON array into one parsed element at a time.
+
+    with client.stream("GET", url) as chunks:
+        for movie in iter_json_array(chunks):
+            ...
+
+Errors mirror urllib so existing callers keep working:
+    - HTTP status >= 300 (after redirects) raises urllib.error.HTTPError
+      (with a readable body and headers)
+    - connection/timeout failures raise urllib.error.URLError
+
+Import from a script:
+    sys.path.insert(0, "<repo>/lib")
+    from http_utils import HTTPClient, RetryPolicy
+"""
+
+import codecs
+import gzip
+import http.client
+import io
+import json
+import random
+import re
+import ssl
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+
+# Connections idle for longer than this are dropped instead of reused; most
+# servers (Kestrel, nginx, Cloudflare) close idle keep-alive sockets after
+# 60s or more, so reusing a younger socket is almost always safe.
+IDLE_TIMEOUT = 30
+
+# Methods that may be replayed on a fresh connection when a reused keep-alive
+# socket turns out to be dead before any response arrived.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "DELETE", "PUT", "OPTIONS"}
+
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+
+# Read size for streamed responses
+STREAM_CHUNK = 64 * 1024
+
+# Statuses worth retrying. Non-idempotent requests (POST) are only retried
+# when the server says it didn't process them (429, 503).
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_STATUSES_UNSAFE = {429, 503}
+
+
+class CircuitOpenError(URLError):
+    """Raised without sending when a host's circuit breaker is open."""
+
+
+class RetryPolicy:
+    """
+    Retry, backoff and circuit-breaking rules shared by every request of a client.
+
+    - Backoff is "full jitter" exponential: uniform(0, min(max_delay, base * 2^n)).
+    - Retry-After (seconds or HTTP date) and exhausted X-RateLimit-Remaining /
+      X-RateLimit-Reset headers override the backoff. A server-requested wait
+      longer than max_wait is not retried (e.g. a daily quota reset).
+    - retry_budget caps retries across the whole run so a bad night can't
+      turn into a retry storm. Long-lived callers call reset() per run.
+    - After circuit_threshold consecutive failures a host's circuit opens:
+      requests fail fast for circuit_cooldown seconds, then one trial request
+      is let through (half-open) while the rest keep failing fast. A good
+      trial closes the circuit, a failed one reopens it for another cooldown.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0,
+                 max_wait: float = 120.0, retry_budget: int = 50, circuit_threshold: int = 5,
+                 circuit_cooldown: float = 60.0,
+                 on_retry: Optional[Callable[[str, str, int, float, str], None]] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.retry_budget = retry_budget
+        self.circuit_threshold = circuit_threshold
+        self.circuit_cooldown = circuit_cooldown
+        self.on_retry = on_retry
+        self.stats = {"retries": 0, "circuit_trips": 0}
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        # Hosts whose half-open trial request hasn't been recorded yet
+        self._trial: set = set()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Start a new run: refill the retry budget and zero the stats. Circuit state is kept."""
+        with self._lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    # -------------------------------------------------------------------------
+    # Circuit breaker
+    # -------------------------------------------------------------------------
+
+    def before_request(self, host: str):
+        with self._lock:
+            open_until = self._open_until.get(host)
+            if open_until is None:
+                return
+            if host in self._trial or time.monotonic() < open_until:
+                raise CircuitOpenError(f"circuit open for {host} after repeated failures")
+            # Cooldown over: half-open, let this request through as the trial
+            self._trial.add(host)
+
+    def record(self, host: str, ok: bool):
+        with self._lock:
+            if host in self._trial:
+                self._trial.discard(host)
+                if ok:
+                    del self._open_until[host]
+                    self._failures.pop(host, None)
+                else:
+                    self._open_until[host] = time.monotonic() + self.circuit_cooldown
+                    self.stats["circuit_trips"] += 1
+                return
+            if ok:
+                self._failures.pop(host, None)
+                return
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.circuit_threshold and host not in self._open_until:
+                self._open_until[host] = time.monotonic() + self.circuit_cooldown
+                self.stats["circuit_trips"] += 1
+
+    # -------------------------------------------------------------------------
+    # Backoff
+    # -------------------------------------------------------------------------
+
+    def next_delay(self, method: str, attempt: int, status: Optional[int] = None,
+                   headers=None, error: Optional[BaseException] = None) -> Optional[float]:
+        """Seconds to wait before retry number `attempt` (1-based), or None to give up."""
+        if attempt >= self.max_attempts:
+            return None
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if status is not None:
+            if status not in (RETRY_STATUSES if idempotent else RETRY_STATUSES_UNSAFE):
+                return None
+        elif not idempotent:
+            # Only a refused connection guarantees the request never reached the server
+            if not isinstance(getattr(error, "reason", error), ConnectionRefusedError):
+                return None
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        server_wait = _server_wait(headers) if headers is not None else None
+        if server_wait is not None:
+            if server_wait > self.max_wait:
+                return None
+            delay = server_wait + random.uniform(0, 1)
+
+        with self._lock:
+            if self.stats["retries"] >= self.retry_budget:
+                return None
+            self.stats["retries"] += 1
+        return delay
+
+
+def _server_wait(headers) -> Optional[float]:
+    """How long the server asked us to wait (Retry-After / X-RateLimit-*), if at all."""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        retry_after = retry_after.strip()
+        if retry_after.isdigit():
+            return float(retry_after)
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is not None and reset and remaining.strip() == "0":
+        try:
+            reset_value = float(reset)
+        except ValueError:
+            return None
+        # Epoch timestamp or seconds-until-reset, depending on the server
+        return max(0.0, reset_value - time.time()) if reset_value > 1e9 else reset_value
+    return None
+
+
+class HTTPResponse:
+    """A fully read, decoded HTTP response."""
+
+    def __init__(self, url: str, status: int, reason: str, headers, body: bytes):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        if not self.body:
+            return None
+        return json.loads(self.body.decode())
+
+
+class HTTPClient:
+    """Thread-safe HTTP/1.1 client with a per-host keep-alive connection pool."""
+
+    def __init__(self, timeout: float = 30, user_agent: str = "swizzin-scripts/1.0",
+                 max_idle_per_host: int = 8, retry: Optional[RetryPolicy] = None):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_idle_per_host = max_idle_per_host
+        self.retry = retry
+        self.stats = {"requests": 0, "connections": 0, "reused": 0}
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[float, http.client.HTTPConnection]]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None) -> HTTPResponse:
+        """Send a request and return the decoded response (see module docstring for errors)."""
+        return self._with_retry(method, url, lambda: self._request_once(method, url, body, headers, timeout))
+
+    @contextmanager
+    def stream(self, method: str, url: str, body: Optional[bytes] = None,
+               headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+               chunk_size: int = STREAM_CHUNK) -> Iterator[Iterator[bytes]]:
+        """
+        Send a request and yield an iterator over its decoded body chunks.
+
+        Only the response status and headers are retried; a failure while
+        the body is being read raises URLError. Redirects are not followed.
+        The connection goes back to the pool once the body has been read to
+        the end, and is closed if the caller stops early.
+        """
+        key, path = self._host_key(url)
+        conn, raw = self._with_retry(method, url, lambda: self._open_stream(key, path, url, method, body,
+                                                                          headers or {}, timeout or self.timeout))
+        finished = False
+
+        def chunks():
+            nonlocal finished
+            decoder = _StreamDecoder(raw.headers.get("Content-Encoding", ""))
+            try:
+                while True:
+                    data = raw.read(chunk_size)
+                    if not data:
+                        break
+                    data = decoder.decompress(data)
+                    if data:
+                        yield data
+                tail = decoder.flush()
+                if tail:
+                    yield tail
+            except (OSError, http.client.HTTPException, zlib.error) as e:
+                raise URLError(e)
+            finished = True
+
+        try:
+            yield chunks()
+        finally:
+            if finished and not raw.will_close:
+                self._checkin(key, conn)
+            else:
+                conn.close()
+
+    def _with_retry(self, method: str, url: str, send: Callable):
+        """Run send() under the retry policy (if any) and return its result."""
+        retry = self.retry
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            if retry:
+                retry.before_request(host)
+            try:
+                resp = send()
+            except HTTPError as e:
+                failed = e.code == 429 or e.code >= 500
+                if not retry:
+                    raise
+                retry.record(host, not failed)
+                delay = retry.next_delay(method, attempt + 1, status=e.code, headers=e.headers)
+                if delay is None:
+                    raise
+                reason = f"HTTP {e.code}"
+            except URLError as e:
+                if not retry:
+                    raise
+                retry.record(host, False)
+                delay = retry.next_delay(method, attempt + 1, error=e)
+                if delay is None:
+                    raise
+                reason = str(e.reason)
+            except BaseException:
+                # Still record it, or a half-open trial would never finish
+                if retry:
+                    retry.record(host, False)
+                raise
+            else:
+                if retry:
+                    retry.record(host, True)
+                return resp
+
+            attempt += 1
+            if retry.on_retry:
+                retry.on_retry(method, url, attempt, delay, reason)
+            time.sleep(delay)
+
+    def _request_once(self, method: str, url: str, body: Optional[bytes],
+                      headers: Optional[Dict[str, str]], timeout: Optional[float]) -> HTTPResponse:
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._send(method, url, body, headers or {}, timeout or self.timeout)
+            location = resp.headers.get("Location")
+            if resp.status not in REDIRECT_CODES or not location:
+                break
+            url = urljoin(url, location)
+            if resp.status == 303:
+                method, body = "GET", None
+
+        if resp.status >= 300:
+            raise HTTPError(resp.url, resp.status, resp.reason, resp.headers, io.BytesIO(resp.body))
+        return resp
+
+    def get_json(self, url: str, headers: Optional[Dict[str, str]] = None,
+                 timeout: Optional[float] = None):
+        return self.request("GET", url, headers=headers, timeout=timeout).json()
+
+    def close(self):
+        """Close every idle pooled connection."""
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for pool in pools.values():
+            for _, conn in pool:
+                conn.close()
+
+    # -------------------------------------------------------------------------
+    # Connection pool
+    # -------------------------------------------------------------------------
+
+    def _host_key(self, url: str) -> Tuple[Tuple[str, str, int], str]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise URLError(f"unsupported URL scheme: {scheme}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        return (scheme, parts.hostname or "", port), path
+
+    def _checkout(self, key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused) for a host, preferring a warm idle one."""
+        now = time.monotonic()
+        with self._lock:
+            pool = self._idle.get(key, [])
+            while pool:
+                idle_since, conn = pool.pop()
+                if now - idle_since < IDLE_TIMEOUT:
+                    self.stats["reused"] += 1
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+            self.stats["connections"] += 1
+
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def _checkin(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection):
+        with self._lock:
+            pool = self._idle.setdefault(key, [])
+            if len(pool) < self.max_idle_per_host:
+                pool.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+    # -------------------------------------------------------------------------
+    # Request execution
+    # -------------------------------------------------------------------------
+
+    def _send(self, method: str, url: str, body: Optional[bytes],
+              headers: Dict[str, str], timeout: float) -> HTTPResponse:
+        key, path = self._host_key(url)
+        send_headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        send_headers.update(headers)
+
+        while True:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                conn.request(method, path, body=body, headers=send_headers)
+                raw = conn.getresponse()
+                data = raw.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError,
+                    ConnectionResetError, http.client.BadStatusLine) as e:
+                conn.close()
+                # A reused socket the server already closed: replay once on a
+                # fresh connection, but only when replaying can't duplicate work.
+                if reused and method.upper() in IDEMPOTENT_METHODS:
+                    continue
+                raise URLError(e)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise URLError(e)
+            break
+
+        with self._lock:
+            self.stats["requests"] += 1
+        if raw.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+
+        return HTTPResponse(url, raw.status, raw.reason, raw.headers,
+                            _decode_body(data, raw.headers.get("Content-Encoding", "")))
+
+    def _open_stream(self, key: Tuple[str, str, int], path: str, url: str, method: str,
+                     body: Optional[bytes], headers: Dict[str, str],
+                     timeout: float) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request and return (connection, response) with the body still unread."""
+        send_headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        send_headers.update(headers)
+
+        while True:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                conn.request(method, path, body=body, headers=send_headers)
+                raw = conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError,
+                    ConnectionResetError, http.client.BadStatusLine) as e:
+                conn.close()
+                if reused and method.upper() in IDEMPOTENT_METHODS:
+                    continue
+                raise URLError(e)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise URLError(e)
+            break
+
+        with self._lock:
+            self.stats["requests"] += 1
+        if raw.status >= 300:
+            # Error bodies are small; read them so HTTPError carries the message
+            try:
+                data = _decode_body(raw.read(), raw.headers.get("Content-Encoding", ""))
+            except (OSError, http.client.HTTPException, zlib.error):
+                data = b""
+            conn.close()
+            raise HTTPError(url, raw.status, raw.reason, raw.headers, io.BytesIO(data))
+        return conn, raw
+
+
+def _decode_body(data: bytes, encoding: str) -> bytes:
+    encoding = encoding.strip().lower()
+    if not data or not encoding or encoding == "identity":
+        return data
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
+
+
+class _StreamDecoder:
+    """Incremental gzip/deflate decoding for streamed bodies."""
+
+    def __init__(self, encoding: str):
+        encoding = encoding.strip().lower()
+        self._raw_deflate = False
+        if encoding == "gzip":
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            self._obj = zlib.decompressobj()
+        else:
+            self._obj = None
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._obj is None:
+            return data
+        try:
+            return self._obj.decompress(data)
+        except zlib.error:
+            # Raw deflate without the zlib header, detected on the first chunk
+            if self._raw_deflate or self._obj.unused_data or self._obj.eof:
+                raise
+            self._raw_deflate = True
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush() if self._obj is not None else b""
+
+
+_JSON_WS = re.compile(r"\s*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+def iter_json_array(chunks, decoder: Optional[json.JSONDecoder] = None) -> Iterator[Any]:
+    """
+    Parse a top-level JSON array from an iterable of byte chunks, yielding
+    one element at a time. Memory stays bounded by the largest element
+    plus one chunk, however long the array is. Raises ValueError on
+    malformed input, including empty elements ("[1,,2]", "[1,]").
+    """
+    decoder = decoder or json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf, pos, eof = "", 0, False
+    # What comes next: "[" (start), element or "]" (first), element (value),
+    # "," or "]" (sep)
+    expect = "start"
+
+    def more() -> bool:
+        nonlocal buf, pos, eof
+        for chunk in chunks:
+            text = utf8.decode(chunk)
+            if text:
+                buf = buf[pos:] + text
+                pos = 0
+                return True
+        if not eof:
+            eof = True
+            buf = buf[pos:] + utf8.decode(b"", final=True)
+            pos = 0
+        return False
+
+    while True:
+        pos = _JSON_WS.match(buf, pos).end()
+        if pos >= len(buf):
+            if more():
+                continue
+            if eof and expect == "start":
+                raise ValueError("empty response, expected a JSON array")
+            raise ValueError("unterminated JSON array")
+        char = buf[pos]
+        if expect == "start":
+            if char != "[":
+                raise ValueError(f"expected a JSON array, got {char!r}")
+            expect = "first"
+            pos += 1
+            continue
+        if expect == "sep":
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"expected ',' or ']' in JSON array, got {char!r}")
+            expect = "value"
+            pos += 1
+            continue
+        if char == "]" and expect == "first":
+            return
+        if char in ",]":
+            raise ValueError(f"empty element in JSON array at {char!r}")
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Most likely an element split across chunks
+            if more() or not eof:
+                continue
+            raise
+        if not eof and _NUMBER_TAIL.match(buf, end).end() == len(buf):
+            # A number at the end of the buffer may still be cut short
+            # ("2" of "2.5"): parse again once the next chunk (or the end of
+            # the stream) is in
+            more()
+            continue
+        pos = end
+        expect = "sep"
+        yield value
@@ -0,0 +1,263 @@
+"""
+Run metrics for the swizzin-scripts Python tools, exported as a Prometheus
+textfile.
+
+Records per-endpoint request latency histograms, call/error counts and
+response bytes, plus how long each major phase of a run took. At the end
+of the run everything is written atomically to a `.prom` file that the
+node_exporter textfile collector (or anything else that scrapes Prometheus
+text format) can pick up, so run time and slow endpoints can be graphed
+and alerted on over weeks.
+
+    METRICS = Metrics("mdblist_sync")
+
+    with METRICS.request("mdblist", "GET", "/lists/search") as call:
+        resp = HTTP.request(...)
+        call.bytes = len(resp.body)
+
+    @METRICS.phase("discover_lists")
+    def discover_lists(...): ...
+
+    if __name__ == "__main__":
+        METRICS.run(main)   # writes METRICS.path (if set) when main exits
+
+Import from a script:
+    sys.path.insert(0, "<repo>/lib")
+    from metrics import Metrics
+"""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+from urllib.error import HTTPError
+
+# Latency buckets (seconds): local *arr calls land in the low buckets, MDBList
+# and large /movie or /queue pulls in the high ones
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Numeric path segments are collapsed so /lists/123 and /lists/456 share a series
+_ID_SEGMENT_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(path: str) -> str:
+    """Normalise a request path (no query string, ids collapsed) for use as a label."""
+    return _ID_SEGMENT_RE.sub("/{id}", path.split("?", 1)[0])
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Tuple[Tuple[str, str], ...]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Call:
+    """Handle yielded by Metrics.request(); set `.bytes` once the body is read."""
+
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """Thread-safe collector for one run of a script."""
+
+    def __init__(self, namespace: str, path: str = ""):
+        self.namespace = namespace
+        self.path = path
+        self._lock = threading.Lock()
+        self._latency: Dict[tuple, _Histogram] = {}
+        self._errors: Dict[tuple, int] = {}
+        self._bytes: Dict[tuple, int] = {}
+        self._phases: Dict[str, list] = {}
+        self._gauges: Dict[str, Tuple[str, Dict[tuple, float]]] = {}
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    def observe_request(self, api: str, method: str, path: str, seconds: float,
+                        nbytes: int = 0, error: str = ""):
+        key = (("api", api), ("method", method), ("endpoint", endpoint_label(path)))
+        with self._lock:
+            self._latency.setdefault(key, _Histogram()).observe(seconds)
+            self._bytes[key] = self._bytes.get(key, 0) + nbytes
+            if error:
+                error_key = key + (("error", error),)
+                self._errors[error_key] = self._errors.get(error_key, 0) + 1
+
+    @contextmanager
+    def request(self, api: str, method: str, path: str):
+        """Time one API call; exceptions are counted as errors and re-raised."""
+        call = _Call()
+        start = time.monotonic()
+        error = ""
+        try:
+            yield call
+        except HTTPError as e:
+            # 3xx (e.g. 304 Not Modified on a cache revalidation) is not a failure
+            error = "" if e.code < 400 else str(e.code)
+            raise
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.observe_request(api, method, path, time.monotonic() - start, call.bytes, error)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Accumulate wall time spent in a phase; usable as a decorator too.
+
+        Phases that run once per instance are summed, so with concurrent
+        instances the total can exceed the run's wall time.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                totals = self._phases.setdefault(name, [0.0, 0])
+                totals[0] += elapsed
+                totals[1] += 1
+
+    def reset(self):
+        """Forget everything recorded so far (long-running callers, per run)."""
+        with self._lock:
+            self._latency.clear()
+            self._errors.clear()
+            self._bytes.clear()
+            self._phases.clear()
+            self._gauges.clear()
+
+    def set_gauge(self, name: str, value: float, help_text: str, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, (help_text, {}))[1][key] = value
+
+    # -------------------------------------------------------------------------
+    # Export
+    # -------------------------------------------------------------------------
+
+    def render(self) -> str:
+        """Return all metrics in Prometheus text exposition format."""
+        ns = self.namespace
+        out = []
+
+        def header(name, help_text, kind):
+            out.append(f"# HELP {ns}_{name} {help_text}")
+            out.append(f"# TYPE {ns}_{name} {kind}")
+
+        with self._lock:
+            if self._latency:
+                header("http_request_duration_seconds", "API request latency by endpoint.", "histogram")
+                for key, hist in sorted(self._latency.items()):
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, hist.counts):
+                        cumulative += count
+                        out.append(
+                            f"{ns}_http_request_duration_seconds_bucket"
+                            f"{_labels(key + (('le', f'{bound:g}'),))} {cumulative}"
+                        )
+                    out.append(f"{ns}_http_request_duration_seconds_bucket{_labels(key + (('le', '+Inf'),))} {hist.count}")
+                    out.append(f"{ns}_http_request_duration_seconds_sum{_labels(key)} {hist.total:.6f}")
+                    out.append(f"{ns}_http_request_duration_seconds_count{_labels(key)} {hist.count}")
+
+                header("http_response_bytes_total", "Response body bytes received by endpoint.", "counter")
+                for key, nbytes in sorted(self._bytes.items()):
+                    out.append(f"{ns}_http_response_bytes_total{_labels(key)} {nbytes}")
+
+            if self._errors:
+                header("http_request_errors_total", "Failed API requests by endpoint and error.", "counter")
+                for key, count in sorted(self._errors.items()):
+                    out.append(f"{ns}_http_request_errors_total{_labels(key)} {count}")
+
+            if self._phases:
+                header("phase_duration_seconds", "Time spent in each phase of the last run.", "gauge")
+                for name, (seconds, _) in sorted(self._phases.items()):
+                    out.append(f"{ns}_phase_duration_seconds{_labels((('phase', name),))} {seconds:.6f}")
+                header("phase_calls", "Times each phase ran during the last run.", "gauge")
+                for name, (_, calls) in sorted(self._phases.items()):
+                    out.append(f"{ns}_phase_calls{_labels((('phase', name),))} {calls}")
+
+            for name, (help_text, series) in sorted(self._gauges.items()):
+                header(name, help_text, "gauge")
+                for key, value in sorted(series.items()):
+                    out.append(f"{ns}_{name}{_labels(key)} {value}")
+
+        return "\n".join(out) + "\n"
+
+    def write_textfile(self, path: Optional[str] = None):
+        """Atomically write the metrics file (tmp file + rename in the same dir)."""
+        path = path or self.path
+        if not path:
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".metrics-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def run(self, main: Callable[[], None], on_error: Optional[Callable[[str], None]] = None):
+        """Call main(), then record run duration/outcome and write the textfile.
+
+        SystemExit from main() is re-raised after the file is written; a
+        non-zero exit code counts as a failed run.
+        """
+        start = time.monotonic()
+        success = False
+        try:
+            main()
+            success = True
+        except SystemExit as e:
+            success = not e.code
+            raise
+        finally:
+            self.finish_run(time.monotonic() - start, success, on_error)
+
+    def finish_run(self, seconds: float, success: bool, on_error: Optional[Callable[[str], None]] = None):
+        """Record run duration/outcome gauges and write the textfile (if a path is set)."""
+        if not self.path:
+            return
+        self.set_gauge("run_duration_seconds", seconds, "Wall time of the last run.")
+        self.set_gauge("last_run_success", int(success), "1 if the last run finished without error.")
+        self.set_gauge("last_run_timestamp_seconds", time.time(), "Unix time the last run finished.")
+        try:
+            self.write_textfile()
+        except OSError as e:
+            if on_error:
+                on_error(f"Failed to write metrics to {self.path}: {e}")
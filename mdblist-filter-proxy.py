@@ -16,6 +16,10 @@ at the proxy URL instead of mdblist.com.
 Usage:
     GET /lists/<user>/<slug>/json   ->  proxies to https://mdblist.com/lists/<user>/<slug>/json
 
+Responses carry X-Upstream-Seconds (how long the upstream fetch behind
+the body took, also on cache hits) and X-Cache (HIT/MISS), which
+mdblist-sync uses to measure each list's poll cost.
+
 Env:
     MDBLIST_PROXY_HOST  bind host, default 127.0.0.1
     MDBLIST_PROXY_PORT  bind port, default 11550
@@ -37,7 +41,8 @@ PORT = int(os.environ.get("MDBLIST_PROXY_PORT", "11550"))
 TTL = int(os.environ.get("MDBLIST_PROXY_TTL", "300"))
 TIMEOUT = 15
 
-_cache: dict[str, tuple[float, bytes]] = {}
+# path -> (expires_at, body, upstream_seconds)
+_cache: dict[str, tuple[float, bytes, float]] = {}
 _lock = threading.Lock()
 
 
@@ -77,29 +82,32 @@ def _filter(data):
     return kept, nulled, dropped
 
 
-def _fetch(path: str) -> tuple[int, bytes, str]:
-    """Fetch upstream and return (status, body, content_type). Honors short cache."""
+def _fetch(path: str) -> tuple[int, bytes, str, float, bool]:
+    """Fetch upstream and return (status, body, content_type, upstream_seconds, cached).
+    Honors short cache."""
     now = time.time()
     with _lock:
         cached = _cache.get(path)
         if cached and cached[0] > now:
-            return 200, cached[1], "application/json"
+            return 200, cached[1], "application/json", cached[2], True
 
     url = f"{UPSTREAM}{path}"
     req = Request(url, headers={"User-Agent": "mdblist-filter-proxy/1.0"})
+    start = time.monotonic()
     try:
         with urlopen(req, timeout=TIMEOUT) as resp:
             raw = resp.read()
             ctype = resp.headers.get("Content-Type", "application/json")
     except HTTPError as e:
-        return e.code, str(e).encode(), "text/plain"
+        return e.code, str(e).encode(), "text/plain", time.monotonic() - start, False
     except URLError as e:
-        return 502, f"upstream error: {e}".encode(), "text/plain"
+        return 502, f"upstream error: {e}".encode(), "text/plain", time.monotonic() - start, False
+    upstream_seconds = time.monotonic() - start
 
     try:
         data = json.loads(raw)
     except json.JSONDecodeError:
-        return 200, raw, ctype
+        return 200, raw, ctype, upstream_seconds, False
 
     filtered, nulled, dropped = _filter(data)
     body = json.dumps(filtered).encode()
@@ -109,8 +117,8 @@ def _fetch(path: str) -> tuple[int, bytes, str]:
             f"dropped {dropped} items (no usable id)\n"
         )
     with _lock:
-        _cache[path] = (now + TTL, body)
-    return 200, body, "application/json"
+        _cache[path] = (now + TTL, body, upstream_seconds)
+    return 200, body, "application/json", upstream_seconds, False
 
 
 class Handler(BaseHTTPRequestHandler):
@@ -118,10 +126,12 @@ class Handler(BaseHTTPRequestHandler):
         if not self.path.startswith("/lists/") or not self.path.endswith("/json"):
             self.send_error(404, "only /lists/<user>/<slug>/json is proxied")
             return
-        status, body, ctype = _fetch(self.path)
+        status, body, ctype, upstream_seconds, cached = _fetch(self.path)
         self.send_response(status)
         self.send_header("Content-Type", ctype)
         self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Upstream-Seconds", f"{upstream_seconds:.3f}")
+        self.send_header("X-Cache", "HIT" if cached else "MISS")
         self.end_headers()
         self.wfile.write(body)
 
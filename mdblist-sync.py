@@ -8,24 +8,49 @@ import lists in Sonarr/Radarr, so they handle polling and downloading.
 Usage:
     mdblist-sync.py                    # Sync: discover lists, add to *arr
     mdblist-sync.py --cleanup          # Remove stale/low-quality managed lists
+    mdblist-sync.py --with-cleanup     # Sync + cleanup in one run (one discovery)
     mdblist-sync.py --status           # Show current managed lists
     mdblist-sync.py --dry-run          # Preview changes without applying
     mdblist-sync.py --debug            # Verbose output
+    mdblist-sync.py --no-cache         # Ignore cached MDBList responses
+    mdblist-sync.py --full-refresh     # Re-run every search (incremental mode)
+    mdblist-sync.py --daemon           # Stay running: scheduled sync + cleanup
+    mdblist-sync.py --plan FILE        # Write planned changes (add --cleanup for removals)
+    mdblist-sync.py --apply FILE       # Apply a plan without any MDBList requests
 
 Requires: MDBList API key (free from https://mdblist.com/preferences/)
 """
 
+import hashlib
 import json
+import math
 import os
 import re
+import signal
 import sys
+import threading
 import time
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
+
+# Shared helpers live in the repo's lib/ (deployed to /opt/swizzin-extras/lib)
+for _lib_dir in (
+    Path(__file__).resolve().parent / "lib",
+    Path("/opt/swizzin-extras/lib"),
+    Path("/opt/swizzin-scripts/lib"),
+):
+    if (_lib_dir / "http_utils.py").is_file():
+        sys.path.insert(0, str(_lib_dir))
+        break
+
+from http_utils import HTTPClient, RetryPolicy  # noqa: E402
+from metrics import Metrics  # noqa: E402
+import arr_registry  # noqa: E402
 
 # =============================================================================
 # Configuration
@@ -40,10 +65,20 @@ STATE_PATH = os.environ.get(
     "MDBLIST_SYNC_STATE",
     "/opt/swizzin-extras/mdblist-sync.state.json",
 )
+CACHE_PATH = os.environ.get(
+    "MDBLIST_SYNC_CACHE",
+    "/opt/swizzin-extras/mdblist-sync.cache",
+)
 
 MDBLIST_API_BASE = "https://api.mdblist.com"
 MDBLIST_LIST_BASE = "https://mdblist.com/lists"
 
+# One keep-alive connection pool shared by the MDBList and *arr clients
+HTTP = HTTPClient(timeout=30, user_agent="mdblist-sync/1.0")
+
+# Per-endpoint latency and per-phase timings, written as a Prometheus textfile
+METRICS = Metrics("mdblist_sync")
+
 # Default config values (overridden by config file)
 DEFAULTS = {
     # MDBList API key - REQUIRED
@@ -60,6 +95,40 @@ DEFAULTS = {
     # Search terms for discovering lists (comma-separated)
     # Covers streaming platforms, genres, and popular categories
     "SEARCH_TERMS": "netflix,disney,hbo,amazon prime,hulu,apple tv,paramount,peacock,crunchyroll,trending,top rated,imdb,anime,sci-fi,horror,thriller,documentary,romance,comedy,action,crime,new releases,best 2026,oscar,mystery,fantasy",
+    # Max concurrent MDBList requests during discovery (top, searches, pinned)
+    "DISCOVERY_WORKERS": "8",
+    # Max Sonarr/Radarr instances synced concurrently
+    "SYNC_WORKERS": "4",
+    # Max concurrent import list additions/removals per instance
+    "IMPORT_LIST_WORKERS": "4",
+    # Incremental discovery: skip search terms whose results were unchanged
+    # for INCREMENTAL_STABLE_RUNS runs, re-running everything every
+    # INCREMENTAL_FULL_REFRESH_DAYS days
+    "INCREMENTAL_DISCOVERY": "false",
+    "INCREMENTAL_STABLE_RUNS": "3",
+    "INCREMENTAL_FULL_REFRESH_DAYS": "7",
+    # Overlap analysis: sample the first OVERLAP_SAMPLE_ITEMS titles of the
+    # top OVERLAP_CANDIDATES lists (and of lists already managed) and fill
+    # slots with the lists that add the most new titles, dropping lists whose
+    # sampled titles are already OVERLAP_MAX_SHARED percent covered
+    "OVERLAP_ANALYSIS": "true",
+    "OVERLAP_CANDIDATES": "12",
+    "OVERLAP_SAMPLE_ITEMS": "100",
+    "OVERLAP_MAX_SHARED": "70",
+    # Poll cost: every POLL_COST_INTERVAL_DAYS, fetch each managed list the
+    # way Sonarr/Radarr poll it and record items, payload size and latency.
+    # Lists needing more than POLL_COST_OUTLIER times the instance's median
+    # items per unique title, or slower than POLL_COST_MAX_SECONDS, are
+    # removed and not re-added for POLL_COST_DEMOTE_DAYS days (worst first,
+    # re-judging the rest after each). Discovery ranks lists over
+    # POLL_COST_OUTLIER times the median item count below smaller ones.
+    # Setting either limit to 0 turns that check off
+    "POLL_COST_TRACKING": "true",
+    "POLL_COST_INTERVAL_DAYS": "7",
+    "POLL_COST_WORKERS": "4",
+    "POLL_COST_OUTLIER": "4",
+    "POLL_COST_MAX_SECONDS": "60",
+    "POLL_COST_DEMOTE_DAYS": "30",
     # Specific list IDs to always include (comma-separated MDBList list IDs)
     "PINNED_LISTS": "",
     # Specific list IDs to never include (comma-separated MDBList list IDs)
@@ -78,55 +147,55 @@ DEFAULTS = {
     "SONARR_QUALITY_PROFILE": "",
     "SONARR_ROOT_FOLDER": "",
     # Override instance detection (comma-separated)
-    # Format: "radarr,radarr-4k" or "sonarr,sonarr-anime"
+    # Format: "radarr,radarr-4k" or "sonarr,sonarr-anime"; "all" syncs every
+    # installed instance. Empty means DEFAULT_INSTANCES
     "RADARR_INSTANCES": "",
     "SONARR_INSTANCES": "",
     # Cleanup: remove managed lists with fewer likes than this
     "CLEANUP_MIN_LIKES": "20",
+    # Cleanup: also run cleanup during every sync, reusing discovery likes
+    "SYNC_WITH_CLEANUP": "false",
     # Tag prefix for managed import lists (to identify our lists)
     "LIST_NAME_PREFIX": "[mdblist-auto]",
-}
-
-# *arr instance config paths
-ARR_INSTANCES = {
-    "radarr": {
-        "type": "radarr",
-        "config_paths": ["/home/{user}/.config/Radarr/config.xml"],
-    },
-    "radarr-4k": {
-        "type": "radarr",
-        "config_paths": [
-            "/home/{user}/.config/radarr-4k/config.xml",
-            "/home/{user}/.config/radarr4k/config.xml",
-            "/home/{user}/.config/Radarr4k/config.xml",
-        ],
-    },
-    "sonarr": {
-        "type": "sonarr",
-        "config_paths": ["/home/{user}/.config/Sonarr/config.xml"],
-    },
-    "sonarr-4k": {
-        "type": "sonarr",
-        "config_paths": [
-            "/home/{user}/.config/sonarr-4k/config.xml",
-            "/home/{user}/.config/sonarr4k/config.xml",
-            "/home/{user}/.config/Sonarr4k/config.xml",
-        ],
-    },
-    "sonarr-anime": {
-        "type": "sonarr",
-        "config_paths": ["/home/{user}/.config/sonarr-anime/config.xml"],
-    },
+    # MDBList response cache: per-endpoint TTLs in seconds (0 = don't cache)
+    "CACHE_TTL_TOP_LISTS": "21600",
+    "CACHE_TTL_SEARCH": "21600",
+    "CACHE_TTL_LIST_INFO": "21600",
+    "CACHE_TTL_LIST_ITEMS": "21600",
+    # MDBList response cache: max size on disk (least recently used evicted first)
+    "CACHE_MAX_MB": "50",
+    # MDBList requests kept in reserve when planning work against the quota
+    "QUOTA_RESERVE": "5",
+    # Retries for transient errors (429/5xx/refused): attempts per request,
+    # and total retries allowed per run across all hosts
+    "RETRY_MAX_ATTEMPTS": "4",
+    "RETRY_BUDGET": "50",
+    # Prometheus textfile with per-endpoint latency and phase timings,
+    # rewritten at the end of every run (empty disables)
+    "METRICS_TEXTFILE": "/opt/swizzin-extras/metrics/mdblist-sync.prom",
+    # Daemon mode (--daemon): run intervals in seconds, how often instances
+    # are rediscovered, and the local control port (0 disables)
+    "DAEMON_SYNC_INTERVAL": "86400",
+    "DAEMON_CLEANUP_INTERVAL": "604800",
+    "DAEMON_INSTANCE_REFRESH": "3600",
+    "DAEMON_CONTROL_PORT": "11551",
 }
 
 # Keywords that indicate an anime list (matched case-insensitively in name/description)
 ANIME_KEYWORDS = ["anime", "crunchyroll", "funimation", "anilist", "myanimelist", "mal top"]
+ANIME_RE = re.compile("|".join(re.escape(kw) for kw in ANIME_KEYWORDS), re.IGNORECASE)
 
 
 def is_anime_list(lst: dict) -> bool:
-    """Check if a list is anime-related based on its name and description."""
-    text = f"{lst.get('name', '')} {lst.get('description', '')}".lower()
-    return any(kw in text for kw in ANIME_KEYWORDS)
+    """
+    Check if a list is anime-related based on its name and description.
+    The answer is cached on the list record ("_anime"), so routing can ask
+    again without rescanning the text.
+    """
+    anime = lst.get("_anime")
+    if anime is None:
+        anime = lst["_anime"] = ANIME_RE.search(f"{lst.get('name', '')} {lst.get('description', '')}") is not None
+    return anime
 
 
 # =============================================================================
@@ -147,30 +216,54 @@ class Colors:
 
 _debug_mode = False
 
+# Worker threads running per-instance work capture their output here so each
+# instance's log lines can be printed as one contiguous block.
+_log_local = threading.local()
+
+
+def _emit(line: str, stream=None):
+    buffer = getattr(_log_local, "buffer", None)
+    if buffer is not None:
+        buffer.append((line, stream))
+    else:
+        print(line, file=stream or sys.stdout)
+
+
+def flush_log_buffer(lines: List[Tuple[str, Any]]):
+    """Print lines captured by run_buffered(), in order."""
+    for line, stream in lines:
+        print(line, file=stream or sys.stdout)
+
 
 def log(msg: str):
-    print(f"{Colors.CYAN}[INFO]{Colors.NC} {msg}")
+    _emit(f"{Colors.CYAN}[INFO]{Colors.NC} {msg}")
 
 
 def log_success(msg: str):
-    print(f"{Colors.GREEN}[OK]{Colors.NC} {msg}")
+    _emit(f"{Colors.GREEN}[OK]{Colors.NC} {msg}")
 
 
 def log_warn(msg: str):
-    print(f"{Colors.YELLOW}[WARN]{Colors.NC} {msg}")
+    _emit(f"{Colors.YELLOW}[WARN]{Colors.NC} {msg}")
 
 
 def log_error(msg: str):
-    print(f"{Colors.RED}[ERROR]{Colors.NC} {msg}", file=sys.stderr)
+    _emit(f"{Colors.RED}[ERROR]{Colors.NC} {msg}", sys.stderr)
 
 
 def log_dry(msg: str):
-    print(f"{Colors.YELLOW}[DRY-RUN]{Colors.NC} {msg}")
+    _emit(f"{Colors.YELLOW}[DRY-RUN]{Colors.NC} {msg}")
 
 
 def log_debug(msg: str):
     if _debug_mode:
-        print(f"{Colors.DIM}[DEBUG]{Colors.NC} {msg}")
+        _emit(f"{Colors.DIM}[DEBUG]{Colors.NC} {msg}")
+
+
+def log_retry(method: str, url: str, attempt: int, delay: float, reason: str):
+    # Path only: MDBList URLs carry the API key in the query string
+    parts = urlsplit(url)
+    log_warn(f"{method} {parts.netloc}{parts.path} failed ({reason}), retry {attempt} in {delay:.1f}s")
 
 
 # =============================================================================
@@ -211,28 +304,456 @@ def load_config() -> Dict[str, str]:
 # State Management
 # =============================================================================
 
-def load_state() -> dict:
-    """Load sync state (which lists we manage)."""
-    state_file = Path(STATE_PATH)
-    if state_file.exists():
+# Likes history points kept per managed list (one point per day at most,
+# only when the likes count changed)
+STATE_HISTORY_POINTS = 60
+
+
+class ManagedListIndex:
+    """
+    Indexed view over state["managed_lists"] (entries keyed "instance:mdblist_id").
+
+    Lookups by (instance, import_list_id), by MDBList id and by instance are
+    O(1), so cleanup and status don't scan every entry per import list.
+    Each entry also carries `last_seen` and a compact likes `history`
+    ([[YYYY-MM-DD, likes], ...]) trimmed to STATE_HISTORY_POINTS.
+    """
+
+    def __init__(self, entries: Dict[str, dict]):
+        self.entries = entries
+        self._by_import: Dict[Tuple[str, Any], str] = {}
+        self._by_mdblist: Dict[Any, set] = {}
+        self._by_instance: Dict[str, set] = {}
+        for key, entry in entries.items():
+            self._index(key, entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _index(self, key: str, entry: dict):
+        self._by_import[(entry.get("instance"), entry.get("import_list_id"))] = key
+        self._by_mdblist.setdefault(entry.get("mdblist_id"), set()).add(key)
+        self._by_instance.setdefault(entry.get("instance"), set()).add(key)
+
+    def _unindex(self, key: str, entry: dict):
+        self._by_import.pop((entry.get("instance"), entry.get("import_list_id")), None)
+        self._by_mdblist.get(entry.get("mdblist_id"), set()).discard(key)
+        self._by_instance.get(entry.get("instance"), set()).discard(key)
+
+    def get(self, instance: str, import_list_id: Any) -> Optional[dict]:
+        key = self._by_import.get((instance, import_list_id))
+        return self.entries.get(key) if key else None
+
+    def for_mdblist(self, mdblist_id: Any) -> List[dict]:
+        return [self.entries[key] for key in self._by_mdblist.get(mdblist_id, ())]
+
+    def for_instance(self, instance: str) -> List[dict]:
+        return [self.entries[key] for key in self._by_instance.get(instance, ())]
+
+    def add(self, key: str, entry: dict):
+        """Add or replace an entry (as built by sync_lists_to_instance)."""
+        old = self.entries.get(key)
+        if old:
+            self._unindex(key, old)
+        entry.setdefault("last_seen", entry.get("added_at"))
+        entry.setdefault("history", [[time.strftime("%Y-%m-%d", time.gmtime()), entry.get("likes") or 0]])
+        self.entries[key] = entry
+        self._index(key, entry)
+
+    def merge(self, delta: Dict[str, dict]):
+        for key, entry in delta.items():
+            self.add(key, entry)
+
+    def remove(self, instance: str, mdblist_id: Any) -> Optional[dict]:
+        key = f"{instance}:{mdblist_id}"
+        entry = self.entries.pop(key, None)
+        if entry:
+            self._unindex(key, entry)
+        return entry
+
+    def observe(self, mdblist_id: Any, likes: int, items: Optional[int] = None):
+        """Record a fresh likes count (from discovery or cleanup) for every copy of a list."""
+        today = time.strftime("%Y-%m-%d", time.gmtime())
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        for entry in self.for_mdblist(mdblist_id):
+            entry["likes"] = likes
+            if items is not None:
+                entry["items"] = items
+            entry["last_seen"] = now
+            history = entry.setdefault("history", [])
+            if history and history[-1][0] == today:
+                history[-1][1] = likes
+            elif not history or history[-1][1] != likes:
+                history.append([today, likes])
+
+    def compact(self):
+        """Trim likes history and drop index keys left empty by removals."""
+        for entry in self.entries.values():
+            history = entry.get("history")
+            if history and len(history) > STATE_HISTORY_POINTS:
+                del history[:-STATE_HISTORY_POINTS]
+        self._by_mdblist = {k: v for k, v in self._by_mdblist.items() if v}
+        self._by_instance = {k: v for k, v in self._by_instance.items() if v}
+
+
+class SyncState(dict):
+    """
+    Sync state as stored in STATE_PATH: a JSON object whose sections
+    (managed_lists, quota, discovery, schedule, ...) are used as plain dicts,
+    plus `.managed`, a ManagedListIndex over managed_lists.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._managed: Optional[ManagedListIndex] = None
+
+    @property
+    def managed(self) -> ManagedListIndex:
+        entries = self.setdefault("managed_lists", {})
+        if self._managed is None or self._managed.entries is not entries:
+            self._managed = ManagedListIndex(entries)
+        return self._managed
+
+
+def load_state() -> SyncState:
+    """Load sync state (which lists we manage), falling back to the backup copy."""
+    for path in (Path(STATE_PATH), Path(f"{STATE_PATH}.bak")):
+        if not path.exists():
+            continue
         try:
-            with open(state_file) as f:
-                return json.load(f)
+            with open(path) as f:
+                state = SyncState(json.load(f))
+            if path.suffix == ".bak":
+                log_warn(f"State restored from backup {path}")
+            return state
         except (json.JSONDecodeError, OSError) as e:
-            log_warn(f"Failed to load state: {e}")
-    return {"managed_lists": {}, "last_sync": None}
+            log_warn(f"Failed to load state from {path}: {e}")
+    return SyncState({"managed_lists": {}, "last_sync": None})
 
 
-def save_state(state: dict):
-    """Save sync state."""
+def save_state(state: SyncState):
+    """
+    Save sync state crash-safely: compact JSON is written to a temp file and
+    fsynced, the previous file is kept as .bak, then the temp file is renamed
+    into place. A crash at any point leaves a loadable state or backup.
+    """
     state_file = Path(STATE_PATH)
     state_file.parent.mkdir(parents=True, exist_ok=True)
     state["last_sync"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-    with open(state_file, "w") as f:
-        json.dump(state, f, indent=2)
+    if isinstance(state, SyncState):
+        state.managed.compact()
+
+    tmp = state_file.with_name(f".{state_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        if state_file.exists():
+            os.replace(state_file, f"{STATE_PATH}.bak")
+        os.replace(tmp, state_file)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     log_debug(f"State saved to {state_file}")
 
 
+# =============================================================================
+# Concurrency
+# =============================================================================
+
+def get_int_setting(config: Dict[str, str], key: str, minimum: int = 1) -> int:
+    """Read an integer config value, falling back to the default if invalid."""
+    try:
+        value = int(config.get(key) or DEFAULTS[key])
+    except ValueError:
+        log_warn(f"Invalid {key}={config.get(key)!r}, using {DEFAULTS[key]}")
+        value = int(DEFAULTS[key])
+    return max(minimum, value)
+
+
+def get_float_setting(config: Dict[str, str], key: str, minimum: float = 0.0) -> float:
+    """Read a float config value, falling back to the default if invalid."""
+    try:
+        value = float(config.get(key) or DEFAULTS[key])
+        if not math.isfinite(value):
+            raise ValueError(key)
+    except ValueError:
+        log_warn(f"Invalid {key}={config.get(key)!r}, using {DEFAULTS[key]}")
+        value = float(DEFAULTS[key])
+    return max(minimum, value)
+
+
+def run_parallel(calls: List[Tuple[Callable, tuple]], max_workers: int) -> List[Tuple[Any, Optional[Exception]]]:
+    """
+    Run (fn, args) calls on a bounded thread pool.
+    Returns (result, error) pairs in the same order as `calls`, so callers can
+    merge results deterministically regardless of completion order.
+    """
+    if not calls:
+        return []
+
+    # Workers inherit the caller's log buffer so nested output stays grouped
+    parent_buffer = getattr(_log_local, "buffer", None)
+
+    def _call(fn, args):
+        _log_local.buffer = parent_buffer
+        try:
+            return fn(*args), None
+        except Exception as e:
+            return None, e
+
+    workers = max(1, min(max_workers, len(calls)))
+    if workers == 1:
+        return [_call(fn, args) for fn, args in calls]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_call, fn, args) for fn, args in calls]
+        return [f.result() for f in futures]
+
+
+def run_buffered(fn: Callable, *args) -> Tuple[Any, Optional[Exception], List[Tuple[str, Any]]]:
+    """Run fn with its log output captured. Returns (result, error, log_lines)."""
+    previous = getattr(_log_local, "buffer", None)
+    lines = _log_local.buffer = []
+    try:
+        return fn(*args), None, lines
+    except Exception as e:
+        return None, e, lines
+    finally:
+        _log_local.buffer = previous
+
+
+# =============================================================================
+# MDBList Response Cache
+# =============================================================================
+
+class ResponseCache:
+    """
+    On-disk cache for MDBList GET responses.
+
+    One JSON file per request (keyed on endpoint + params, never the API key).
+    Fresh entries are served without a request; stale entries carrying an
+    ETag/Last-Modified are revalidated with a conditional GET. The directory
+    is pruned to max_bytes (least recently used first) when the cache opens
+    and before each daemon run.
+    """
+
+    def __init__(self, path: str, ttls: Dict[str, int], max_bytes: int, read: bool = True):
+        self.path = Path(path)
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self.read = read
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.prune()
+        except OSError as e:
+            log_warn(f"MDBList cache disabled ({self.path}): {e}")
+            self.ttls = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, str], read: bool = True) -> "ResponseCache":
+        ttls = {
+            "top": get_int_setting(config, "CACHE_TTL_TOP_LISTS", minimum=0),
+            "search": get_int_setting(config, "CACHE_TTL_SEARCH", minimum=0),
+            "list": get_int_setting(config, "CACHE_TTL_LIST_INFO", minimum=0),
+            "items": get_int_setting(config, "CACHE_TTL_LIST_ITEMS", minimum=0),
+        }
+        max_bytes = get_int_setting(config, "CACHE_MAX_MB", minimum=0) * 1024 * 1024
+        return cls(CACHE_PATH, ttls, max_bytes, read=read)
+
+    def ttl_for(self, endpoint: str) -> int:
+        """TTL for an endpoint; 0 means the endpoint is never cached (e.g. /user)."""
+        if endpoint == "/lists/top":
+            return self.ttls.get("top", 0)
+        if endpoint == "/lists/search":
+            return self.ttls.get("search", 0)
+        if re.fullmatch(r"/lists/\d+", endpoint):
+            return self.ttls.get("list", 0)
+        if re.fullmatch(r"/lists/\d+/items", endpoint):
+            return self.ttls.get("items", 0)
+        return 0
+
+    def key(self, endpoint: str, params: dict) -> str:
+        query = urlencode(sorted((k, v) for k, v in params.items() if k != "apikey"))
+        return hashlib.sha1(f"{endpoint}?{query}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the stored entry for key, or None. Touches the file, so prune() sees the use."""
+        if not self.read:
+            return None
+        entry_file = self.path / f"{key}.json"
+        try:
+            with open(entry_file) as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(entry_file)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, endpoint: str, body: Any, etag: str = "", last_modified: str = ""):
+        self._write(key, {
+            "endpoint": endpoint,
+            "stored_at": time.time(),
+            "etag": etag or "",
+            "last_modified": last_modified or "",
+            "body": body,
+        })
+
+    def refresh(self, key: str, entry: dict):
+        """Mark a revalidated (304) entry as fresh again."""
+        entry["stored_at"] = time.time()
+        self._write(key, entry)
+
+    def is_fresh(self, entry: dict, ttl: int) -> bool:
+        return time.time() - entry.get("stored_at", 0) < ttl
+
+    def count(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _write(self, key: str, entry: dict):
+        entry_file = self.path / f"{key}.json"
+        tmp = entry_file.with_suffix(f".tmp.{threading.get_ident()}")
+        try:
+            with open(tmp, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp, entry_file)
+        except OSError as e:
+            log_debug(f"Cache write failed for {entry.get('endpoint')}: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    def prune(self):
+        """Evict least recently used (read or written) entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for entry_file in self.path.glob("*.json"):
+            try:
+                st = entry_file.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry_file))
+            total += st.st_size
+        entries.sort()
+        evicted = 0
+        while entries and total > self.max_bytes:
+            _, size, entry_file = entries.pop(0)
+            try:
+                entry_file.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        if evicted:
+            log_debug(f"MDBList cache: evicted {evicted} entries ({total // 1024} KB kept)")
+
+
+# =============================================================================
+# Quota Planning
+# =============================================================================
+
+class QuotaExhausted(Exception):
+    """Raised instead of sending an MDBList request the quota plan can't afford."""
+
+
+class QuotaPlanner:
+    """
+    Plans MDBList work against the remaining API quota.
+
+    Work is prioritized (top lists, then pinned lists, then searches deferred
+    last run, then searches by historical yield = new qualifying lists per
+    call) and anything that doesn't fit the budget is deferred to the next
+    run. try_spend() gates every uncached request, so a run stops cleanly
+    `reserve` requests short of the limit instead of failing with 429s.
+    History lives in state["quota"].
+    """
+
+    def __init__(self, remaining: Optional[int], reserve: int, history: dict):
+        self.budget = None if remaining is None else max(0, remaining - reserve)
+        self.history = history
+        self.history.setdefault("yield", {})
+        self.previously_deferred = set(self.history.get("deferred", {}).get("search", []))
+        self.deferred = {"top": [], "search": [], "pinned": [], "cleanup": [], "sample": []}
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_user(cls, user: dict, config: Dict[str, str], state: dict) -> "QuotaPlanner":
+        remaining = user.get("rate_limit_remaining")
+        if not isinstance(remaining, int):
+            remaining = None
+        return cls(remaining, get_int_setting(config, "QUOTA_RESERVE", minimum=0), state.setdefault("quota", {}))
+
+    def available(self) -> Optional[int]:
+        if self.budget is None:
+            return None
+        return max(0, self.budget - self.spent)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.budget is not None and self.spent >= self.budget:
+                return False
+            self.spent += 1
+            return True
+
+    def search_priority(self, term: str) -> Tuple[int, float]:
+        """Sort key: deferred terms first, then unknown terms, then by yield."""
+        if term in self.previously_deferred:
+            return (0, 0.0)
+        known = self.history["yield"].get(term)
+        if known is None:
+            return (1, 0.0)
+        return (2, -known)
+
+    def plan(self, work: List[Tuple[str, Any, int]]) -> Tuple[List[Tuple[str, Any]], List[Tuple[str, Any]]]:
+        """
+        Greedily fit (kind, key, estimated_cost) items, already in priority
+        order, into the remaining budget. Returns (selected, deferred) keys.
+        """
+        budget = self.available()
+        selected, deferred = [], []
+        for kind, key, cost in work:
+            if budget is None or cost <= budget:
+                selected.append((kind, key))
+                if budget is not None:
+                    budget -= cost
+            else:
+                deferred.append((kind, key))
+                self.deferred[kind].append(key)
+        return selected, deferred
+
+    def record_yield(self, term: str, qualifying: int):
+        """Blend this run's new qualifying lists for a search into its yield."""
+        previous = self.history["yield"].get(term)
+        value = qualifying if previous is None else 0.5 * previous + 0.5 * qualifying
+        self.history["yield"][term] = round(value, 2)
+
+    def defer(self, kind: str, key: Any):
+        with self._lock:
+            self.deferred[kind].append(key)
+
+    def finish(self, active_terms: Optional[List[str]] = None):
+        """Persist deferred work and report it."""
+        if active_terms is not None:
+            for term in list(self.history["yield"]):
+                if term not in active_terms:
+                    del self.history["yield"][term]
+        self.history["deferred"] = {k: v for k, v in self.deferred.items() if v}
+        for kind, keys in self.deferred.items():
+            if kind == "top" and keys:
+                log_warn("MDBList quota: deferred top lists to next run")
+            elif keys:
+                shown = ", ".join(str(k) for k in keys[:10]) + (" ..." if len(keys) > 10 else "")
+                log_warn(f"MDBList quota: deferred {len(keys)} {kind} lookups to next run: {shown}")
+
+
 # =============================================================================
 # MDBList API Client
 # =============================================================================
@@ -240,24 +761,63 @@ def save_state(state: dict):
 class MDBListAPI:
     """Client for MDBList.com API."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None):
         self.api_key = api_key
-
-    def _get(self, endpoint: str, params: Optional[dict] = None) -> any:
-        """Make a GET request to the MDBList API."""
+        self.cache = cache
+        self.planner: Optional[QuotaPlanner] = None
+
+    def request_cost(self, endpoint: str, params: Optional[dict] = None) -> int:
+        """Estimated quota cost of a GET: 0 when a fresh cached response exists."""
+        ttl = self.cache.ttl_for(endpoint) if self.cache else 0
+        if ttl:
+            entry = self.cache.get(self.cache.key(endpoint, params or {}))
+            if entry and self.cache.is_fresh(entry, ttl):
+                return 0
+        return 1
+
+    def _get(self, endpoint: str, params: Optional[dict] = None) -> Any:
+        """Make a GET request to the MDBList API (served from cache when fresh)."""
         if params is None:
             params = {}
+
+        ttl = self.cache.ttl_for(endpoint) if self.cache else 0
+        cache_key = self.cache.key(endpoint, params) if ttl else ""
+        entry = self.cache.get(cache_key) if ttl else None
+        if entry and self.cache.is_fresh(entry, ttl):
+            log_debug(f"MDBList cache hit: {endpoint}")
+            self.cache.count("hits")
+            return entry["body"]
+
+        if self.planner and not self.planner.try_spend():
+            raise QuotaExhausted(f"no MDBList quota left for {endpoint}")
+
         params["apikey"] = self.api_key
         url = f"{MDBLIST_API_BASE}{endpoint}?{urlencode(params)}"
         log_debug(f"MDBList GET: {endpoint}")
 
-        req = Request(url)
-        req.add_header("Accept", "application/json")
-        req.add_header("User-Agent", "mdblist-sync/1.0")
+        headers = {"Accept": "application/json"}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
         try:
-            with urlopen(req, timeout=30) as resp:
-                return json.loads(resp.read().decode())
+            with METRICS.request("mdblist", "GET", endpoint) as call:
+                resp = HTTP.request("GET", url, headers=headers)
+                call.bytes = len(resp.body)
+            body = resp.json()
+            if ttl:
+                self.cache.count("misses")
+                self.cache.put(
+                    cache_key, endpoint, body,
+                    resp.headers.get("ETag", ""), resp.headers.get("Last-Modified", ""),
+                )
+            return body
         except HTTPError as e:
+            if e.code == 304 and entry:
+                log_debug(f"MDBList cache revalidated: {endpoint}")
+                self.cache.count("revalidated")
+                self.cache.refresh(cache_key, entry)
+                return entry["body"]
             if e.code == 429:
                 log_error("MDBList API rate limit exceeded. Try again later.")
             else:
@@ -284,7 +844,7 @@ class MDBListAPI:
         return self._get(f"/lists/{list_id}")
 
     def get_list_items(self, list_id: int, limit: int = 10) -> dict:
-        """Get items from a list (for preview)."""
+        """Get the first `limit` items of a list (preview / overlap analysis)."""
         return self._get(f"/lists/{list_id}/items", {"limit": limit})
 
 
@@ -292,8 +852,88 @@ class MDBListAPI:
 # Arr API Client
 # =============================================================================
 
+class InstanceSnapshot:
+    """
+    Per-run, in-memory view of one Radarr/Sonarr instance.
+
+    Status, import lists, quality profiles and root folders are fetched once
+    (concurrently via load()) and then served from memory. ArrAPI mutations
+    update the import list view, so it stays consistent without refetching.
+    """
+
+    PARTS = {
+        "status": "/system/status",
+        "import_lists": "/importlist",
+        "quality_profiles": "/qualityprofile",
+        "root_folders": "/rootfolder",
+    }
+
+    def __init__(self, api: "ArrAPI"):
+        self.api = api
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load(self, parts: Optional[List[str]] = None) -> Dict[str, Exception]:
+        """Fetch all parts not loaded yet, concurrently. Returns errors keyed by part."""
+        missing = [p for p in (parts or self.PARTS) if p not in self._data]
+        results = run_parallel([(self.api._request, (self.PARTS[p],)) for p in missing], len(missing))
+        errors = {}
+        with self._lock:
+            for part, (value, error) in zip(missing, results):
+                if error:
+                    errors[part] = error
+                else:
+                    self._data.setdefault(part, value)
+        return errors
+
+    def peek(self, part: str) -> Any:
+        """Return a copy of a loaded part, or None; never fetches."""
+        with self._lock:
+            value = self._data.get(part)
+            return list(value) if isinstance(value, list) else value
+
+    def get(self, part: str) -> Any:
+        """Return a part, fetching it on first use if load() didn't get it."""
+        if part not in self._data:
+            value = self.api._request(self.PARTS[part])
+            with self._lock:
+                self._data.setdefault(part, value)
+        return self._data[part]
+
+    def invalidate(self, part: Optional[str] = None):
+        """Drop one part (or everything) so the next access refetches it."""
+        with self._lock:
+            if part:
+                self._data.pop(part, None)
+            else:
+                self._data.clear()
+
+    def record_import_list_added(self, import_list: dict):
+        with self._lock:
+            if "import_lists" in self._data and isinstance(import_list, dict):
+                self._data["import_lists"].append(import_list)
+
+    def record_import_list_removed(self, list_id: int):
+        with self._lock:
+            if "import_lists" in self._data:
+                self._data["import_lists"] = [
+                    il for il in self._data["import_lists"] if il.get("id") != list_id
+                ]
+
+
+def folder_key(path: Optional[str]) -> str:
+    """Comparable form of a root folder path ("/data/movies/" == "/data/movies")."""
+    if not path:
+        return ""
+    return os.path.normpath(path.replace("\\", "/"))
+
+
 class ArrAPI:
-    """Generic API client for Radarr/Sonarr."""
+    """Generic API client for Radarr/Sonarr.
+
+    Read accessors (status, profiles, root folders, import lists) are served
+    from the per-run InstanceSnapshot; only mutations go to the network.
+    """
 
     def __init__(self, url: str, api_key: str, base_url: str = ""):
         self.url = url.rstrip("/")
@@ -305,12 +945,14 @@ class ArrAPI:
             self.base_url = base_url
         else:
             self.base_url = ""
+        self.snapshot = InstanceSnapshot(self)
+        self._schema = None
+        # None until the first bulk delete tells us whether it's supported
+        self.bulk_delete: Optional[bool] = None
 
-    def _request(self, endpoint: str, method: str = "GET", data: any = None) -> any:
+    def _request(self, endpoint: str, method: str = "GET", data: Any = None) -> Any:
         full_url = f"{self.url}{self.base_url}/api/v3{endpoint}"
-        req = Request(full_url, method=method)
-        req.add_header("X-Api-Key", self.api_key)
-        req.add_header("Content-Type", "application/json")
+        headers = {"X-Api-Key": self.api_key, "Content-Type": "application/json"}
 
         body = None
         if data is not None:
@@ -319,11 +961,12 @@ class ArrAPI:
             log_debug(f"Payload: {json.dumps(data, indent=2)}")
 
         try:
-            with urlopen(req, data=body, timeout=30) as resp:
-                raw = resp.read().decode()
-                if not raw:
-                    return {}
-                return json.loads(raw)
+            with METRICS.request("arr", method, endpoint) as call:
+                resp = HTTP.request(method, full_url, body=body, headers=headers)
+                call.bytes = len(resp.body)
+            if not resp.body:
+                return {}
+            return resp.json()
         except HTTPError as e:
             # Read error body and attach to exception for caller to inspect
             error_msg = ""
@@ -346,25 +989,88 @@ class ArrAPI:
             raise
 
     def get_status(self) -> dict:
-        return self._request("/system/status")
+        return self.snapshot.get("status")
 
     def get_quality_profiles(self) -> List[dict]:
-        return self._request("/qualityprofile")
+        return self.snapshot.get("quality_profiles")
 
     def get_root_folders(self) -> List[dict]:
-        return self._request("/rootfolder")
+        return self.snapshot.get("root_folders")
 
     def get_import_lists(self) -> List[dict]:
-        return self._request("/importlist")
+        return list(self.snapshot.get("import_lists"))
 
     def add_import_list(self, payload: dict) -> dict:
-        return self._request("/importlist", method="POST", data=payload)
+        result = self._request("/importlist", method="POST", data=payload)
+        self.snapshot.record_import_list_added(result)
+        return result
 
     def delete_import_list(self, list_id: int):
-        return self._request(f"/importlist/{list_id}", method="DELETE")
+        result = self._request(f"/importlist/{list_id}", method="DELETE")
+        self.snapshot.record_import_list_removed(list_id)
+        return result
+
+    def delete_import_lists(self, list_ids: List[int], workers: int = 4) -> Dict[int, Optional[Exception]]:
+        """
+        Delete several import lists, in one DELETE /importlist/bulk where the
+        instance supports it (Sonarr v4, Radarr v5), else `workers` at a time.
+        Returns the error (or None) per id.
+        """
+        if len(list_ids) > 1 and self.bulk_delete is not False:
+            try:
+                self._request("/importlist/bulk", method="DELETE", data={"ids": list_ids})
+                self.bulk_delete = True
+                for list_id in list_ids:
+                    self.snapshot.record_import_list_removed(list_id)
+                return dict.fromkeys(list_ids)
+            except Exception as e:
+                # Older versions have no bulk endpoint; anything else falls
+                # back too, so the per-list errors say which ids failed
+                if isinstance(e, HTTPError) and e.code in (404, 405):
+                    self.bulk_delete = False
+                log_debug(f"Bulk import list delete failed ({e}), deleting one by one")
+        results = run_parallel([(self.delete_import_list, (i,)) for i in list_ids], workers)
+        return {list_id: error for list_id, (_, error) in zip(list_ids, results)}
 
     def get_import_list_schema(self) -> List[dict]:
-        return self._request("/importlist/schema")
+        """Import list implementations and their fields; cached for the client's lifetime."""
+        if self._schema is None:
+            self._schema = self._request("/importlist/schema")
+        return self._schema
+
+    def validate_import_list(self, payload: dict) -> List[str]:
+        """
+        Check a payload locally against the schema, quality profiles and root
+        folders, so lists the instance would reject never cost a POST (and
+        its synchronous list test). Returns problems found; none if the
+        schema can't be fetched.
+        """
+        try:
+            schema = self.get_import_list_schema() or []
+        except Exception as e:
+            log_debug(f"Import list schema unavailable, skipping local validation: {e}")
+            return []
+
+        impl = next((s for s in schema if s.get("implementation") == payload.get("implementation")), None)
+        if impl is None:
+            return [f"implementation {payload.get('implementation')} not available"]
+        problems = []
+        if impl.get("configContract") and impl["configContract"] != payload.get("configContract"):
+            problems.append(f"config contract {payload.get('configContract')} != {impl['configContract']}")
+        known_fields = {f.get("name") for f in impl.get("fields", [])}
+        for field in payload.get("fields", []):
+            if field.get("name") not in known_fields:
+                problems.append(f"unknown field '{field.get('name')}'")
+            elif not field.get("value"):
+                problems.append(f"field '{field.get('name')}' is empty")
+        if payload.get("qualityProfileId") not in {p.get("id") for p in self.get_quality_profiles()}:
+            problems.append(f"quality profile {payload.get('qualityProfileId')} does not exist")
+        root_folders = {folder_key(f.get("path")) for f in self.get_root_folders()}
+        if folder_key(payload.get("rootFolderPath")) not in root_folders:
+            problems.append(f"root folder {payload.get('rootFolderPath')} does not exist")
+        if not payload.get("name"):
+            problems.append("name is empty")
+        return problems
 
     def get_sync_targets(self, all_instances: List[Tuple[str, "ArrAPI"]]) -> List[str]:
         """Get names of instances this one syncs FROM via RadarrImport/SonarrImport.
@@ -392,43 +1098,44 @@ class ArrAPI:
         return targets
 
 
+def describe_arr_error(error: Exception) -> str:
+    """Short reason for a failed Sonarr/Radarr call, using validation messages when present."""
+    if not isinstance(error, HTTPError):
+        return str(error)
+    detail = getattr(error, "error_detail", "")
+    if error.code == 400 and detail:
+        # Extract meaningful message from Sonarr/Radarr validation errors
+        msgs = []
+        if isinstance(detail, list):
+            msgs = [d.get("errorMessage", "") for d in detail if isinstance(d, dict)]
+        return (msgs[0] if msgs else str(detail))[:120]
+    return f"{error.code} {error.reason}"
+
+
 # =============================================================================
 # Arr Instance Discovery
 # =============================================================================
 
-def discover_arr_config(instance: str) -> Optional[Tuple[str, str, str]]:
-    """
-    Discover *arr config from Swizzin installation.
-    Returns (url, api_key, base_url) or None.
-    """
-    config = ARR_INSTANCES.get(instance)
-    if not config:
-        return None
+# Instances synced when RADARR_INSTANCES/SONARR_INSTANCES are empty. Others
+# (e.g. radarr-kids) are left alone unless listed or the setting is "all".
+DEFAULT_INSTANCES = {
+    "radarr": ["radarr", "radarr-4k"],
+    "sonarr": ["sonarr", "sonarr-4k", "sonarr-anime"],
+}
 
-    home = Path("/home")
-    if not home.exists():
-        return None
 
-    for user_dir in home.iterdir():
-        if not user_dir.is_dir():
-            continue
-        for config_path_template in config["config_paths"]:
-            config_path = Path(config_path_template.format(user=user_dir.name))
-            if config_path.exists():
-                try:
-                    tree = ET.parse(config_path)
-                    root = tree.getroot()
-                    port = root.findtext("Port")
-                    api_key = root.findtext("ApiKey")
-                    url_base = root.findtext("UrlBase", "")
-                    if port and api_key:
-                        url = f"http://localhost:{port}"
-                        return (url, api_key, url_base)
-                except Exception as e:
-                    log_warn(f"Failed to parse {config_path}: {e}")
-    return None
+def find_arr_instances(kind: str) -> Dict[str, Tuple[str, str, str]]:
+    """
+    Installed instances of one kind from the shared registry (cached on
+    config.xml mtimes). Returns {name: (url, api_key, base_url)}.
+    """
+    return {
+        inst.name: (inst.url("localhost", with_base=False), inst.api_key, inst.url_base)
+        for inst in arr_registry.discover(kind)
+    }
 
 
+@METRICS.phase("discover_instances")
 def discover_instances(config: Dict[str, str]) -> Tuple[List[Tuple[str, ArrAPI]], List[Tuple[str, ArrAPI]]]:
     """
     Discover all running Radarr and Sonarr instances.
@@ -437,37 +1144,37 @@ def discover_instances(config: Dict[str, str]) -> Tuple[List[Tuple[str, ArrAPI]]
     radarr_apis = []
     sonarr_apis = []
 
-    # Determine which instances to check
-    radarr_names = [s.strip() for s in config["RADARR_INSTANCES"].split(",") if s.strip()] if config["RADARR_INSTANCES"] else [
-        k for k, v in ARR_INSTANCES.items() if v["type"] == "radarr"
-    ]
-    sonarr_names = [s.strip() for s in config["SONARR_INSTANCES"].split(",") if s.strip()] if config["SONARR_INSTANCES"] else [
-        k for k, v in ARR_INSTANCES.items() if v["type"] == "sonarr"
-    ]
-
-    for name in radarr_names:
-        result = discover_arr_config(name)
-        if result:
-            url, api_key, base_url = result
-            api = ArrAPI(url, api_key, base_url)
-            try:
-                status = api.get_status()
-                log_success(f"Radarr '{name}' connected (v{status.get('version', '?')})")
-                radarr_apis.append((name, api))
-            except Exception:
-                log_warn(f"Radarr '{name}' found but not reachable")
-
-    for name in sonarr_names:
-        result = discover_arr_config(name)
-        if result:
-            url, api_key, base_url = result
-            api = ArrAPI(url, api_key, base_url)
-            try:
-                status = api.get_status()
-                log_success(f"Sonarr '{name}' connected (v{status.get('version', '?')})")
-                sonarr_apis.append((name, api))
-            except Exception:
-                log_warn(f"Sonarr '{name}' found but not reachable")
+    # RADARR_INSTANCES/SONARR_INSTANCES, else the default names; "all" opts
+    # in to every installed instance
+    candidates = []
+    for app_label, key in (("Radarr", "RADARR_INSTANCES"), ("Sonarr", "SONARR_INSTANCES")):
+        found = find_arr_instances(app_label.lower())
+        names = [s.strip() for s in config[key].split(",") if s.strip()] or DEFAULT_INSTANCES[app_label.lower()]
+        if [n.lower() for n in names] == ["all"]:
+            names = list(found)
+        for name in names:
+            named = arr_registry.instance_name(name)
+            result = found.get(named[0] if named else name)
+            if result:
+                url, api_key, base_url = result
+                candidates.append((app_label, name, ArrAPI(url, api_key, base_url)))
+
+    # Probe every instance at once; each probe also loads the instance snapshot
+    # (import lists, profiles, root folders) that the rest of the run reads from.
+    results = run_parallel([(api.snapshot.load, ()) for _, _, api in candidates], len(candidates))
+
+    for (app_label, name, api), (errors, error) in zip(candidates, results):
+        errors = errors or {}
+        if error or "status" in errors:
+            log_warn(f"{app_label} '{name}' found but not reachable")
+            continue
+        for part, part_error in errors.items():
+            log_debug(f"  {name}: failed to load {part}: {part_error}")
+        log_success(f"{app_label} '{name}' connected (v{api.get_status().get('version', '?')})")
+        if app_label == "Radarr":
+            radarr_apis.append((name, api))
+        else:
+            sonarr_apis.append((name, api))
 
     return radarr_apis, sonarr_apis
 
@@ -580,114 +1287,510 @@ def get_sonarr_defaults(api: ArrAPI, config: Dict[str, str], instance_name: str
     }
 
 
+# =============================================================================
+# List Records
+# =============================================================================
+
+# List fields kept in memory and in the discovery snapshot (enough to filter,
+# route and sync)
+SNAPSHOT_LIST_FIELDS = ("id", "name", "user_name", "slug", "likes", "items", "mediatype")
+
+
+class ListRecord:
+    """
+    Compact in-memory form of one MDBList list.
+
+    Keeps only SNAPSHOT_LIST_FIELDS plus the "_pinned"/"_anime" flags; the
+    rest of the API response (including the description, often the largest
+    field) is dropped when it is parsed, so anime classification happens
+    then. Every later stage (filtering, routing, overlap analysis, sync,
+    cleanup) shares the same record. Reads like the raw dict (lst["name"],
+    lst.get("likes")), so helpers also accept the plain dicts plan files and
+    get_list_info() hand them; a field the API left out reads as missing.
+    Only those fields can be set: lst["other"] = ... raises KeyError.
+    """
+
+    __slots__ = SNAPSHOT_LIST_FIELDS + ("_pinned", "_anime")
+
+    def __init__(self, data: dict):
+        for field in SNAPSHOT_LIST_FIELDS:
+            setattr(self, field, data.get(field))
+        # Repeated across thousands of records
+        if isinstance(self.mediatype, str):
+            self.mediatype = sys.intern(self.mediatype)
+        if isinstance(self.user_name, str):
+            self.user_name = sys.intern(self.user_name)
+        self._pinned = bool(data.get("_pinned", False))
+        self._anime = is_anime_list(data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return getattr(self, key, None) is not None
+
+    def __repr__(self) -> str:
+        return f"ListRecord({self.id!r}, {self.name!r})"
+
+
+def list_records(payload: Any) -> List[ListRecord]:
+    """Parse a /lists/top, /lists/search or /lists/{id} response into ListRecords."""
+    if not isinstance(payload, list):
+        return []
+    return [ListRecord(lst) for lst in payload if isinstance(lst, dict) and "id" in lst]
+
+
+def fetch_list_records(fetch, *args) -> List[ListRecord]:
+    """Call an MDBList list endpoint and parse the response in the same worker."""
+    return list_records(fetch(*args))
+
+
+# =============================================================================
+# Incremental Discovery
+# =============================================================================
+
+
+def list_fingerprint(lst: dict) -> str:
+    """Fingerprint of the list fields that affect ranking and import URLs."""
+    key = f"{lst.get('likes') or 0}|{lst.get('items') or 0}|{lst.get('slug', '')}|{lst.get('mediatype', '')}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+class DiscoverySnapshot:
+    """
+    Fingerprinted copy of the last discovered candidates (state["discovery"]).
+
+    Each search term remembers the ids it returned and a fingerprint over
+    those lists. A term whose fingerprint didn't change for `stable_runs`
+    consecutive runs is skipped and its stored results reused, until the next
+    full refresh (every `full_refresh_days`, or forced with --full-refresh).
+    """
+
+    def __init__(self, data: dict, stable_runs: int, full_refresh_days: int, force_full: bool = False):
+        self.data = data
+        self.data.setdefault("terms", {})
+        self.data.setdefault("lists", {})
+        self.stable_runs = stable_runs
+        age = time.time() - self.data.get("last_full_refresh", 0)
+        self.full_refresh = force_full or age >= full_refresh_days * 86400
+        self.stats = {"skipped": 0, "new": 0, "changed": 0, "unchanged": 0}
+
+    @classmethod
+    def from_state(cls, state: dict, config: Dict[str, str], force_full: bool = False) -> "DiscoverySnapshot":
+        return cls(
+            state.setdefault("discovery", {}),
+            get_int_setting(config, "INCREMENTAL_STABLE_RUNS"),
+            get_int_setting(config, "INCREMENTAL_FULL_REFRESH_DAYS", minimum=0),
+            force_full,
+        )
+
+    def should_skip(self, term: str) -> bool:
+        if self.full_refresh:
+            return False
+        entry = self.data["terms"].get(term)
+        if not entry or entry.get("stable_runs", 0) < self.stable_runs:
+            return False
+        return self.cached_results(term) is not None
+
+    def cached_results(self, term: str) -> Optional[List[dict]]:
+        """Stored results for a term, or None if any list record is missing."""
+        entry = self.data["terms"].get(term)
+        if not entry:
+            return None
+        records = []
+        for list_id in entry.get("list_ids", []):
+            stored = self.data["lists"].get(str(list_id))
+            if not stored:
+                return None
+            records.append(ListRecord(stored["record"]))
+        return records
+
+    def record(self, term: str, results: List[dict]):
+        """Store fresh results for a term and update its stability counter."""
+        lists = self.data["lists"]
+        for lst in results:
+            fp = list_fingerprint(lst)
+            stored = lists.get(str(lst["id"]))
+            if not stored:
+                self.stats["new"] += 1
+            elif stored["fingerprint"] != fp:
+                self.stats["changed"] += 1
+            else:
+                self.stats["unchanged"] += 1
+            record = {k: lst.get(k) for k in SNAPSHOT_LIST_FIELDS}
+            record["_anime"] = is_anime_list(lst)
+            lists[str(lst["id"])] = {"fingerprint": fp, "record": record}
+
+        term_fp = hashlib.sha1(
+            ",".join(f"{lst['id']}:{list_fingerprint(lst)}" for lst in results).encode()
+        ).hexdigest()[:12]
+        entry = self.data["terms"].get(term, {})
+        stable = entry.get("stable_runs", 0) + 1 if entry.get("fingerprint") == term_fp else 0
+        self.data["terms"][term] = {
+            "fingerprint": term_fp,
+            "stable_runs": stable,
+            "list_ids": [lst["id"] for lst in results],
+        }
+
+    def finish(self, active_terms: List[str]):
+        """Drop terms no longer configured and lists no term references."""
+        terms = self.data["terms"]
+        for term in list(terms):
+            if term not in active_terms:
+                del terms[term]
+        referenced = {str(i) for entry in terms.values() for i in entry.get("list_ids", [])}
+        for list_id in list(self.data["lists"]):
+            if list_id not in referenced:
+                del self.data["lists"][list_id]
+        if self.full_refresh:
+            self.data["last_full_refresh"] = time.time()
+
+
 # =============================================================================
 # List Discovery
 # =============================================================================
 
-def discover_lists(mdb: MDBListAPI, config: Dict[str, str], has_anime_instance: bool = False) -> Tuple[List[dict], List[dict]]:
+@METRICS.phase("discover_lists")
+def discover_lists(
+    mdb: MDBListAPI,
+    config: Dict[str, str],
+    has_anime_instance: bool = False,
+    snapshot: Optional[DiscoverySnapshot] = None,
+    discovered: Optional[Dict[Any, ListRecord]] = None,
+) -> Tuple[List[ListRecord], List[ListRecord]]:
     """
     Discover MDBList lists worth subscribing to.
-    Returns (movie_lists, show_lists) sorted by likes descending.
+    Returns (movie_lists, show_lists) of ListRecords sorted by likes descending.
     When has_anime_instance is True, anime show lists bypass the likes threshold.
+    With a snapshot (incremental mode), stable search terms reuse stored results.
+    `discovered`, if given, is filled with every list fetched (id -> record),
+    including the ones the filters below drop.
     """
     min_likes = int(config["MIN_LIKES"])
     min_items = int(config["MIN_ITEMS"])
+    # Anime show lists use a lower likes threshold when an anime instance exists
+    # (anime lists on MDBList tend to have fewer likes than mainstream lists)
+    min_likes_anime = int(config.get("MIN_LIKES_ANIME", max(1, min_likes // 4)))
     blocked = set(s.strip() for s in config["BLOCKED_LISTS"].split(",") if s.strip())
 
     seen_ids = set()
     all_lists = []
 
+    search_terms = [s.strip() for s in config["SEARCH_TERMS"].split(",") if s.strip()]
+
+    pinned_ids = []
+    for list_id_str in (s.strip() for s in config["PINNED_LISTS"].split(",") if s.strip()):
+        try:
+            pinned_ids.append(int(list_id_str))
+        except ValueError:
+            log_warn(f"Invalid pinned list ID: {list_id_str}")
+
+    skipped_terms = {t for t in search_terms if snapshot and snapshot.should_skip(t)}
+    fetch_terms = [t for t in search_terms if t not in skipped_terms]
+    if snapshot:
+        mode = "full refresh" if snapshot.full_refresh else f"{len(skipped_terms)} stable searches skipped"
+        log(f"Incremental discovery: {mode}")
+
+    # Fit the work into the remaining MDBList quota; whatever doesn't fit is
+    # deferred to the next run (and prioritized there).
+    fetch_top = True
+    deferred_terms = set()
+    deferred_pinned = set()
+    planner = mdb.planner
+    if planner:
+        work = [("top", None, mdb.request_cost("/lists/top"))]
+        work += [("pinned", i, mdb.request_cost(f"/lists/{i}")) for i in pinned_ids]
+        work += [
+            ("search", t, mdb.request_cost("/lists/search", {"query": t}))
+            for t in sorted(fetch_terms, key=planner.search_priority)
+        ]
+        _, deferred = planner.plan(work)
+        fetch_top = ("top", None) not in deferred
+        deferred_terms = {key for kind, key in deferred if kind == "search"}
+        deferred_pinned = {key for kind, key in deferred if kind == "pinned"}
+        fetch_terms = [t for t in fetch_terms if t not in deferred_terms]
+    fetch_pinned = [i for i in pinned_ids if i not in deferred_pinned]
+
+    # Fan out top lists, searches and pinned lookups over one bounded pool.
+    # Results are merged below in submission order, so seen_ids dedup (and
+    # therefore which copy of a list wins) matches a serial run exactly.
+    # Responses are parsed into ListRecords as they arrive, so raw JSON never
+    # outlives its request.
+    calls = [(fetch_list_records, (mdb.get_top_lists,))] if fetch_top else []
+    calls += [(fetch_list_records, (mdb.search_lists, term)) for term in fetch_terms]
+    calls += [(fetch_list_records, (mdb.get_list_info, list_id)) for list_id in fetch_pinned]
+
+    workers = get_int_setting(config, "DISCOVERY_WORKERS")
+    log(f"Fetching {'top lists, ' if fetch_top else ''}{len(fetch_terms)} searches and "
+        f"{len(fetch_pinned)} pinned lists from MDBList ({min(workers, max(1, len(calls)))} workers)...")
+    started = time.monotonic()
+    results = run_parallel(calls, workers)
+    log_debug(f"  Discovery requests finished in {time.monotonic() - started:.1f}s")
+
+    top_result = results.pop(0) if fetch_top else ([], None)
+    fetched = dict(zip(fetch_terms, results[:len(fetch_terms)]))
+    pinned_results = dict(zip(fetch_pinned, results[len(fetch_terms):]))
+    source_term = {}
+
     # 1) Top lists (most popular)
-    log("Fetching top lists from MDBList...")
-    try:
-        top = mdb.get_top_lists()
+    top, error = top_result
+    if error:
+        log_warn(f"Failed to fetch top lists: {error}")
+    else:
         for lst in top:
             if lst["id"] not in seen_ids:
                 seen_ids.add(lst["id"])
                 all_lists.append(lst)
         log_debug(f"  Found {len(top)} top lists")
-    except Exception as e:
-        log_warn(f"Failed to fetch top lists: {e}")
 
-    # 2) Search-based discovery
-    search_terms = [s.strip() for s in config["SEARCH_TERMS"].split(",") if s.strip()]
+    # 2) Search-based discovery (stored results stand in for skipped terms)
     for term in search_terms:
-        log(f"Searching lists for '{term}'...")
-        try:
-            results = mdb.search_lists(term)
-            added = 0
-            for lst in results:
-                if lst["id"] not in seen_ids:
-                    seen_ids.add(lst["id"])
-                    all_lists.append(lst)
-                    added += 1
-            log_debug(f"  Found {added} new lists for '{term}'")
-        except Exception as e:
-            log_warn(f"Failed to search for '{term}': {e}")
+        if term in deferred_terms:
+            continue
+        if term in skipped_terms:
+            found, error = snapshot.cached_results(term), None
+            log_debug(f"  Reusing stored results for '{term}' (stable)")
+        else:
+            found, error = fetched[term]
+        if error:
+            log_warn(f"Failed to search for '{term}': {error}")
+            continue
+        if snapshot and term not in skipped_terms:
+            snapshot.record(term, found)
+        added = 0
+        for lst in found:
+            if lst["id"] not in seen_ids:
+                seen_ids.add(lst["id"])
+                all_lists.append(lst)
+                source_term[lst["id"]] = term
+                added += 1
+        log_debug(f"  Found {added} new lists for '{term}'")
+
+    if snapshot:
+        snapshot.stats["skipped"] = len(skipped_terms)
+        snapshot.finish(search_terms)
+        log_debug(f"  Snapshot: {snapshot.stats['new']} new, {snapshot.stats['changed']} changed, "
+                  f"{snapshot.stats['unchanged']} unchanged lists in fetched searches")
 
     # 3) Pinned lists
-    pinned = [s.strip() for s in config["PINNED_LISTS"].split(",") if s.strip()]
-    for list_id_str in pinned:
-        try:
-            list_id_int = int(list_id_str)
-        except ValueError:
-            log_warn(f"Invalid pinned list ID: {list_id_str}")
+    for list_id_int in pinned_ids:
+        if list_id_int in seen_ids or list_id_int in deferred_pinned:
             continue
-        if list_id_int in seen_ids:
+        info, error = pinned_results[list_id_int]
+        if error:
+            log_warn(f"Failed to fetch pinned list {list_id_int}: {error}")
             continue
-        try:
-            info = mdb.get_list_info(list_id_int)
-            if isinstance(info, list):
-                for lst in info:
-                    if lst["id"] not in seen_ids:
-                        seen_ids.add(lst["id"])
-                        lst["_pinned"] = True
-                        all_lists.append(lst)
-            log_debug(f"  Added pinned list {list_id_str}")
-        except Exception as e:
-            log_warn(f"Failed to fetch pinned list {list_id_str}: {e}")
+        for lst in info:
+            if lst["id"] not in seen_ids:
+                seen_ids.add(lst["id"])
+                lst["_pinned"] = True
+                all_lists.append(lst)
+        log_debug(f"  Added pinned list {list_id_int}")
+
+    if discovered is not None:
+        discovered.update((lst["id"], lst) for lst in all_lists)
 
-    # Filter
+    # Filter and classify in one pass. Anime classification only runs when an
+    # anime instance exists and the list clears the cheapest threshold; the
+    # result stays on the record for routing in run_sync.
     movie_lists = []
     show_lists = []
+    floor_likes = min(min_likes, min_likes_anime) if has_anime_instance else min_likes
 
     for lst in all_lists:
-        list_id = str(lst["id"])
-        if list_id in blocked:
-            log_debug(f"  Blocked list: {lst['name']} (id={list_id})")
+        if blocked and str(lst["id"]) in blocked:
+            log_debug(f"  Blocked list: {lst['name']} (id={lst['id']})")
             continue
 
-        likes = lst.get("likes") or 0
-        items = lst.get("items") or 0
-        is_pinned = lst.get("_pinned", False)
-        anime = is_anime_list(lst)
-
-        # Anime show lists use a lower likes threshold when an anime instance exists
-        # (anime lists on MDBList tend to have fewer likes than mainstream lists)
-        min_likes_anime = int(config.get("MIN_LIKES_ANIME", max(1, min_likes // 4)))
-        if not is_pinned:
-            if anime and has_anime_instance:
-                if likes < min_likes_anime or items < min_items:
-                    continue
-            elif likes < min_likes or items < min_items:
-                continue
-
         mediatype = lst.get("mediatype", "")
         if mediatype == "movie":
-            movie_lists.append(lst)
+            bucket = movie_lists
         elif mediatype == "show":
-            show_lists.append(lst)
+            bucket = show_lists
         else:
             log_debug(f"  Skipping list '{lst.get('name', '?')}': unsupported mediatype '{mediatype}'")
+            continue
 
-    # Sort by likes descending
-    movie_lists.sort(key=lambda x: x.get("likes") or 0, reverse=True)
-    show_lists.sort(key=lambda x: x.get("likes") or 0, reverse=True)
+        likes = lst.get("likes") or 0
+        is_pinned = lst.get("_pinned", False)
+        if not is_pinned and (likes < floor_likes or (lst.get("items") or 0) < min_items):
+            continue
+        anime = has_anime_instance and is_anime_list(lst)
+        if not is_pinned and likes < (min_likes_anime if anime else min_likes):
+            continue
+
+        bucket.append(lst)
+
+    # Sort by likes descending, oversized lists (poll cost) ranked lower
+    for group in (movie_lists, show_lists):
+        penalty = poll_cost_penalty(group, config)
+        group.sort(key=lambda x: (x.get("likes") or 0) / penalty.get(x["id"], 1), reverse=True)
+
+    # Learn each fetched search's yield (new qualifying lists it contributed)
+    if planner:
+        qualifying = {}
+        for lst in movie_lists + show_lists:
+            term = source_term.get(lst["id"])
+            if term:
+                qualifying[term] = qualifying.get(term, 0) + 1
+        for term in fetch_terms:
+            if not fetched[term][1]:
+                planner.record_yield(term, qualifying.get(term, 0))
 
     log(f"Discovered {len(movie_lists)} movie lists, {len(show_lists)} show lists (after filters)")
     return movie_lists, show_lists
 
 
+# =============================================================================
+# List Overlap Analysis
+# =============================================================================
+
+def list_item_keys(payload: Any) -> set:
+    """
+    Title keys from a /lists/{id}/items response (or a list's public JSON),
+    comparable across lists. Prefers IMDb ids, then TVDB/TMDB ids, then the
+    MDBList item id.
+    """
+    if isinstance(payload, dict):
+        items = [item for value in payload.values() if isinstance(value, list) for item in value]
+    elif isinstance(payload, list):
+        items = payload
+    else:
+        items = []
+
+    keys = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if item.get("imdb_id"):
+            keys.add(item["imdb_id"])
+        elif item.get("tvdb_id") or item.get("tvdbid"):
+            keys.add(f"tvdb:{item.get('tvdb_id') or item['tvdbid']}")
+        elif item.get("tmdb_id") or item.get("tmdbid"):
+            keys.add(f"tmdb:{item.get('tmdb_id') or item['tmdbid']}")
+        elif item.get("id"):
+            keys.add(f"mdblist:{item['id']}")
+    return keys
+
+
+@METRICS.phase("select_diverse_lists")
+def select_diverse_lists(
+    mdb: MDBListAPI,
+    lists: List[dict],
+    config: Dict[str, str],
+    label: str,
+    managed_ids: Optional[set] = None,
+) -> List[dict]:
+    """
+    Reorder lists (sorted by likes) so each import list slot adds as many new
+    titles as possible, dropping near-duplicates of lists picked before them.
+
+    Pinned lists, lists in `managed_ids` (already on the instances this group
+    syncs to) and the top lists up to OVERLAP_CANDIDATES have their first
+    OVERLAP_SAMPLE_ITEMS items fetched (cached like any other MDBList
+    response). Managed lists discovery didn't return are sampled too, only
+    to seed the covered titles. Pinned and managed lists are picked first;
+    the rest greedily by new sampled titles, ties by likes. A list whose
+    sampled titles are OVERLAP_MAX_SHARED percent covered already is
+    dropped. Lists outside the pool, or whose items could not be fetched,
+    follow in likes order.
+
+    Samples are planned against the MDBList quota before any is fetched, in
+    the order above; what doesn't fit is deferred like other quota work.
+    """
+    candidates = get_int_setting(config, "OVERLAP_CANDIDATES")
+    sample = get_int_setting(config, "OVERLAP_SAMPLE_ITEMS")
+    max_shared = get_int_setting(config, "OVERLAP_MAX_SHARED")
+    managed_ids = managed_ids or set()
+
+    # Pinned and managed lists always take part, whatever their likes
+    first = [lst for lst in lists if lst.get("_pinned") or lst["id"] in managed_ids]
+    others = [lst for lst in lists if not (lst.get("_pinned") or lst["id"] in managed_ids)]
+    pool = first + others[:max(0, candidates - len(first))]
+    rest = others[len(pool) - len(first):]
+    seed_ids = sorted(managed_ids - {lst["id"] for lst in lists})
+    if len(pool) < 2:
+        return lists
+
+    sample_ids = [lst["id"] for lst in first] + seed_ids + [lst["id"] for lst in pool[len(first):]]
+    deferred = set()
+    if mdb.planner:
+        work = [
+            ("sample", list_id, mdb.request_cost(f"/lists/{list_id}/items", {"limit": sample}))
+            for list_id in sample_ids
+        ]
+        _, planned_out = mdb.planner.plan(work)
+        deferred = {key for _, key in planned_out}
+    fetch_ids = [list_id for list_id in sample_ids if list_id not in deferred]
+    calls = [(mdb.get_list_items, (list_id, sample)) for list_id in fetch_ids]
+    results = dict(zip(fetch_ids, run_parallel(calls, get_int_setting(config, "DISCOVERY_WORKERS"))))
+
+    def sampled_keys(list_id, name: str) -> set:
+        if list_id in deferred:
+            return set()
+        payload, error = results[list_id]
+        if isinstance(error, QuotaExhausted):
+            # The plan's estimate ran short (e.g. a cached entry expired)
+            mdb.planner.defer("sample", list_id)
+            deferred.add(list_id)
+            return set()
+        if error:
+            log_debug(f"  Could not sample '{name}': {error}")
+            return set()
+        return list_item_keys(payload)
+
+    covered = set()
+    for list_id in seed_ids:
+        covered |= sampled_keys(list_id, f"managed list {list_id}")
+
+    analysed = []
+    unknown = []
+    for lst in pool:
+        keys = sampled_keys(lst["id"], lst["name"])
+        if keys:
+            analysed.append((lst, keys))
+        else:
+            unknown.append(lst)
+
+    selected = []
+    for lst, keys in analysed:
+        if lst.get("_pinned") or lst["id"] in managed_ids:
+            selected.append(lst)
+            covered |= keys
+    remaining = [(lst, keys) for lst, keys in analysed if not (lst.get("_pinned") or lst["id"] in managed_ids)]
+
+    dropped = 0
+    while remaining:
+        best = max(remaining, key=lambda entry: (len(entry[1] - covered), entry[0].get("likes") or 0))
+        remaining.remove(best)
+        lst, keys = best
+        new = len(keys - covered)
+        shared = 100 - new * 100 // len(keys)
+        if shared >= max_shared:
+            log_debug(f"  Redundant: {lst['name']} ({shared}% of sampled titles already covered)")
+            dropped += 1
+            continue
+        selected.append(lst)
+        covered |= keys
+
+    log(f"Overlap analysis ({label}): sampled {len(analysed)} lists, {len(covered)} unique titles, "
+        f"{dropped} redundant lists dropped" + (f", {len(deferred)} samples deferred" if deferred else ""))
+    return selected + unknown + rest
+
+
 # =============================================================================
 # Import List URL Construction
 # =============================================================================
@@ -702,27 +1805,225 @@ def get_list_url(lst: dict) -> Optional[str]:
     return f"{MDBLIST_LIST_BASE}/{username}/{slug}/json"
 
 
+def import_list_url(import_list: dict) -> str:
+    """URL an existing Radarr (url) or Sonarr (baseUrl) import list polls."""
+    for field in import_list.get("fields", []):
+        if field.get("name") in ("url", "baseUrl") and field.get("value"):
+            return field["value"]
+    return ""
+
+
 # =============================================================================
-# Sync Logic
+# Poll Cost Tracking
 # =============================================================================
 
-def get_managed_import_lists(api: ArrAPI, prefix: str) -> List[dict]:
-    """Get import lists we manage (identified by name prefix)."""
-    all_lists = api.get_import_lists()
-    return [il for il in all_lists if il.get("name", "").startswith(prefix)]
+def probe_list_url(url: str) -> dict:
+    """
+    Fetch a list the way Sonarr/Radarr poll it (through the filter proxy when
+    the import list points there). Returns items, bytes, seconds and title keys.
+    The proxy's X-Upstream-Seconds header, when present, is used as the
+    latency so a proxy cache hit doesn't hide a slow upstream list.
+    """
+    start = time.monotonic()
+    with METRICS.request("lists", "GET", "/lists/{user}/{slug}/json") as call:
+        resp = HTTP.request("GET", url, timeout=120)
+        call.bytes = len(resp.body)
+    seconds = time.monotonic() - start
+    upstream = resp.headers.get("X-Upstream-Seconds")
+    if upstream:
+        try:
+            seconds = float(upstream)
+        except ValueError:
+            pass
+    payload = resp.json()
+    return {
+        "items": len(payload) if isinstance(payload, list) else 0,
+        "bytes": len(resp.body),
+        "seconds": round(seconds, 3),
+        "keys": list_item_keys(payload),
+    }
 
 
-def build_radarr_import_list(lst: dict, defaults: dict, prefix: str) -> dict:
-    """Build import list payload for Radarr."""
-    list_url = get_list_url(lst)
-    name = f"{prefix} {lst['name']}"
-    # Truncate name if too long
-    if len(name) > 100:
-        name = name[:97] + "..."
+def poll_cost_due(state: SyncState, instance_name: str, config: Dict[str, str]) -> bool:
+    if config["POLL_COST_TRACKING"].lower() != "true":
+        return False
+    measured = state.get("poll_cost", {}).get("measured", {}).get(instance_name)
+    interval = get_int_setting(config, "POLL_COST_INTERVAL_DAYS", minimum=0) * 86400
+    return not measured or time.time() - measured >= interval
 
-    return {
-        "name": name,
-        "enabled": True,
+
+@METRICS.phase("measure_poll_costs")
+def measure_poll_costs(
+    instance_name: str,
+    api: ArrAPI,
+    prefix: str,
+    state: SyncState,
+    config: Dict[str, str],
+) -> Tuple[Dict[Any, dict], Dict[Any, set]]:
+    """
+    Probe every managed list on an instance concurrently.
+    Returns (costs, keys): mdblist_id -> {items, bytes, seconds, unique,
+    measured_at}, where unique counts titles no other managed list on the
+    instance has, and mdblist_id -> title keys for find_costly_lists().
+    """
+    targets = []
+    for il in get_managed_import_lists(api, prefix):
+        entry = state.managed.get(instance_name, il["id"])
+        url = import_list_url(il)
+        if entry and url:
+            targets.append((entry["mdblist_id"], url))
+
+    workers = get_int_setting(config, "POLL_COST_WORKERS")
+    probed = {}
+    for (mdblist_id, url), (result, error) in zip(
+        targets, run_parallel([(probe_list_url, (url,)) for _, url in targets], workers)
+    ):
+        if error:
+            log_debug(f"  Poll cost probe failed for {url}: {error}")
+            continue
+        probed[mdblist_id] = result
+
+    seen = {}
+    for result in probed.values():
+        for key in result["keys"]:
+            seen[key] = seen.get(key, 0) + 1
+
+    measured_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    costs = {}
+    for mdblist_id, result in probed.items():
+        costs[mdblist_id] = {
+            "items": result["items"],
+            "bytes": result["bytes"],
+            "seconds": result["seconds"],
+            "unique": sum(1 for key in result["keys"] if seen[key] == 1),
+            "measured_at": measured_at,
+        }
+    if costs:
+        total_mb = sum(c["bytes"] for c in costs.values()) / 1e6
+        slowest = max(c["seconds"] for c in costs.values())
+        log(f"  {instance_name}: poll cost of {len(costs)} lists: "
+            f"{sum(c['items'] for c in costs.values())} items, {total_mb:.1f} MB, slowest {slowest:.1f}s")
+    return costs, {mdblist_id: set(result["keys"]) for mdblist_id, result in probed.items()}
+
+
+def find_costly_lists(
+    costs: Dict[Any, dict],
+    config: Dict[str, str],
+    keys: Optional[Dict[Any, set]] = None,
+    protected: Optional[set] = None,
+) -> Dict[Any, str]:
+    """
+    mdblist_id -> reason, for lists whose poll cost is out of line: slower
+    than POLL_COST_MAX_SECONDS, or more than POLL_COST_OUTLIER times the
+    median items per unique title (needs at least 3 measured lists).
+    Lists in `protected` (pinned) are never picked.
+
+    Overlap is judged greedily: the worst list is picked, then unique
+    coverage of the remaining lists is recomputed from their title `keys`
+    before the next pick. Lists that mostly overlap each other therefore
+    lose only their worst members, not the whole group (and the titles they
+    share). Recomputed coverage is written back into costs[...]["unique"].
+    Without keys (between measurements) coverage can't be recomputed, so at
+    most one list is picked on overlap per run.
+    """
+    outlier = get_float_setting(config, "POLL_COST_OUTLIER")
+    max_seconds = get_float_setting(config, "POLL_COST_MAX_SECONDS")
+    protected = protected or set()
+
+    costly = {}
+    for mdblist_id, cost in costs.items():
+        if mdblist_id not in protected and max_seconds > 0 and cost["seconds"] > max_seconds:
+            costly[mdblist_id] = f"{cost['seconds']:.1f}s per poll"
+    remaining = [k for k in costs if k not in costly]
+    if outlier <= 0:
+        return costly
+
+    while len(remaining) >= 3:
+        if keys:
+            seen = {}
+            for mdblist_id in remaining:
+                for key in keys.get(mdblist_id, ()):
+                    seen[key] = seen.get(key, 0) + 1
+            for mdblist_id in remaining:
+                if mdblist_id in keys:
+                    costs[mdblist_id]["unique"] = sum(1 for key in keys[mdblist_id] if seen[key] == 1)
+        per_unique = {k: costs[k]["items"] / max(costs[k]["unique"], 1) for k in remaining}
+        ratios = sorted(per_unique.values())
+        median = ratios[len(ratios) // 2]
+        over = [k for k in remaining if k not in protected and per_unique[k] > outlier * max(median, 1)]
+        if not over:
+            break
+        worst = max(over, key=lambda k: per_unique[k])
+        cost = costs[worst]
+        costly[worst] = (f"{cost['items']} items for {cost['unique']} unique titles "
+                         f"({per_unique[worst]:.0f}x vs median {median:.0f}x)")
+        remaining.remove(worst)
+        if not keys:
+            break
+    return costly
+
+
+def poll_cost_penalty(lists: List[ListRecord], config: Dict[str, str]) -> Dict[Any, float]:
+    """
+    Ranking divisor per list id: lists with more than POLL_COST_OUTLIER times
+    the median item count (what every Sonarr/Radarr poll re-fetches) rank as
+    if their likes were cut by how far over that they are. Pinned lists and
+    lists within the limit get 1.
+    """
+    outlier = get_float_setting(config, "POLL_COST_OUTLIER")
+    sizes = sorted(lst.get("items") or 0 for lst in lists)
+    if config["POLL_COST_TRACKING"].lower() != "true" or outlier <= 0 or len(sizes) < 3:
+        return {}
+    limit = outlier * max(sizes[len(sizes) // 2], 1)
+    return {
+        lst["id"]: (lst.get("items") or 0) / limit
+        for lst in lists
+        if not lst.get("_pinned") and (lst.get("items") or 0) > limit
+    }
+
+
+def recently_demoted(state: SyncState, config: Dict[str, str]) -> set:
+    """MDBList ids demoted for poll cost within POLL_COST_DEMOTE_DAYS."""
+    cutoff = time.time() - get_int_setting(config, "POLL_COST_DEMOTE_DAYS", minimum=0) * 86400
+    demoted = state.get("poll_cost", {}).get("demoted", {})
+    return {int(k) if k.isdigit() else k for k, at in demoted.items() if at >= cutoff}
+
+
+# =============================================================================
+# Sync Logic
+# =============================================================================
+
+def get_managed_import_lists(api: ArrAPI, prefix: str) -> List[dict]:
+    """Get import lists we manage (identified by name prefix)."""
+    all_lists = api.get_import_lists()
+    return [il for il in all_lists if il.get("name", "").startswith(prefix)]
+
+
+def managed_entry(instance_name: str, lst: dict, list_url: str, import_list_id: Any) -> dict:
+    """State entry (managed_lists value) for a list added to an instance."""
+    return {
+        "mdblist_id": lst["id"],
+        "import_list_id": import_list_id,
+        "instance": instance_name,
+        "name": lst["name"],
+        "url": list_url,
+        "likes": lst.get("likes") or 0,
+        "items": lst.get("items") or 0,
+        "added_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def build_radarr_import_list(lst: dict, defaults: dict, prefix: str) -> dict:
+    """Build import list payload for Radarr."""
+    list_url = get_list_url(lst)
+    name = f"{prefix} {lst['name']}"
+    # Truncate name if too long
+    if len(name) > 100:
+        name = name[:97] + "..."
+
+    return {
+        "name": name,
+        "enabled": True,
         "enableAuto": True,
         "searchOnAdd": defaults["searchOnAdd"],
         "monitor": defaults["monitor"],
@@ -768,6 +2069,7 @@ def build_sonarr_import_list(lst: dict, defaults: dict, prefix: str) -> dict:
     }
 
 
+@METRICS.phase("sync_lists_to_instance")
 def sync_lists_to_instance(
     instance_name: str,
     api: ArrAPI,
@@ -778,369 +2080,1230 @@ def sync_lists_to_instance(
     prefix: str,
     state: dict,
     dry_run: bool,
+    plan: Optional["SyncPlan"] = None,
+    costly: Optional[Dict[Any, Tuple[dict, str]]] = None,
+    skip_ids: Optional[set] = None,
+    workers: int = 4,
 ) -> int:
     """
     Sync discovered lists to a Sonarr/Radarr instance.
-    Returns number of lists added.
+    Returns number of lists added (or planned/previewed); per-outcome counts
+    go to state["result"]. With a plan, additions are recorded into it
+    instead of being made.
+
+    Managed lists in `costly` (import_list_id -> (state entry, reason)) are
+    demoted first: removed in one bulk delete, recorded in state["demoted"],
+    and their slots filled from `lists` like any other. Lists in skip_ids
+    are never added. Payloads are validated locally against the instance's
+    import list schema, then POSTed `workers` at a time; slots left by
+    rejected lists are refilled from the next candidates. Any other failure
+    (5xx, timeout, refused connection) stops additions to the instance, once
+    the import lists have been re-read to adopt lists such a request may
+    have created anyway.
     """
     # Fetch all import lists once, then split into managed vs all
     all_import = api.get_import_lists()
     managed = [il for il in all_import if il.get("name", "").startswith(prefix)]
+    all_urls = {import_list_url(il) for il in all_import} - {""}
+    names = {il.get("name", "") for il in all_import}
+    skip_ids = set(skip_ids or ())
+    result = state.setdefault("result", {"added": 0, "failed": 0, "invalid": 0, "demoted": 0})
+
+    demote = [(il, *costly[il["id"]]) for il in managed if il["id"] in (costly or {})]
+    for il, entry, reason in demote:
+        skip_ids.add(entry["mdblist_id"])
+        if plan:
+            plan.remove(instance_name, il, entry, entry.get("likes") or 0, demoted=True)
+            log(f"  Planned demotion on {instance_name}: {il.get('name', '')} ({reason})")
+        elif dry_run:
+            log_dry(f"  Would demote on {instance_name}: {il.get('name', '')} ({reason})")
+    freed = len(demote)
+    if demote and not plan and not dry_run:
+        errors = api.delete_import_lists([il["id"] for il, _, _ in demote], workers)
+        for il, entry, reason in demote:
+            if errors[il["id"]]:
+                log_error(f"  Failed to demote '{il.get('name', '')}': {errors[il['id']]}")
+                freed -= 1
+                continue
+            log_success(f"  Demoted on {instance_name}: {il.get('name', '')} ({reason})")
+            state.setdefault("removed", []).append(entry["mdblist_id"])
+            state.setdefault("demoted", {})[str(entry["mdblist_id"])] = time.time()
+    result["demoted"] = freed
+
+    def candidates():
+        """Lists not on the instance yet whose payload passes local validation."""
+        for lst in lists:
+            if lst["id"] in skip_ids:
+                log_debug(f"  Skipping {lst['name']}: demoted for poll cost")
+                continue
+            list_url = get_list_url(lst)
+            if not list_url:
+                continue
+            if list_url in all_urls:
+                log_debug(f"  Already exists: {lst['name']}")
+                continue
+            payload = build_fn(lst, defaults, prefix)
+            problems = api.validate_import_list(payload)
+            if payload["name"] in names:
+                problems.append(f"an import list named '{payload['name']}' already exists")
+            if problems:
+                log_warn(f"  Skipped '{lst['name']}' on {instance_name}: {problems[0]}")
+                result["invalid"] += 1
+                continue
+            all_urls.add(list_url)
+            names.add(payload["name"])
+            yield lst, list_url, payload
 
-    all_urls = set()
-    for il in all_import:
-        for field in il.get("fields", []):
-            if field.get("name") in ("url", "baseUrl") and field.get("value"):
-                all_urls.add(field["value"])
+    def track(lst: dict, list_url: str, import_list_id: Any):
+        state.setdefault("managed_lists", {})[f"{instance_name}:{lst['id']}"] = managed_entry(
+            instance_name, lst, list_url, import_list_id
+        )
 
-    slots_available = max_lists - len(managed)
+    slots_available = max_lists - len(managed) + freed
+    pending = candidates()
     added = 0
 
-    for lst in lists:
-        if slots_available <= 0:
+    while slots_available > 0:
+        # At most `workers` POSTs in flight, so a failing instance is caught
+        # after one round rather than after every open slot was tried
+        batch = list(islice(pending, slots_available if plan or dry_run else min(slots_available, workers)))
+        if not batch:
             break
 
-        list_url = get_list_url(lst)
-        if not list_url:
-            continue
-        if list_url in all_urls:
-            log_debug(f"  Already exists: {lst['name']}")
+        if plan or dry_run:
+            for lst, list_url, payload in batch:
+                if plan:
+                    plan.add(instance_name, lst, payload, managed_entry(instance_name, lst, list_url, None))
+                    log(f"  Planned for {instance_name}: {lst['name']} ({lst.get('likes', 0)} likes, {lst.get('items', 0)} items)")
+                else:
+                    log_dry(f"  Would add to {instance_name}: {lst['name']} ({lst.get('likes', 0)} likes, {lst.get('items', 0)} items)")
+                    log_dry(f"    URL: {list_url}")
+            added += len(batch)
+            slots_available -= len(batch)
             continue
 
-        if dry_run:
-            log_dry(f"  Would add to {instance_name}: {lst['name']} ({lst.get('likes', 0)} likes, {lst.get('items', 0)} items)")
-            log_dry(f"    URL: {list_url}")
-        else:
-            payload = build_fn(lst, defaults, prefix)
-            try:
-                result = api.add_import_list(payload)
-                import_list_id = result.get("id", "?")
-                log_success(f"  Added to {instance_name}: {lst['name']} (import_list_id={import_list_id})")
-
-                # Track in state
-                state_key = f"{instance_name}:{lst['id']}"
-                state.setdefault("managed_lists", {})[state_key] = {
-                    "mdblist_id": lst["id"],
-                    "import_list_id": import_list_id,
-                    "instance": instance_name,
-                    "name": lst["name"],
-                    "url": list_url,
-                    "likes": lst.get("likes") or 0,
-                    "items": lst.get("items") or 0,
-                    "added_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                }
-            except HTTPError as e:
-                detail = getattr(e, "error_detail", "")
-                if e.code == 400 and detail:
-                    # Extract meaningful message from Sonarr/Radarr validation errors
-                    msgs = []
-                    if isinstance(detail, list):
-                        msgs = [d.get("errorMessage", "") for d in detail if isinstance(d, dict)]
-                    msg = msgs[0] if msgs else str(detail)
-                    log_warn(f"  Skipped '{lst['name']}' on {instance_name}: {msg[:120]}")
+        # Sonarr/Radarr test each list synchronously on POST, so submit the
+        # batch concurrently rather than one round-trip after another
+        responses = run_parallel([(api.add_import_list, (payload,)) for _, _, payload in batch], workers)
+        unsure = []
+        for (lst, list_url, _), (response, error) in zip(batch, responses):
+            if error:
+                if isinstance(error, HTTPError) and error.code == 400:
+                    log_warn(f"  Skipped '{lst['name']}' on {instance_name}: {describe_arr_error(error)}")
+                    result["failed"] += 1
                 else:
-                    log_error(f"  Failed to add '{lst['name']}' to {instance_name}: {e.code} {e.reason}")
-                continue
-            except Exception as e:
-                log_error(f"  Failed to add '{lst['name']}' to {instance_name}: {e}")
+                    log_error(f"  Failed to add '{lst['name']}' to {instance_name}: {describe_arr_error(error)}")
+                    unsure.append((lst, list_url))
                 continue
+            import_list_id = response.get("id", "?")
+            log_success(f"  Added to {instance_name}: {lst['name']} (import_list_id={import_list_id})")
+            track(lst, list_url, import_list_id)
+            slots_available -= 1
+            added += 1
 
-        all_urls.add(list_url)
-        slots_available -= 1
-        added += 1
+        if not unsure:
+            continue
+        # The instance is struggling, and a POST that timed out may still
+        # have created its list: re-read the import lists, adopt any such
+        # list, and make no further additions this run
+        api.snapshot.invalidate("import_lists")
+        try:
+            existing = {import_list_url(il): il for il in api.get_import_lists()}
+        except Exception as e:
+            log_error(f"  Could not re-read import lists on {instance_name}: {describe_arr_error(e)}")
+            existing = {}
+        for lst, list_url in unsure:
+            il = existing.get(list_url)
+            if il and il.get("name", "").startswith(prefix):
+                log_success(f"  Added to {instance_name}: {lst['name']} (import_list_id={il['id']}, found after the error)")
+                track(lst, list_url, il["id"])
+                added += 1
+            else:
+                result["failed"] += 1
+        log_error(f"  Stopping additions to {instance_name} after a failed request")
+        break
 
+    result["added"] = added
     return added
 
 
+@METRICS.phase("cleanup_stale_lists")
 def cleanup_stale_lists(
     instance_name: str,
     api: ArrAPI,
     mdb: MDBListAPI,
     prefix: str,
     min_likes: int,
-    state: dict,
+    state: SyncState,
     dry_run: bool,
+    plan: Optional["SyncPlan"] = None,
+    known: Optional[Dict[Any, dict]] = None,
+    workers: int = 4,
 ) -> int:
-    """Remove managed lists that have fallen below quality threshold."""
+    """
+    Remove managed lists that have fallen below quality threshold, in one
+    bulk delete once every list has been checked.
+    With a plan, removals are recorded into it instead of being made.
+    Lists in `known` (id -> list metadata from this run's discovery) are
+    judged on those likes; only the rest cost a get_list_info() call.
+    """
     managed = get_managed_import_lists(api, prefix)
+    index = state.managed
     removed = 0
 
-    for il in managed:
-        import_id = il["id"]
-        name = il.get("name", "")
-
-        # Find the MDBList ID from state
-        state_entry = None
-        for key, entry in state.get("managed_lists", {}).items():
-            if entry.get("import_list_id") == import_id:
-                state_entry = entry
-                break
+    # Forget state entries whose import list was deleted outside mdblist-sync
+    live_ids = {il["id"] for il in managed}
+    for entry in index.for_instance(instance_name):
+        if entry.get("import_list_id") not in live_ids:
+            log_debug(f"  Forgetting {entry.get('name', '?')}: import list no longer exists on {instance_name}")
+            if not dry_run and not plan:
+                index.remove(instance_name, entry["mdblist_id"])
 
+    candidates = []
+    for il in managed:
+        state_entry = index.get(instance_name, il["id"])
         if not state_entry:
             # Unknown managed list - skip (might be manually added with same prefix)
-            log_debug(f"  Skipping unknown managed list: {name}")
+            log_debug(f"  Skipping unknown managed list: {il.get('name', '')}")
             continue
+        candidates.append((il, state_entry))
+
+    # Check the lists most likely to be stale first, so a tight MDBList quota
+    # is spent where a removal is likeliest
+    candidates.sort(key=lambda c: c[1].get("likes") or 0)
 
-        # Check if list still meets criteria
+    reused = 0
+    stale = []
+    for il, state_entry in candidates:
+        name = il.get("name", "")
+
+        # Check if list still meets criteria, using the likes discovery just
+        # fetched when available
+        discovered = known.get(state_entry["mdblist_id"]) if known else None
         try:
-            info = mdb.get_list_info(state_entry["mdblist_id"])
-            if isinstance(info, list) and info:
-                current_likes = info[0].get("likes") or 0
+            if discovered is not None:
+                current_likes = discovered.get("likes") or 0
+                reused += 1
             else:
-                current_likes = 0
+                info = mdb.get_list_info(state_entry["mdblist_id"])
+                if isinstance(info, list) and info:
+                    current_likes = info[0].get("likes") or 0
+                    index.observe(state_entry["mdblist_id"], current_likes, info[0].get("items"))
+                else:
+                    current_likes = 0
+        except QuotaExhausted:
+            mdb.planner.defer("cleanup", f"{instance_name}:{state_entry['mdblist_id']}")
+            continue
         except Exception:
             # Can't verify, skip
             continue
 
         if current_likes < min_likes:
-            if dry_run:
+            if plan or dry_run:
+                # Drop it from the snapshot as a live run would, so a sync
+                # after cleanup fills the slot it frees
+                api.snapshot.record_import_list_removed(il["id"])
+            if plan:
+                plan.remove(instance_name, il, state_entry, current_likes)
+                log(f"  Planned removal from {instance_name}: {name} ({current_likes} likes < {min_likes} min)")
+            elif dry_run:
                 log_dry(f"  Would remove from {instance_name}: {name} ({current_likes} likes < {min_likes} min)")
             else:
-                try:
-                    api.delete_import_list(import_id)
-                    log_success(f"  Removed from {instance_name}: {name} ({current_likes} likes)")
-
-                    # Remove from state
-                    state_key = f"{instance_name}:{state_entry['mdblist_id']}"
-                    state.get("managed_lists", {}).pop(state_key, None)
-                except Exception as e:
-                    log_error(f"  Failed to remove '{name}': {e}")
-                    continue
+                stale.append((il, state_entry, current_likes))
+                continue
 
             removed += 1
 
+    if stale:
+        errors = api.delete_import_lists([il["id"] for il, _, _ in stale], workers)
+        for il, state_entry, current_likes in stale:
+            if errors[il["id"]]:
+                log_error(f"  Failed to remove '{il.get('name', '')}': {errors[il['id']]}")
+                continue
+            log_success(f"  Removed from {instance_name}: {il.get('name', '')} ({current_likes} likes)")
+            index.remove(instance_name, state_entry["mdblist_id"])
+            removed += 1
+
+    if known is not None:
+        log_debug(f"  {instance_name}: {reused}/{len(candidates)} lists checked against discovery results")
     return removed
 
 
-# =============================================================================
-# Status Display
-# =============================================================================
+def sync_instance(
+    instance_name: str,
+    api: ArrAPI,
+    lists: List[dict],
+    max_lists: int,
+    defaults_fn,
+    build_fn,
+    config: Dict[str, str],
+    state: SyncState,
+    dry_run: bool,
+    plan: Optional["SyncPlan"] = None,
+) -> Tuple[int, dict]:
+    """
+    Resolve defaults and sync lists to one instance (safe to run in a worker;
+    state is only read). Returns (lists added, delta for merge_instance_delta).
+    """
+    app = "movie" if build_fn is build_radarr_import_list else "show"
+    log(f"\n{Colors.BOLD}Syncing {app} lists to {instance_name}...{Colors.NC}")
+
+    defaults = defaults_fn(api, config, instance_name)
+    if not defaults:
+        log_warn(f"Skipping {instance_name}: could not determine defaults")
+        return 0, {}
 
-def show_status(config: Dict[str, str], state: dict, radarr_apis, sonarr_apis):
-    """Display current managed lists status."""
     prefix = config["LIST_NAME_PREFIX"]
+    delta = {"managed_lists": {}, "removed": [], "demoted": {}, "poll_cost": {}}
+    costly = {}
+    if config["POLL_COST_TRACKING"].lower() == "true":
+        keys = None
+        if poll_cost_due(state, instance_name, config):
+            delta["poll_cost"], keys = measure_poll_costs(instance_name, api, prefix, state, config)
+        # Judge on this run's measurements, else the ones stored in state
+        # (copied: find_costly_lists rewrites coverage and state is read-only here)
+        entries = {e["mdblist_id"]: e for e in state.managed.for_instance(instance_name)}
+        costs = {
+            mdblist_id: delta["poll_cost"].get(mdblist_id) or dict(entry.get("poll_cost") or {})
+            for mdblist_id, entry in entries.items()
+        }
+        pinned = {lst["id"] for lst in lists if lst.get("_pinned")}
+        costs = {k: v for k, v in costs.items() if v}
+        for mdblist_id, reason in find_costly_lists(costs, config, keys, pinned).items():
+            entry = entries[mdblist_id]
+            costly[entry.get("import_list_id")] = (entry, reason)
+
+    added = sync_lists_to_instance(
+        instance_name, api, lists, max_lists, defaults,
+        build_fn, prefix, delta, dry_run, plan, costly, recently_demoted(state, config),
+        get_int_setting(config, "IMPORT_LIST_WORKERS"),
+    )
+    result = delta["result"]
+    outcome = [f"{added} lists {'planned' if plan or dry_run else 'added'}"]
+    outcome += [f"{result[k]} {k}" for k in ("demoted", "failed", "invalid") if result[k]]
+    log(f"  {instance_name}: {', '.join(outcome)}")
+    return added, delta
+
+
+def merge_instance_delta(state: SyncState, instance_name: str, delta: dict):
+    """Apply what sync_instance recorded for one instance to the shared state."""
+    poll_cost = state.setdefault("poll_cost", {})
+    # Only a run that measured something counts, so lists added by the first
+    # run are measured by the next one rather than an interval later
+    if delta["poll_cost"]:
+        for mdblist_id, cost in delta["poll_cost"].items():
+            entry = state.managed.entries.get(f"{instance_name}:{mdblist_id}")
+            if entry:
+                entry["poll_cost"] = cost
+        poll_cost.setdefault("measured", {})[instance_name] = time.time()
+    for mdblist_id in delta["removed"]:
+        state.managed.remove(instance_name, mdblist_id)
+    poll_cost.setdefault("demoted", {}).update(delta["demoted"])
+    state.managed.merge(delta["managed_lists"])
+
+
+def find_secondary_instances(apis: List[Tuple[str, ArrAPI]]) -> set:
+    """
+    Find instances that sync from another instance of the same app.
+    If A syncs from B but B doesn't sync from A, A is secondary.
+    If bidirectional, the base instance (shorter name) is primary.
+    """
+    sync_map = {n: api.get_sync_targets(apis) for n, api in apis}
+    secondary = set()
+    for inst_name, targets in sync_map.items():
+        for target in targets:
+            target_syncs_back = inst_name in sync_map.get(target, [])
+            if not target_syncs_back:
+                # Unidirectional: this instance is secondary
+                secondary.add(inst_name)
+            elif len(inst_name) > len(target):
+                # Bidirectional: longer name (e.g., radarr-4k) is secondary
+                secondary.add(inst_name)
+    return secondary
 
-    print(f"\n{Colors.BOLD}MDBList Auto-Sync Status{Colors.NC}")
-    print(f"{'=' * 60}")
 
-    if state.get("last_sync"):
-        print(f"Last sync: {state['last_sync']}")
-    else:
-        print("Last sync: never")
+# =============================================================================
+# Plan / Apply
+# =============================================================================
 
-    managed = state.get("managed_lists", {})
-    print(f"Managed lists in state: {len(managed)}")
+PLAN_VERSION = 1
 
-    for instance_name, api in radarr_apis + sonarr_apis:
-        print(f"\n{Colors.BOLD}{instance_name}{Colors.NC}")
-        try:
-            import_lists = get_managed_import_lists(api, prefix)
-            if not import_lists:
-                print(f"  No managed import lists")
-                continue
+# Fields apply_plan reads from each planned addition / removal
+PLAN_ADD_FIELDS = ("list", "payload", "state_entry")
+PLAN_REMOVE_FIELDS = ("import_list_id", "name", "mdblist_id", "likes")
 
-            for il in import_lists:
-                name = il.get("name", "unknown")
-                enabled = il.get("enabled", il.get("enableAutomaticAdd", False))
-                status = f"{Colors.GREEN}enabled{Colors.NC}" if enabled else f"{Colors.RED}disabled{Colors.NC}"
 
-                list_url = ""
-                for field in il.get("fields", []):
-                    if field.get("name") in ("url", "baseUrl"):
-                        list_url = field.get("value", "")
-                        break
+def instance_fingerprint(api: ArrAPI) -> str:
+    """
+    Hash of the instance state a plan depends on: every import list (id,
+    name, URL), quality profile ids and root folder paths.
+    """
+    import_lists = [[il.get("id"), il.get("name", ""), import_list_url(il)] for il in api.get_import_lists()]
+    data = {
+        "import_lists": sorted(import_lists, key=lambda x: (x[0] or 0, x[1])),
+        "quality_profiles": sorted(p.get("id") for p in api.get_quality_profiles()),
+        "root_folders": sorted(f.get("path", "") for f in api.get_root_folders()),
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
 
-                print(f"  {name}")
-                print(f"    Status: {status} | URL: {list_url}")
-        except Exception as e:
-            print(f"  Error checking: {e}")
 
-    print()
+class SyncPlan:
+    """
+    Import list additions/removals recorded by --plan instead of being made.
 
+    Written as JSON with, per instance, the exact payloads to POST, the
+    import lists to delete, the list metadata used, and a fingerprint of the
+    instance at planning time so --apply can refuse a plan that went stale.
+    """
 
-# =============================================================================
-# Main
-# =============================================================================
+    def __init__(self, mode: str, prefix: str):
+        self.mode = mode
+        self.prefix = prefix
+        self.instances: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, instance_name: str, api: ArrAPI):
+        self.instances[instance_name] = {
+            "url": f"{api.url}{api.base_url}",
+            "fingerprint": instance_fingerprint(api),
+            "add": [],
+            "remove": [],
+        }
+
+    def add(self, instance_name: str, lst: dict, payload: dict, entry: dict):
+        with self._lock:
+            self.instances[instance_name]["add"].append({
+                "list": {k: lst.get(k) for k in SNAPSHOT_LIST_FIELDS if k in lst},
+                "payload": payload,
+                "state_entry": entry,
+            })
+
+    def remove(self, instance_name: str, import_list: dict, entry: dict, likes: int, demoted: bool = False):
+        with self._lock:
+            self.instances[instance_name]["remove"].append({
+                "import_list_id": import_list["id"],
+                "name": import_list.get("name", ""),
+                "mdblist_id": entry["mdblist_id"],
+                "likes": likes,
+                "demoted": demoted,
+            })
+
+    def summary(self) -> str:
+        adds = sum(len(i["add"]) for i in self.instances.values())
+        removes = sum(len(i["remove"]) for i in self.instances.values())
+        return f"{adds} additions, {removes} removals"
+
+    def write(self, path: str):
+        plan = {
+            "version": PLAN_VERSION,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "mode": self.mode,
+            "prefix": self.prefix,
+            "instances": self.instances,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(plan, f, indent=2)
+        os.replace(tmp, path)
+
+
+def plan_shape_error(plan: dict) -> Optional[str]:
+    """Why a loaded plan is malformed (first problem found), or None."""
+    for key in ("mode", "created_at"):
+        if not isinstance(plan.get(key), str):
+            return f"'{key}' missing or not a string"
+    if not isinstance(plan.get("instances"), dict):
+        return "'instances' missing or not an object"
+    for name, planned in plan["instances"].items():
+        if not isinstance(planned, dict) or not isinstance(planned.get("fingerprint"), str):
+            return f"instance '{name}' has no fingerprint"
+        for kind, fields in (("add", PLAN_ADD_FIELDS), ("remove", PLAN_REMOVE_FIELDS)):
+            items = planned.get(kind)
+            if not isinstance(items, list):
+                return f"instance '{name}': '{kind}' missing or not a list"
+            for n, item in enumerate(items):
+                missing = [f for f in fields if not isinstance(item, dict) or f not in item]
+                if missing:
+                    return f"instance '{name}': {kind} #{n + 1} lacks {', '.join(missing)}"
+        for n, item in enumerate(planned["add"]):
+            if not isinstance(item["list"], dict) or not {"id", "name"} <= item["list"].keys():
+                return f"instance '{name}': add #{n + 1} has no list id/name"
+            if not isinstance(item["payload"], dict) or not isinstance(item["state_entry"], dict):
+                return f"instance '{name}': add #{n + 1} payload/state entry is not an object"
+    return None
 
-def main():
-    global _debug_mode
 
-    # Parse args
-    args = set(sys.argv[1:])
+def apply_plan(config: Dict[str, str], state: SyncState, path: str, dry_run: bool) -> bool:
+    """
+    Apply a plan written by --plan. Makes no MDBList requests.
+    Refuses the whole plan (returns False) if any instance it touches is
+    missing or has changed since the plan was made.
+    """
+    try:
+        with open(path) as f:
+            plan = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        log_error(f"Cannot read plan {path}: {e}")
+        return False
+    if not isinstance(plan, dict):
+        log_error(f"Malformed plan {path}: not a JSON object")
+        return False
+    if plan.get("version") != PLAN_VERSION:
+        log_error(f"Unsupported plan version {plan.get('version')} (expected {PLAN_VERSION})")
+        return False
+    problem = plan_shape_error(plan)
+    if problem:
+        log_error(f"Malformed plan {path}: {problem}")
+        return False
+
+    log(f"Applying {plan['mode']} plan from {plan['created_at']}")
+    radarr_apis, sonarr_apis = discover_instances(config)
+    apis = dict(radarr_apis + sonarr_apis)
 
-    if "--help" in args or "-h" in args:
-        print(__doc__.strip())
-        sys.exit(0)
+    # Check every instance before touching any of them
+    targets = []
+    for name, planned in plan["instances"].items():
+        if not planned["add"] and not planned["remove"]:
+            continue
+        api = apis.get(name)
+        if not api:
+            log_error(f"Plan rejected: instance '{name}' not found")
+            return False
+        if instance_fingerprint(api) != planned["fingerprint"]:
+            log_error(f"Plan rejected: '{name}' changed since the plan was made (re-run --plan)")
+            return False
+        targets.append((name, api, planned))
+
+    added = removed = 0
+    workers = get_int_setting(config, "IMPORT_LIST_WORKERS")
+    for name, api, planned in targets:
+        # Removals first, so additions can take the slots they free
+        removals, additions = planned["remove"], planned["add"]
+        if dry_run:
+            for item in removals:
+                log_dry(f"  Would remove from {name}: {item['name']} ({item['likes']} likes)")
+            for item in additions:
+                log_dry(f"  Would add to {name}: {item['list']['name']}")
+            continue
 
-    dry_run = "--dry-run" in args
-    cleanup = "--cleanup" in args
-    status = "--status" in args
-    _debug_mode = "--debug" in args
+        errors = api.delete_import_lists([item["import_list_id"] for item in removals], workers) if removals else {}
+        for item in removals:
+            if errors[item["import_list_id"]]:
+                log_error(f"  Failed to remove '{item['name']}': {errors[item['import_list_id']]}")
+                continue
+            state.managed.remove(name, item["mdblist_id"])
+            if item.get("demoted"):
+                state.setdefault("poll_cost", {}).setdefault("demoted", {})[str(item["mdblist_id"])] = time.time()
+            log_success(f"  Removed from {name}: {item['name']} ({item['likes']} likes)")
+            removed += 1
 
-    if dry_run:
-        log("Dry-run mode: no changes will be made")
+        responses = run_parallel([(api.add_import_list, (item["payload"],)) for item in additions], workers)
+        for item, (response, error) in zip(additions, responses):
+            lst = item["list"]
+            if error:
+                log_error(f"  Failed to add '{lst['name']}' to {name}: {describe_arr_error(error)}")
+                continue
+            entry = dict(item["state_entry"], import_list_id=response.get("id", "?"))
+            state.managed.add(f"{name}:{lst['id']}", entry)
+            log_success(f"  Added to {name}: {lst['name']} (import_list_id={entry['import_list_id']})")
+            added += 1
 
-    # Load config
-    config = load_config()
-    state = load_state()
+    log_success(f"Plan applied: {added} added, {removed} removed")
+    if not dry_run:
+        save_state(state)
+    return True
 
-    api_key = config["MDBLIST_API_KEY"]
-    if not api_key:
-        log_error("MDBLIST_API_KEY is required. Get one from https://mdblist.com/preferences/")
-        log_error(f"Set it in {CONFIG_PATH} or via environment variable")
-        sys.exit(1)
 
-    prefix = config["LIST_NAME_PREFIX"]
+# =============================================================================
+# Status Display
+# =============================================================================
 
-    # Connect to MDBList
-    mdb = MDBListAPI(api_key)
+def instance_status(name: str, api: ArrAPI, prefix: str, cached_only: bool = False) -> dict:
+    """
+    Managed import lists on one instance, as shown by --status.
+    With cached_only, only import lists already in the snapshot are shown.
+    """
+    entry = {"name": name, "import_lists": [], "error": ""}
     try:
-        user = mdb.get_user()
-        remaining = user.get("rate_limit_remaining", "?")
-        limit = user.get("rate_limit", "?")
-        log_success(f"MDBList connected as '{user.get('username', '?')}' (API: {remaining}/{limit} remaining)")
+        if cached_only:
+            import_lists = api.snapshot.peek("import_lists")
+            if import_lists is None:
+                entry["error"] = "import lists not loaded yet"
+                return entry
+            managed = [il for il in import_lists if il.get("name", "").startswith(prefix)]
+        else:
+            managed = get_managed_import_lists(api, prefix)
+        for il in managed:
+            list_url = ""
+            for field in il.get("fields", []):
+                if field.get("name") in ("url", "baseUrl"):
+                    list_url = field.get("value", "")
+                    break
+            entry["import_lists"].append({
+                "name": il.get("name", "unknown"),
+                "enabled": bool(il.get("enabled", il.get("enableAutomaticAdd", False))),
+                "url": list_url,
+            })
     except Exception as e:
-        log_error(f"Failed to connect to MDBList API: {e}")
-        sys.exit(1)
+        entry["error"] = str(e)
+    return entry
 
-    # Discover *arr instances
-    radarr_apis, sonarr_apis = discover_instances(config)
 
-    if not radarr_apis and not sonarr_apis:
-        log_error("No Radarr or Sonarr instances found")
-        sys.exit(1)
+def show_status(last_sync: Optional[str], managed_count: int, instances: List[dict], daemon: Optional[dict] = None):
+    """Display current managed lists status (instances from instance_status)."""
+    print(f"\n{Colors.BOLD}MDBList Auto-Sync Status{Colors.NC}")
+    print(f"{'=' * 60}")
 
-    # Status mode
-    if status:
-        show_status(config, state, radarr_apis, sonarr_apis)
-        return
+    if daemon:
+        running = daemon.get("running") or "idle"
+        print(f"Daemon: pid {daemon['pid']}, up since {daemon['started_at']} ({running})")
+        for job, when in sorted(daemon.get("next_runs", {}).items()):
+            last = daemon.get("last_runs", {}).get(job)
+            outcome = f", last {last['finished_at']} ({last['result']})" if last else ""
+            print(f"  Next {job}: {when}{outcome}")
 
-    # Cleanup mode
-    if cleanup:
-        log(f"\n{Colors.BOLD}Cleaning up stale lists...{Colors.NC}")
-        cleanup_min = int(config["CLEANUP_MIN_LIKES"])
-        total_removed = 0
+    if last_sync:
+        print(f"Last sync: {last_sync}")
+    else:
+        print("Last sync: never")
 
-        for name, api in radarr_apis + sonarr_apis:
-            removed = cleanup_stale_lists(name, api, mdb, prefix, cleanup_min, state, dry_run)
-            total_removed += removed
+    print(f"Managed lists in state: {managed_count}")
 
-        if total_removed > 0:
-            log_success(f"Removed {total_removed} stale lists")
-            if not dry_run:
-                save_state(state)
-        else:
-            log("No stale lists to remove")
+    for entry in instances:
+        print(f"\n{Colors.BOLD}{entry['name']}{Colors.NC}")
+        if entry["error"]:
+            print(f"  Error checking: {entry['error']}")
+            continue
+        if not entry["import_lists"]:
+            print(f"  No managed import lists")
+            continue
+
+        for il in entry["import_lists"]:
+            status = f"{Colors.GREEN}enabled{Colors.NC}" if il["enabled"] else f"{Colors.RED}disabled{Colors.NC}"
+            print(f"  {il['name']}")
+            print(f"    Status: {status} | URL: {il['url']}")
+
+    print()
+
+
+# =============================================================================
+# Sync / Cleanup Runs
+# =============================================================================
+
+def log_cache_stats(mdb: MDBListAPI):
+    """Log how many MDBList requests the response cache saved this run."""
+    if not mdb.cache:
         return
+    stats = mdb.cache.stats
+    log(f"MDBList cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+        f"{stats['misses']} fetched")
+    for outcome, count in stats.items():
+        METRICS.set_gauge("cache_responses", count, "MDBList responses by cache outcome.", outcome=outcome)
+
+
+def configure_retry(config: Dict[str, str]):
+    """Apply the retry settings from config to the shared HTTP client."""
+    HTTP.retry = RetryPolicy(
+        max_attempts=get_int_setting(config, "RETRY_MAX_ATTEMPTS"),
+        retry_budget=get_int_setting(config, "RETRY_BUDGET", minimum=0),
+        on_retry=log_retry,
+    )
+
+
+def start_mdblist_run(mdb: MDBListAPI, config: Dict[str, str], state: dict):
+    """Check the MDBList connection and plan this run against the remaining quota."""
+    user = mdb.get_user()
+    remaining = user.get("rate_limit_remaining", "?")
+    limit = user.get("rate_limit", "?")
+    log_success(f"MDBList connected as '{user.get('username', '?')}' (API: {remaining}/{limit} remaining)")
+    mdb.planner = QuotaPlanner.from_user(user, config, state)
+
+
+def cleanup_instances(
+    config: Dict[str, str],
+    state: SyncState,
+    mdb: MDBListAPI,
+    apis,
+    dry_run: bool,
+    plan: Optional["SyncPlan"] = None,
+    known: Optional[Dict[Any, dict]] = None,
+) -> int:
+    """Run cleanup_stale_lists on each instance and log the total."""
+    log(f"\n{Colors.BOLD}Cleaning up stale lists...{Colors.NC}")
+    prefix = config["LIST_NAME_PREFIX"]
+    cleanup_min = int(config["CLEANUP_MIN_LIKES"])
+    total_removed = 0
+
+    workers = get_int_setting(config, "IMPORT_LIST_WORKERS")
+    for name, api in apis:
+        removed = cleanup_stale_lists(name, api, mdb, prefix, cleanup_min, state, dry_run, plan, known, workers)
+        total_removed += removed
+
+    if plan:
+        log(f"Planned removal of {total_removed} stale lists")
+    elif total_removed > 0:
+        log_success(f"Removed {total_removed} stale lists")
+    else:
+        log("No stale lists to remove")
+    return total_removed
+
+
+def run_cleanup(
+    config: Dict[str, str],
+    state: SyncState,
+    mdb: MDBListAPI,
+    radarr_apis,
+    sonarr_apis,
+    dry_run: bool,
+    plan: Optional["SyncPlan"] = None,
+) -> int:
+    """Remove stale managed lists from every instance. Returns lists removed (or planned)."""
+    total_removed = cleanup_instances(config, state, mdb, radarr_apis + sonarr_apis, dry_run, plan)
+    mdb.planner.finish()
+    if not dry_run:
+        save_state(state)
+    log_cache_stats(mdb)
+    return total_removed
+
+
+def run_sync(
+    config: Dict[str, str],
+    state: SyncState,
+    mdb: MDBListAPI,
+    radarr_apis,
+    sonarr_apis,
+    dry_run: bool,
+    full_refresh: bool = False,
+    plan: Optional["SyncPlan"] = None,
+    cleanup: bool = False,
+) -> int:
+    """
+    Discover lists and sync them to every primary instance. Returns lists added (or planned).
 
-    # --- Main sync ---
+    With cleanup, stale managed lists are removed first (freeing their slots
+    for this run, also under --plan/--dry-run), judged on the likes discovery
+    just returned; only managed lists discovery didn't see are looked up
+    individually.
+    """
     log(f"\n{Colors.BOLD}Discovering lists from MDBList...{Colors.NC}")
     has_anime_instance = any("anime" in name for name, _ in sonarr_apis)
-    movie_lists, show_lists = discover_lists(mdb, config, has_anime_instance)
+    snapshot = None
+    if config["INCREMENTAL_DISCOVERY"].lower() == "true":
+        snapshot = DiscoverySnapshot.from_state(state, config, force_full=full_refresh)
+    # Everything discovery saw, before filtering: a managed list that now
+    # fails the filters still has fresh likes here
+    known = {}
+    movie_lists, show_lists = discover_lists(mdb, config, has_anime_instance, snapshot, known)
+    for lst in known.values():
+        state.managed.observe(lst["id"], lst.get("likes") or 0, lst.get("items"))
+    if cleanup:
+        cleanup_instances(config, state, mdb, radarr_apis + sonarr_apis, dry_run, plan, known)
 
     max_movies = int(config["MAX_LISTS_MOVIES"])
     max_shows = int(config["MAX_LISTS_SHOWS"])
-    total_added = 0
+    overlap = config["OVERLAP_ANALYSIS"].lower() == "true"
+    def managed_on(apis, anime: Optional[bool] = None) -> set:
+        """mdblist ids managed on the given instances (optionally only (non-)anime ones)."""
+        return {
+            entry["mdblist_id"]
+            for name, _ in apis
+            if anime is None or ("anime" in name) == anime
+            for entry in state.managed.for_instance(name)
+        }
+
+    if overlap and movie_lists:
+        movie_lists = select_diverse_lists(mdb, movie_lists, config, "movies", managed_on(radarr_apis))
+
+    # Build one sync job per primary instance; instances that sync from
+    # another instance (e.g., radarr-4k syncing from radarr) are skipped.
+    jobs = []
 
-    # Sync movie lists to Radarr instances
-    # Skip instances that sync from another instance (e.g., radarr-4k syncing from radarr)
     if radarr_apis and movie_lists:
-        log(f"\n{Colors.BOLD}Syncing movie lists to Radarr...{Colors.NC}")
-        # Determine which instances are secondary (sync from a primary)
-        # If A syncs from B but B doesn't sync from A, A is secondary.
-        # If bidirectional, the base instance (shorter name) is primary.
-        sync_map = {n: api.get_sync_targets(radarr_apis) for n, api in radarr_apis}
-        skip_radarr = set()
-        for inst_name, targets in sync_map.items():
-            for target in targets:
-                target_syncs_back = inst_name in sync_map.get(target, [])
-                if not target_syncs_back:
-                    # Unidirectional: this instance is secondary
-                    skip_radarr.add(inst_name)
-                elif len(inst_name) > len(target):
-                    # Bidirectional: longer name (e.g., radarr-4k) is secondary
-                    skip_radarr.add(inst_name)
-
+        skip_radarr = find_secondary_instances(radarr_apis)
         for name, api in radarr_apis:
             if name in skip_radarr:
                 log(f"  Skipping {name}: syncs from another instance")
                 continue
+            jobs.append((name, api, movie_lists, max_movies, get_radarr_defaults, build_radarr_import_list))
 
-            defaults = get_radarr_defaults(api, config, name)
-            if not defaults:
-                log_warn(f"Skipping {name}: could not determine defaults")
-                continue
-
-            added = sync_lists_to_instance(
-                name, api, movie_lists, max_movies, defaults,
-                build_radarr_import_list, prefix, state, dry_run,
-            )
-            total_added += added
-            log(f"  {name}: {added} lists added")
-
-    # Sync show lists to Sonarr instances
     # Route anime lists to anime instances, non-anime to regular instances
-    # Skip instances that sync from another instance (e.g., sonarr-4k syncing from sonarr)
     if sonarr_apis and show_lists:
-        log(f"\n{Colors.BOLD}Syncing show lists to Sonarr...{Colors.NC}")
-        has_anime_instance = any("anime" in name for name, _ in sonarr_apis)
-
         if has_anime_instance:
-            anime_shows = [lst for lst in show_lists if is_anime_list(lst)]
-            regular_shows = [lst for lst in show_lists if not is_anime_list(lst)]
+            anime_shows, regular_shows = [], []
+            for lst in show_lists:
+                (anime_shows if is_anime_list(lst) else regular_shows).append(lst)
             log_debug(f"  Split: {len(anime_shows)} anime lists, {len(regular_shows)} regular lists")
         else:
             anime_shows = []
             regular_shows = show_lists
-
-        # Determine which Sonarr instances are secondary
-        sync_map = {n: api.get_sync_targets(sonarr_apis) for n, api in sonarr_apis}
-        skip_sonarr = set()
-        for inst_name, targets in sync_map.items():
-            for target in targets:
-                target_syncs_back = inst_name in sync_map.get(target, [])
-                if not target_syncs_back:
-                    skip_sonarr.add(inst_name)
-                elif len(inst_name) > len(target):
-                    skip_sonarr.add(inst_name)
-
+        if overlap:
+            # Anime and regular lists go to different instances, so only
+            # overlap within each group matters
+            if regular_shows:
+                regular_shows = select_diverse_lists(
+                    mdb, regular_shows, config, "shows", managed_on(sonarr_apis, anime=False)
+                )
+            if anime_shows:
+                anime_shows = select_diverse_lists(
+                    mdb, anime_shows, config, "anime", managed_on(sonarr_apis, anime=True)
+                )
+
+        skip_sonarr = find_secondary_instances(sonarr_apis)
         for name, api in sonarr_apis:
             if name in skip_sonarr:
                 log(f"  Skipping {name}: syncs from another instance")
                 continue
-
-            defaults = get_sonarr_defaults(api, config, name)
-            if not defaults:
-                log_warn(f"Skipping {name}: could not determine defaults")
-                continue
-
             # Anime instances get anime lists, regular instances get the rest
             instance_lists = anime_shows if "anime" in name else regular_shows
+            jobs.append((name, api, instance_lists, max_shows, get_sonarr_defaults, build_sonarr_import_list))
 
-            added = sync_lists_to_instance(
-                name, api, instance_lists, max_shows, defaults,
-                build_sonarr_import_list, prefix, state, dry_run,
-            )
+    # Instances are independent, so sync them concurrently. Each job records
+    # into its own state delta and log buffer; both are merged/printed here in
+    # job order once everything has finished.
+    total_added = 0
+    if jobs:
+        workers = get_int_setting(config, "SYNC_WORKERS")
+        log(f"\n{Colors.BOLD}Syncing lists to {len(jobs)} instances "
+            f"({min(workers, len(jobs))} workers)...{Colors.NC}")
+        calls = [
+            (run_buffered, (sync_instance, name, api, lists, max_lists, defaults_fn, build_fn, config, state, dry_run, plan))
+            for name, api, lists, max_lists, defaults_fn, build_fn in jobs
+        ]
+        for job, (buffered, _) in zip(jobs, run_parallel(calls, workers)):
+            result, error, lines = buffered
+            flush_log_buffer(lines)
+            if error:
+                log_error(f"  {job[0]}: sync failed: {error}")
+                continue
+            added, delta = result
             total_added += added
-            log(f"  {name}: {added} lists added")
+            merge_instance_delta(state, job[0], delta)
 
     # Summary
     print()
-    if total_added > 0:
+    if plan:
+        log(f"Sync planned: {total_added} new lists")
+    elif total_added > 0:
         log_success(f"Sync complete: {total_added} new lists added")
-        if not dry_run:
-            save_state(state)
     else:
         log("Sync complete: no new lists to add (all up to date)")
+    # Quota history (and the discovery snapshot) change every run, so
+    # persist state even when nothing was added
+    mdb.planner.finish([t.strip() for t in config["SEARCH_TERMS"].split(",") if t.strip()])
+    if not dry_run:
+        save_state(state)
 
     # Show rate limit status
     try:
         user = mdb.get_user()
         remaining = user.get("rate_limit_remaining", "?")
         log(f"MDBList API requests remaining: {remaining}")
+        if isinstance(remaining, int):
+            METRICS.set_gauge("quota_remaining", remaining, "MDBList API requests left after the run.")
     except Exception:
         pass
+    log_cache_stats(mdb)
+    return total_added
+
+
+# =============================================================================
+# Daemon Mode
+# =============================================================================
+
+DAEMON_JOBS = ("sync", "cleanup")
+
+
+def _file_mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def _iso(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def query_daemon(config: Dict[str, str], method: str, path: str) -> Optional[dict]:
+    """Call a running daemon's control endpoint; None if no daemon answers."""
+    port = get_int_setting(config, "DAEMON_CONTROL_PORT", minimum=0)
+    if not port:
+        return None
+    try:
+        return HTTP.request(method, f"http://127.0.0.1:{port}{path}", timeout=2).json()
+    except (HTTPError, URLError, OSError, ValueError):
+        return None
+
+
+class SyncDaemon:
+    """
+    Long-running scheduler behind --daemon.
+
+    Keeps the MDBList client, *arr instance handles (with their snapshots)
+    and keep-alive connections warm between runs, and runs sync/cleanup every
+    DAEMON_SYNC_INTERVAL / DAEMON_CLEANUP_INTERVAL seconds. Instances are
+    rediscovered every DAEMON_INSTANCE_REFRESH seconds (or when the config
+    changes); between rediscoveries only their import lists are re-read.
+
+    The config and state files are re-read when their mtime changes (SIGHUP
+    forces a config reload). A control endpoint on 127.0.0.1 serves
+    GET /status and POST /run/sync, POST /run/cleanup.
+    """
+
+    def __init__(self, config: Dict[str, str], state: SyncState, dry_run: bool = False):
+        self.config = config
+        self.state = state
+        self.dry_run = dry_run
+        self.config_mtime = _file_mtime(CONFIG_PATH)
+        self.state_mtime = _file_mtime(STATE_PATH)
+        self.mdb: Optional[MDBListAPI] = None
+        self.radarr_apis: List[Tuple[str, ArrAPI]] = []
+        self.sonarr_apis: List[Tuple[str, ArrAPI]] = []
+        self.instances_loaded_at = 0.0
+        self.started_at = time.time()
+        self.running: Optional[str] = None
+        self.pending: List[str] = []
+        self.last_runs: Dict[str, dict] = {}
+        self.next_runs: Dict[str, float] = {}
+        self.stopping = False
+        self.force_reload = False
+        self.wake = threading.Event()
+        self._lock = threading.Lock()
+        self._server = None
+        self._schedule()
+
+    # -------------------------------------------------------------------------
+    # Scheduling
+    # -------------------------------------------------------------------------
+
+    def _interval(self, job: str) -> int:
+        return get_int_setting(self.config, f"DAEMON_{job.upper()}_INTERVAL", minimum=60)
+
+    def _schedule(self):
+        """Next run per job from the last run times kept in state (survive restarts)."""
+        last = self.state.get("schedule", {})
+        now = time.time()
+        for job in DAEMON_JOBS:
+            self.next_runs[job] = max(now, last.get(job, 0) + self._interval(job))
+
+    def trigger(self, job: str):
+        with self._lock:
+            if job not in self.pending and job != self.running:
+                self.pending.append(job)
+        self.wake.set()
+
+    def stop(self, *_):
+        self.stopping = True
+        self.wake.set()
+
+    def reload(self, *_):
+        self.force_reload = True
+        self.wake.set()
+
+    def _next_job(self) -> Optional[str]:
+        with self._lock:
+            if self.pending:
+                return self.pending.pop(0)
+        now = time.time()
+        due = [job for job in DAEMON_JOBS if self.next_runs[job] <= now]
+        return due[0] if due else None
+
+    # -------------------------------------------------------------------------
+    # Hot reload
+    # -------------------------------------------------------------------------
+
+    def _reload_if_changed(self):
+        config_mtime = _file_mtime(CONFIG_PATH)
+        if self.force_reload or config_mtime != self.config_mtime:
+            self.force_reload = False
+            self.config_mtime = config_mtime
+            self.config = load_config()
+            self.mdb = None
+            self.instances_loaded_at = 0.0
+            configure_retry(self.config)
+            METRICS.path = self.config["METRICS_TEXTFILE"]
+            self._schedule()
+            log("Config reloaded")
+
+        state_mtime = _file_mtime(STATE_PATH)
+        if state_mtime != self.state_mtime:
+            self.state_mtime = state_mtime
+            self.state = load_state()
+            self._schedule()
+            log("State file changed on disk, reloaded")
+
+    def _refresh_instances(self):
+        """Rediscover instances when due; otherwise just re-read their import lists."""
+        max_age = get_int_setting(self.config, "DAEMON_INSTANCE_REFRESH", minimum=0)
+        if not self.instances_loaded_at or time.time() - self.instances_loaded_at >= max_age:
+            self.radarr_apis, self.sonarr_apis = discover_instances(self.config)
+            self.instances_loaded_at = time.time()
+            return
+        apis = [api for _, api in self.radarr_apis + self.sonarr_apis]
+        for api in apis:
+            api.snapshot.invalidate("import_lists")
+        run_parallel([(api.snapshot.load, (["import_lists"],)) for api in apis], max(1, len(apis)))
+
+    # -------------------------------------------------------------------------
+    # Runs
+    # -------------------------------------------------------------------------
+
+    def _run_job(self, job: str):
+        self.running = job
+        started = time.time()
+        result, success = "failed", False
+        METRICS.reset()
+        # Each run gets the full retry budget, and the cache is held to
+        # CACHE_MAX_MB between runs as it is on every cron start
+        if HTTP.retry:
+            HTTP.retry.reset()
+        log(f"\n{Colors.BOLD}Daemon: starting {job} run{Colors.NC}")
+        try:
+            if not self.config["MDBLIST_API_KEY"]:
+                raise RuntimeError(f"MDBLIST_API_KEY is not set in {CONFIG_PATH}")
+            if self.mdb is None:
+                self.mdb = MDBListAPI(self.config["MDBLIST_API_KEY"], ResponseCache.from_config(self.config))
+            elif self.mdb.cache:
+                self.mdb.cache.stats = dict.fromkeys(self.mdb.cache.stats, 0)
+                self.mdb.cache.prune()
+            start_mdblist_run(self.mdb, self.config, self.state)
+            self._refresh_instances()
+            if not self.radarr_apis and not self.sonarr_apis:
+                raise RuntimeError("No Radarr or Sonarr instances found")
+
+            # Recorded before running so a failing job waits a full interval
+            self.state.setdefault("schedule", {})[job] = started
+            if job == "sync":
+                count = run_sync(
+                    self.config, self.state, self.mdb, self.radarr_apis, self.sonarr_apis, self.dry_run,
+                    cleanup=self.config["SYNC_WITH_CLEANUP"].lower() == "true",
+                )
+                result = f"{count} added"
+            else:
+                count = run_cleanup(self.config, self.state, self.mdb, self.radarr_apis, self.sonarr_apis, self.dry_run)
+                result = f"{count} removed"
+            success = True
+        except Exception as e:
+            log_error(f"Daemon: {job} run failed: {e}")
+            # Stale handles are a likely cause; rediscover on the next run
+            self.instances_loaded_at = 0.0
+        finally:
+            self.state_mtime = _file_mtime(STATE_PATH)
+            self.next_runs[job] = time.time() + self._interval(job)
+            self.last_runs[job] = {
+                "started_at": _iso(started),
+                "finished_at": _iso(time.time()),
+                "result": result,
+            }
+            self.running = None
+            METRICS.finish_run(time.time() - started, success, on_error=log_warn)
+        log(f"Daemon: {job} {result}, next run at {_iso(self.next_runs[job])}")
+
+    def serve(self):
+        """Run until SIGTERM/SIGINT."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGHUP, self.reload)
+        configure_retry(self.config)
+        METRICS.path = self.config["METRICS_TEXTFILE"]
+        self._start_control()
+
+        log(f"Daemon started (sync every {self._interval('sync')}s, cleanup every {self._interval('cleanup')}s)")
+        while not self.stopping:
+            self.wake.clear()
+            self._reload_if_changed()
+            job = self._next_job()
+            if job:
+                self._run_job(job)
+                continue
+            # Wake for the next due job, a trigger or a signal; poll the
+            # config/state files at least once a minute
+            wait = min(self.next_runs.values()) - time.time()
+            self.wake.wait(max(1, min(wait, 60)))
+
+        if self._server:
+            self._server.shutdown()
+        log("Daemon stopped")
+
+    # -------------------------------------------------------------------------
+    # Control endpoint
+    # -------------------------------------------------------------------------
+
+    def status(self) -> dict:
+        """Daemon status for GET /status; served from memory, no network calls."""
+        prefix = self.config["LIST_NAME_PREFIX"]
+        with self._lock:
+            pending = list(self.pending)
+        return {
+            "pid": os.getpid(),
+            "started_at": _iso(self.started_at),
+            "running": self.running,
+            "pending": pending,
+            "next_runs": {job: _iso(ts) for job, ts in self.next_runs.items()},
+            "last_runs": dict(self.last_runs),
+            "last_sync": self.state.get("last_sync"),
+            "managed_lists": len(self.state.get("managed_lists", {})),
+            "instances": [
+                instance_status(name, api, prefix, cached_only=True)
+                for name, api in self.radarr_apis + self.sonarr_apis
+            ],
+        }
+
+    def _start_control(self):
+        port = get_int_setting(self.config, "DAEMON_CONTROL_PORT", minimum=0)
+        if not port:
+            return
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, code: int, payload: dict):
+                data = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/status":
+                    self._reply(200, daemon.status())
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                job = self.path.rsplit("/", 1)[-1]
+                if self.path.startswith("/run/") and job in DAEMON_JOBS:
+                    daemon.trigger(job)
+                    self._reply(202, {"queued": job})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def log_message(self, fmt, *args):
+                log_debug(f"Control: {fmt % args}")
+
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        except OSError as e:
+            log_warn(f"Control endpoint disabled (127.0.0.1:{port}): {e}")
+            return
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        log(f"Control endpoint listening on 127.0.0.1:{port}")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def _arg_value(argv: List[str], flag: str) -> Optional[str]:
+    """Value following a flag (e.g. --plan out.json), or None."""
+    if flag not in argv:
+        return None
+    i = argv.index(flag)
+    if i + 1 >= len(argv) or argv[i + 1].startswith("--"):
+        log_error(f"{flag} requires a file path")
+        sys.exit(1)
+    return argv[i + 1]
+
+
+def main():
+    global _debug_mode
+
+    # Parse args
+    argv = sys.argv[1:]
+    args = set(argv)
+
+    if "--help" in args or "-h" in args:
+        print(__doc__.strip())
+        sys.exit(0)
+
+    dry_run = "--dry-run" in args
+    cleanup = "--cleanup" in args
+    with_cleanup = "--with-cleanup" in args
+    status = "--status" in args
+    daemon = "--daemon" in args
+    no_cache = "--no-cache" in args
+    full_refresh = "--full-refresh" in args
+    plan_path = _arg_value(argv, "--plan")
+    apply_path = _arg_value(argv, "--apply")
+    _debug_mode = "--debug" in args
+
+    if dry_run:
+        log("Dry-run mode: no changes will be made")
+
+    # Load config
+    config = load_config()
+    state = load_state()
+    with_cleanup = with_cleanup or config["SYNC_WITH_CLEANUP"].lower() == "true"
+
+    # A running daemon answers --status from memory, without rediscovery
+    if status:
+        info = query_daemon(config, "GET", "/status")
+        if info:
+            show_status(info["last_sync"], info["managed_lists"], info["instances"], daemon=info)
+            return
+
+    # Applying a plan talks to the *arr instances only
+    if apply_path:
+        METRICS.path = config["METRICS_TEXTFILE"]
+        configure_retry(config)
+        if not apply_plan(config, state, apply_path, dry_run):
+            sys.exit(1)
+        return
+
+    if not config["MDBLIST_API_KEY"]:
+        log_error("MDBLIST_API_KEY is required. Get one from https://mdblist.com/preferences/")
+        log_error(f"Set it in {CONFIG_PATH} or via environment variable")
+        sys.exit(1)
+
+    if daemon:
+        SyncDaemon(config, state, dry_run).serve()
+        return
+
+    if not status:
+        METRICS.path = config["METRICS_TEXTFILE"]
+    configure_retry(config)
+
+    # Connect to MDBList (--status only reads the instances)
+    mdb = None
+    if not status:
+        mdb = MDBListAPI(config["MDBLIST_API_KEY"], ResponseCache.from_config(config, read=not no_cache))
+        try:
+            start_mdblist_run(mdb, config, state)
+        except Exception as e:
+            log_error(f"Failed to connect to MDBList API: {e}")
+            sys.exit(1)
+
+    # Discover *arr instances
+    radarr_apis, sonarr_apis = discover_instances(config)
+
+    if not radarr_apis and not sonarr_apis:
+        log_error("No Radarr or Sonarr instances found")
+        sys.exit(1)
+
+    # Status mode
+    if status:
+        prefix = config["LIST_NAME_PREFIX"]
+        instances = [instance_status(name, api, prefix) for name, api in radarr_apis + sonarr_apis]
+        show_status(state.get("last_sync"), len(state.get("managed_lists", {})), instances)
+        return
+
+    plan = None
+    if plan_path:
+        plan = SyncPlan("cleanup" if cleanup else "sync+cleanup" if with_cleanup else "sync", config["LIST_NAME_PREFIX"])
+        for name, api in radarr_apis + sonarr_apis:
+            plan.register(name, api)
+
+    # Cleanup mode
+    if cleanup:
+        run_cleanup(config, state, mdb, radarr_apis, sonarr_apis, dry_run, plan)
+    else:
+        run_sync(config, state, mdb, radarr_apis, sonarr_apis, dry_run, full_refresh, plan, with_cleanup)
+
+    if plan:
+        plan.write(plan_path)
+        log_success(f"Plan written to {plan_path} ({plan.summary()}); apply with --apply {plan_path}")
 
 
 if __name__ == "__main__":
-    main()
+    METRICS.run(main, on_error=log_warn)
@@ -1,7 +1,7 @@
 #!/bin/bash
 # mdblist-sync installer
 # Deploys MDBList auto-sync for Sonarr & Radarr
-# Usage: bash mdblist-sync.sh [--remove] [--run] [--status]
+# Usage: bash mdblist-sync.sh [--remove] [--run] [--status] [--daemon]
 
 set -euo pipefail
 
@@ -11,9 +11,14 @@ set -euo pipefail
 
 SCRIPT_SRC="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/mdblist-sync.py"
 SCRIPT_DST="/usr/local/bin/mdblist-sync"
+LIB_SRC_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib"
+LIB_DST_DIR="/opt/swizzin-extras/lib"
+LIB_MODULES=(http_utils.py metrics.py arr_registry.py)
 CONFIG_EXAMPLE="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/configs/mdblist-sync.conf.example"
 CONFIG_DST="/opt/swizzin-extras/mdblist-sync.conf"
 STATE_FILE="/opt/swizzin-extras/mdblist-sync.state.json"
+CACHE_DIR="/opt/swizzin-extras/mdblist-sync.cache"
+METRICS_FILE="/opt/swizzin-extras/metrics/mdblist-sync.prom"
 LEGACY_DST="/opt/swizzin-extras/mdblist-sync.py"
 SERVICE_NAME="mdblist-sync"
 LOG_FILE="/var/log/mdblist-sync.log"
@@ -30,6 +35,20 @@ echo_error() { echo -e "\033[0;31m[ERROR]\033[0m $*" >&2; }
 # Escape a string for safe use in sed replacement (handles &, |, \)
 _sed_escape_value() { printf '%s' "$1" | sed 's/[&|\\]/\\&/g'; }
 
+# Deploy the shared Python modules the script imports
+_deploy_lib() {
+    mkdir -p "$LIB_DST_DIR"
+    local module
+    for module in "${LIB_MODULES[@]}"; do
+        if [[ ! -f "${LIB_SRC_DIR}/${module}" ]]; then
+            echo_error "Shared module not found: ${LIB_SRC_DIR}/${module}"
+            exit 1
+        fi
+        cp "${LIB_SRC_DIR}/${module}" "${LIB_DST_DIR}/${module}"
+        chmod 644 "${LIB_DST_DIR}/${module}"
+    done
+}
+
 # ==============================================================================
 # Cleanup Trap (rollback partial install on failure)
 # ==============================================================================
@@ -102,6 +121,7 @@ _install() {
     fi
     cp "$SCRIPT_SRC" "$SCRIPT_DST"
     chmod +x "$SCRIPT_DST"
+    _deploy_lib
     echo_ok "Script deployed to $SCRIPT_DST"
 
     # Clean up legacy location
@@ -393,6 +413,55 @@ EOF
     echo_info "Schedule: daily sync at 03:00, weekly cleanup on Sundays at 04:00"
 }
 
+# ==============================================================================
+# Daemon Mode
+# ==============================================================================
+
+# Replace the sync/cleanup timers with one long-running daemon that keeps
+# connections and caches warm and schedules both runs itself
+_install_daemon() {
+    if [[ ! -f "$SCRIPT_DST" ]]; then
+        echo_error "Script not installed. Run: bash $0"
+        exit 1
+    fi
+
+    cat >"/etc/systemd/system/${SERVICE_NAME}-daemon.service" <<EOF
+[Unit]
+Description=MDBList Auto-Sync daemon for Sonarr/Radarr
+After=network-online.target
+Wants=network-online.target
+
+[Service]
+Type=simple
+ExecStart=${SCRIPT_DST} --daemon
+ExecReload=/bin/kill -HUP \$MAINPID
+Restart=on-failure
+RestartSec=30
+TimeoutStopSec=300
+Environment=MDBLIST_SYNC_CONFIG=${CONFIG_DST}
+Environment=MDBLIST_SYNC_STATE=${STATE_FILE}
+StandardOutput=append:${LOG_FILE}
+StandardError=append:${LOG_FILE}
+
+[Install]
+WantedBy=multi-user.target
+EOF
+    echo_ok "Systemd daemon service created"
+
+    # The daemon schedules sync and cleanup itself
+    systemctl disable --now "${SERVICE_NAME}.timer" 2>/dev/null || true
+    systemctl disable --now "${SERVICE_NAME}-cleanup.timer" 2>/dev/null || true
+    systemctl daemon-reload
+    systemctl enable --now "${SERVICE_NAME}-daemon.service"
+    echo_ok "Daemon enabled and started (timers disabled)"
+
+    echo ""
+    echo_info "Status:         bash $0 --status"
+    echo_info "Trigger a run:  curl -X POST http://127.0.0.1:11551/run/sync   (or /run/cleanup)"
+    echo_info "Reload config:  automatic on change, or systemctl reload ${SERVICE_NAME}-daemon"
+    echo_info "Back to timers: systemctl disable --now ${SERVICE_NAME}-daemon && systemctl enable --now ${SERVICE_NAME}.timer ${SERVICE_NAME}-cleanup.timer"
+}
+
 # ==============================================================================
 # Remove
 # ==============================================================================
@@ -405,23 +474,30 @@ _remove() {
     systemctl stop "${SERVICE_NAME}-cleanup.timer" 2>/dev/null || true
     systemctl disable "${SERVICE_NAME}.timer" 2>/dev/null || true
     systemctl disable "${SERVICE_NAME}-cleanup.timer" 2>/dev/null || true
+    systemctl disable --now "${SERVICE_NAME}-daemon.service" 2>/dev/null || true
 
     # Remove systemd units
     rm -f "/etc/systemd/system/${SERVICE_NAME}.service"
     rm -f "/etc/systemd/system/${SERVICE_NAME}.timer"
     rm -f "/etc/systemd/system/${SERVICE_NAME}-cleanup.service"
     rm -f "/etc/systemd/system/${SERVICE_NAME}-cleanup.timer"
+    rm -f "/etc/systemd/system/${SERVICE_NAME}-daemon.service"
     systemctl daemon-reload
     echo_ok "Systemd units removed"
 
     # Remove script (keep config and state for re-install)
     rm -f "$SCRIPT_DST"
     rm -f "$LEGACY_DST"
+    local module
+    for module in "${LIB_MODULES[@]}"; do
+        rm -f "${LIB_DST_DIR}/${module}"
+    done
+    rmdir "$LIB_DST_DIR" 2>/dev/null || true
     echo_ok "Script removed"
 
     echo_info "Config preserved at: $CONFIG_DST"
     echo_info "State preserved at: $STATE_FILE"
-    echo_info "To fully clean up: rm -f $CONFIG_DST $STATE_FILE $LOG_FILE"
+    echo_info "To fully clean up: rm -rf $CONFIG_DST $STATE_FILE ${STATE_FILE}.bak $CACHE_DIR $METRICS_FILE $LOG_FILE"
     echo ""
     echo_warn "Note: Import lists added to Sonarr/Radarr are NOT removed."
     echo_warn "To clean them up, run --cleanup before removing"
@@ -458,12 +534,20 @@ case "${1:-}" in
     --status)
         _run --status
         ;;
+    --daemon)
+        _install_daemon
+        ;;
     *)
         if [[ -f "/etc/systemd/system/${SERVICE_NAME}.timer" ]]; then
             echo_info "Already installed. Updating script..."
             cp "$SCRIPT_SRC" "$SCRIPT_DST"
             chmod +x "$SCRIPT_DST"
+            _deploy_lib
             echo_ok "Script updated at $SCRIPT_DST"
+            if systemctl is-active --quiet "${SERVICE_NAME}-daemon.service" 2>/dev/null; then
+                systemctl restart "${SERVICE_NAME}-daemon.service"
+                echo_ok "Daemon restarted"
+            fi
             echo_info "Use --run to test, --remove to uninstall"
         else
             _install
@@ -0,0 +1,145 @@
+"""Tests for arr-maintenance.py duplicate detection and instance tasks."""
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_module():
+    sys.argv = ["arr-maintenance.py"]
+    spec = importlib.util.spec_from_file_location("arr_maintenance", ROOT / "arr-maintenance.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+am = load_module()
+
+
+def movie(movie_id, title, year, votes=100, **extra):
+    return am.Movie({
+        "id": movie_id,
+        "title": title,
+        "year": year,
+        "tmdbId": 1000 + movie_id,
+        "imdbId": f"tt{movie_id:07d}",
+        "ratings": {"imdb": {"votes": votes}},
+        **extra,
+    })
+
+
+def grouped_ids(movies):
+    return sorted(sorted(m.id for m in g.movies) for g in am.find_duplicates(movies))
+
+
+class FindDuplicatesTest(unittest.TestCase):
+
+    def test_different_films_in_one_collection_and_year_are_kept(self):
+        collection = {"tmdbId": 2344}
+        movies = [
+            movie(1, "The Matrix Reloaded", 2003, votes=600000, collection=collection),
+            movie(2, "The Matrix Revolutions", 2003, votes=400, collection=collection),
+        ]
+        self.assertEqual(grouped_ids(movies), [])
+
+    def test_numbered_films_in_one_collection_and_year_are_kept(self):
+        collection = {"tmdbId": 10}
+        movies = [
+            movie(1, "Anthology Part 1", 2010, votes=50000, collection=collection),
+            movie(2, "Anthology Part 2", 2010, votes=300, collection=collection),
+        ]
+        self.assertEqual(grouped_ids(movies), [])
+
+    def test_retitled_entry_in_one_collection_and_year_matches(self):
+        collection = {"tmdbId": 1241}
+        movies = [
+            movie(1, "Harry Potter and the Philosopher's Stone", 2001, votes=800000, collection=collection),
+            movie(2, "Harry Potter and the Sorcerer's Stone", 2001, votes=12, collection=collection),
+        ]
+        self.assertEqual(grouped_ids(movies), [[1, 2]])
+
+    def test_same_title_and_year_match(self):
+        movies = [movie(1, "Heat", 1995, votes=700000), movie(2, "heat.", 1995, votes=650000)]
+        self.assertEqual(grouped_ids(movies), [[1, 2]])
+
+    def test_normalized_titles_match_when_one_is_clearly_inferior(self):
+        movies = [movie(1, "Amélie", 2001, votes=800000), movie(2, "Amelie", 2001, votes=40),
+                  movie(3, "Rocky II", 1979, votes=230000), movie(4, "Rocky 2", 1979, votes=15),
+                  movie(5, "X", 2022)]
+        self.assertEqual(grouped_ids(movies), [[1, 2], [3, 4]])
+
+    def test_titles_differing_only_by_article_are_kept(self):
+        movies = [movie(1, "The Hunt", 2020, votes=120000), movie(2, "Hunt", 2020, votes=9000)]
+        self.assertEqual(grouped_ids(movies), [])
+
+    def test_alias_equal_to_other_title_is_kept(self):
+        movies = [
+            movie(1, "Vanishing Point", 1997, votes=5000, alternateTitles=[{"title": "The Hunted"}]),
+            movie(2, "The Hunted", 1997, votes=8000),
+        ]
+        self.assertEqual(grouped_ids(movies), [])
+
+    def test_alias_equal_to_other_title_matches_when_one_is_clearly_inferior(self):
+        movies = [
+            movie(1, "Le fabuleux destin d'Amélie Poulain", 2001, votes=30, originalTitle="Amélie"),
+            movie(2, "Amélie", 2001, votes=800000),
+        ]
+        self.assertEqual(grouped_ids(movies), [[1, 2]])
+
+    def test_shared_alias_alone_does_not_match(self):
+        movies = [
+            movie(1, "Amor", 2012, alternateTitles=[{"title": "Love"}]),
+            movie(2, "Liebe", 2012, alternateTitles=[{"title": "Love"}]),
+        ]
+        self.assertEqual(grouped_ids(movies), [])
+
+
+class InstanceTaskTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self._log_file, am.LOG_FILE = am.LOG_FILE, str(Path(self.tmp.name) / "arr-maintenance.log")
+        self._grace, am.DEADLINE_GRACE = am.DEADLINE_GRACE, 0
+        self.addCleanup(setattr, am, "LOG_FILE", self._log_file)
+        self.addCleanup(setattr, am, "DEADLINE_GRACE", self._grace)
+
+    def test_abandoned_api_refuses_mutating_requests(self):
+        api = am.ArrAPI("http://127.0.0.1:9", "key")
+        api.abandoned = True
+        with self.assertRaises(am.TaskAbandoned):
+            api.delete("/queue/1")
+        with self.assertRaises(am.TaskAbandoned):
+            api.delete_bulk("/movie/editor", {"movieIds": [1]})
+        with self.assertRaises(am.TaskAbandoned):
+            api._request("PUT", "/movie/1", {})
+
+    def test_hung_task_is_abandoned_and_cannot_change_the_instance(self):
+        def hang(name, api):
+            while not api.abandoned:
+                am.time.sleep(0.05)
+            try:
+                api.delete("/queue/1")
+            except am.TaskAbandoned:
+                am.log("late delete blocked")
+            raise RuntimeError("late failure")
+
+        task = am.InstanceTask("queue", "sonarr", am.ArrAPI("http://127.0.0.1:9", "key"), hang)
+        with contextlib.redirect_stdout(io.StringIO()):
+            am.run_instance_tasks([task], workers=1, deadline=1)
+        self.assertTrue(task.done.wait(5))
+        self.assertIsNotNone(task.abandoned_after)
+        self.assertFalse(task.complete)
+        self.assertEqual(task.outcome(), "abandoned, no response after the deadline")
+        self.assertEqual(task.status, "failed")
+        self.assertTrue(any("late delete blocked" in line for line in task.lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
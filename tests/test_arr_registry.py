@@ -0,0 +1,113 @@
+"""Tests for lib/arr_registry.py discovery and its mtime-keyed cache."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "lib"))
+
+import arr_registry  # noqa: E402
+
+CONFIG_XML = "<Config><Port>{port}</Port><ApiKey>key{port}</ApiKey><UrlBase>{base}</UrlBase></Config>"
+
+
+class RegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.home = os.path.join(tmp.name, "home")
+        self.cache = os.path.join(tmp.name, "cache", "arr-registry.json")
+        os.makedirs(self.home)
+        patcher = mock.patch.object(arr_registry, "_master_user", return_value="")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        arr_registry._memo.clear()
+        self.addCleanup(arr_registry._memo.clear)
+
+    def write_config(self, user, dirname, port, base=""):
+        directory = os.path.join(self.home, user, ".config", dirname)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "config.xml")
+        existed = os.path.exists(path)
+        with open(path, "w") as f:
+            f.write(CONFIG_XML.format(port=port, base=base))
+        if existed:
+            # Make the rewrite visible even on coarse-mtime filesystems
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        return path
+
+    def discover(self, **kwargs):
+        return arr_registry.discover(home=self.home, cache_path=self.cache, **kwargs)
+
+    def rediscover(self, **kwargs):
+        """discover() as a new process would run it: no in-memory memo."""
+        arr_registry._memo.clear()
+        return self.discover(**kwargs)
+
+    def test_scan_names_instances_and_normalizes_url_base(self):
+        self.write_config("alice", "Radarr", 7878, "radarr/")
+        self.write_config("alice", "Radarr4k", 7879)
+        self.write_config("alice", "sonarr_anime", 8990)
+        self.write_config("alice", "Plex", 32400)
+        found = {inst.name: inst for inst in self.discover()}
+        self.assertEqual(sorted(found), ["radarr", "radarr-4k", "sonarr-anime"])
+        self.assertEqual(found["radarr"].url(), "http://127.0.0.1:7878/radarr")
+        self.assertEqual(arr_registry.find("Radarr4k", home=self.home, cache_path=self.cache).port, "7879")
+        self.assertEqual([inst.name for inst in self.discover(kind="sonarr")], ["sonarr-anime"])
+
+    def test_unchanged_tree_is_served_from_the_cache(self):
+        self.write_config("alice", "Radarr", 7878)
+        self.discover()
+        with mock.patch.object(arr_registry, "scan", side_effect=AssertionError("rescanned")):
+            self.assertEqual([inst.port for inst in self.rediscover()], ["7878"])
+
+    def test_reconfigured_instance_invalidates_the_cache(self):
+        self.write_config("alice", "Radarr", 7878)
+        self.discover()
+        self.write_config("alice", "Radarr", 9000)
+        self.assertEqual([inst.port for inst in self.rediscover()], ["9000"])
+
+    def test_added_and_removed_instances_invalidate_the_cache(self):
+        self.write_config("alice", "Radarr", 7878)
+        self.discover()
+        self.write_config("alice", "Sonarr", 8989)
+        self.assertEqual(sorted(inst.name for inst in self.rediscover()), ["radarr", "sonarr"])
+        shutil.rmtree(os.path.join(self.home, "alice", ".config", "Radarr"))
+        self.assertEqual([inst.name for inst in self.rediscover()], ["sonarr"])
+
+    def test_new_user_invalidates_the_cache(self):
+        self.write_config("alice", "Radarr", 7878)
+        self.discover()
+        self.write_config("bob", "Radarr", 7000)
+        self.write_config("bob", "Lidarr", 8686)
+        found = {inst.name: inst for inst in self.rediscover()}
+        # Same name under another user is skipped in favour of the first user's
+        self.assertEqual(found["radarr"].user, "alice")
+        self.assertEqual(found["lidarr"].user, "bob")
+
+    def test_memo_is_used_until_refresh(self):
+        self.write_config("alice", "Radarr", 7878)
+        self.discover()
+        self.write_config("alice", "Radarr", 9000)
+        self.assertEqual(self.discover()[0].port, "7878")
+        self.assertEqual(self.discover(refresh=True)[0].port, "9000")
+
+    def test_master_user_falls_back_to_first_user(self):
+        self.write_config("zed", "Radarr", 7878)
+        self.write_config("alice", "Radarr", 7000)
+        self.assertEqual(arr_registry.master_user(self.home), "alice")
+        with mock.patch.object(arr_registry, "_master_user", return_value="zed"):
+            self.assertEqual(arr_registry.master_user(self.home), "zed")
+            arr_registry._memo.clear()
+            self.assertEqual(self.discover(refresh=True)[0].user, "zed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""Tests for lib/http_utils.py retries, circuit breaking and streamed JSON parsing."""
+
+import json
+import sys
+import time
+import unittest
+from pathlib import Path
+from urllib.error import HTTPError
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "lib"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_servers import _FakeServer  # noqa: E402
+from http_utils import CircuitOpenError, HTTPClient, RetryPolicy, iter_json_array  # noqa: E402
+
+
+class ScriptedServer(_FakeServer):
+    """Answers each request with the next (status, payload, headers) in `responses`, then 200s."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+
+    def handle(self, method, path, query, body, headers):
+        with self._lock:
+            if self.responses:
+                return self.responses.pop(0)
+        return 200, {"ok": True}, {}
+
+    def requests(self) -> int:
+        return sum(self.counts().values())
+
+
+def policy(**kwargs):
+    kwargs.setdefault("base_delay", 0.001)
+    kwargs.setdefault("max_delay", 0.001)
+    return RetryPolicy(**kwargs)
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_retries_transient_statuses_for_idempotent_methods_only(self):
+        retry = policy()
+        self.assertIsNotNone(retry.next_delay("GET", 1, status=500, headers={}))
+        self.assertIsNotNone(retry.next_delay("POST", 1, status=503, headers={}))
+        self.assertIsNone(retry.next_delay("POST", 1, status=500, headers={}))
+        self.assertIsNone(retry.next_delay("GET", 1, status=404, headers={}))
+        self.assertIsNone(retry.next_delay("GET", retry.max_attempts, status=500, headers={}))
+
+    def test_honours_retry_after_and_rate_limit_headers(self):
+        retry = policy(max_wait=10)
+        delay = retry.next_delay("GET", 1, status=429, headers={"Retry-After": "3"})
+        self.assertGreaterEqual(delay, 3)
+        self.assertLess(delay, 4)
+        delay = retry.next_delay("GET", 1, status=429,
+                                 headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "2"})
+        self.assertGreaterEqual(delay, 2)
+        # A wait longer than max_wait (e.g. a daily quota reset) is not retried
+        self.assertIsNone(retry.next_delay("GET", 1, status=429, headers={"Retry-After": "3600"}))
+
+    def test_retry_budget_is_shared_and_refilled_by_reset(self):
+        retry = policy(retry_budget=2)
+        self.assertIsNotNone(retry.next_delay("GET", 1, status=503, headers={}))
+        self.assertIsNotNone(retry.next_delay("GET", 1, status=503, headers={}))
+        self.assertIsNone(retry.next_delay("GET", 1, status=503, headers={}))
+        retry.reset()
+        self.assertIsNotNone(retry.next_delay("GET", 1, status=503, headers={}))
+
+    def test_half_open_circuit_lets_one_trial_through(self):
+        retry = policy(circuit_threshold=2, circuit_cooldown=0.05)
+        for _ in range(2):
+            retry.before_request("host")
+            retry.record("host", False)
+        with self.assertRaises(CircuitOpenError):
+            retry.before_request("host")
+        time.sleep(0.06)
+        retry.before_request("host")
+        # Only one trial at a time while half-open
+        with self.assertRaises(CircuitOpenError):
+            retry.before_request("host")
+        retry.record("host", True)
+        retry.before_request("host")
+        retry.before_request("host")
+
+    def test_failed_trial_reopens_the_circuit(self):
+        retry = policy(circuit_threshold=1, circuit_cooldown=0.05)
+        retry.record("host", False)
+        time.sleep(0.06)
+        retry.before_request("host")
+        retry.record("host", False)
+        with self.assertRaises(CircuitOpenError):
+            retry.before_request("host")
+        self.assertEqual(retry.stats["circuit_trips"], 2)
+
+
+class HTTPClientRetryTest(unittest.TestCase):
+
+    def test_retries_after_retry_after_then_succeeds(self):
+        with ScriptedServer([(503, {}, {"Retry-After": "0"}), (429, {}, {"Retry-After": "0"})]) as server:
+            client = HTTPClient(timeout=5, retry=policy())
+            self.assertEqual(client.get_json(f"{server.url}/x"), {"ok": True})
+            self.assertEqual(server.requests(), 3)
+            self.assertEqual(client.retry.stats["retries"], 2)
+
+    def test_post_is_not_replayed_after_a_server_error(self):
+        with ScriptedServer([(500, {}, {})]) as server:
+            client = HTTPClient(timeout=5, retry=policy())
+            with self.assertRaises(HTTPError) as ctx:
+                client.request("POST", f"{server.url}/x", body=b"{}")
+            self.assertEqual(ctx.exception.code, 500)
+            self.assertEqual(server.requests(), 1)
+
+    def test_open_circuit_fails_fast_without_sending(self):
+        with ScriptedServer([(500, {}, {})] * 10) as server:
+            client = HTTPClient(timeout=5, retry=policy(max_attempts=1, circuit_threshold=2))
+            for _ in range(2):
+                with self.assertRaises(HTTPError):
+                    client.request("GET", f"{server.url}/x")
+            with self.assertRaises(CircuitOpenError):
+                client.request("GET", f"{server.url}/x")
+            self.assertEqual(server.requests(), 2)
+
+
+def split(text: str, size: int):
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class IterJsonArrayTest(unittest.TestCase):
+
+    def test_parses_elements_split_across_chunks(self):
+        items = [{"title": "Amélie", "year": 2001}, 2.5, -17, 1e3, "x,]", None, True, [1, [2]]]
+        text = json.dumps(items)
+        for size in (1, 2, 3, 7, len(text)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(split(text, size))), items)
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([b" [ ", b" ] "])), [])
+
+    def test_rejects_malformed_separators(self):
+        for text in ("[1,,2]", "[1,]", "[,1]", "[1 2]", "[1:2]", "{}", ""):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(split(text, 2)))
+
+    def test_rejects_truncated_input(self):
+        text = json.dumps([{"id": 1}, {"id": 2, "title": "cut"}])
+        for end in (len(text) - 1, len(text) - 5, 12, 1):
+            with self.subTest(end=end):
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(split(text[:end], 4)))
+
+    def test_truncated_input_still_yields_complete_elements_first(self):
+        elements = iter_json_array(split('[{"id": 1}, {"id": 2', 3))
+        self.assertEqual(next(elements), {"id": 1})
+        with self.assertRaises(ValueError):
+            next(elements)
+
+
+if __name__ == "__main__":
+    unittest.main()
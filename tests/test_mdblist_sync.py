@@ -0,0 +1,377 @@
+"""Tests for mdblist-sync.py import list syncing against a fake Radarr."""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_servers import FakeArr  # noqa: E402
+
+
+def load_module():
+    spec = importlib.util.spec_from_file_location("mdblist_sync", ROOT / "mdblist-sync.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ms = load_module()
+
+RADARR_DEFAULTS = {
+    "searchOnAdd": False,
+    "monitor": "movieOnly",
+    "minimumAvailability": "released",
+    "qualityProfileId": 1,
+    "rootFolderPath": "/data/radarr",
+}
+
+
+def mdb_list(list_id, **extra):
+    return {"id": list_id, "name": f"List {list_id}", "user_name": "user", "slug": f"list-{list_id}",
+            "likes": 100 - list_id, "items": 50, **extra}
+
+
+class SettingsTest(unittest.TestCase):
+
+    def get_float(self, value, minimum=0.0):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            result = ms.get_float_setting({"POLL_COST_OUTLIER": value}, "POLL_COST_OUTLIER", minimum)
+        return result, out.getvalue()
+
+    def test_float_setting_parses_valid_values(self):
+        self.assertEqual(self.get_float("2.5"), (2.5, ""))
+        self.assertEqual(self.get_float("0"), (0.0, ""))
+
+    def test_float_setting_falls_back_to_default_with_a_warning(self):
+        for value in ("four", "nan", "inf"):
+            result, output = self.get_float(value)
+            self.assertEqual(result, float(ms.DEFAULTS["POLL_COST_OUTLIER"]))
+            self.assertIn("Invalid POLL_COST_OUTLIER", output)
+
+    def test_float_setting_is_clamped_to_minimum(self):
+        self.assertEqual(self.get_float("-3", minimum=1.0)[0], 1.0)
+        self.assertEqual(self.get_float("", minimum=1.0)[0], float(ms.DEFAULTS["POLL_COST_OUTLIER"]))
+
+
+def managed(instance, mdblist_id, import_list_id, likes=10):
+    return {"instance": instance, "mdblist_id": mdblist_id, "import_list_id": import_list_id,
+            "likes": likes, "added_at": "2026-01-01T00:00:00Z"}
+
+
+class ManagedListIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ms.ManagedListIndex({
+            "radarr:1": managed("radarr", 1, 11),
+            "radarr-4k:1": managed("radarr-4k", 1, 21),
+            "radarr:2": managed("radarr", 2, 12),
+        })
+
+    def test_lookups(self):
+        self.assertEqual(self.index.get("radarr", 12)["mdblist_id"], 2)
+        self.assertIsNone(self.index.get("radarr", 21))
+        self.assertEqual(sorted(e["instance"] for e in self.index.for_mdblist(1)), ["radarr", "radarr-4k"])
+        self.assertEqual(sorted(e["mdblist_id"] for e in self.index.for_instance("radarr")), [1, 2])
+
+    def test_add_replaces_and_remove_unindexes(self):
+        self.index.add("radarr:2", managed("radarr", 2, 99))
+        self.assertIsNone(self.index.get("radarr", 12))
+        self.assertEqual(self.index.get("radarr", 99)["mdblist_id"], 2)
+        self.assertEqual(len(self.index), 3)
+        self.index.remove("radarr", 2)
+        self.assertIsNone(self.index.get("radarr", 99))
+        self.assertEqual(self.index.for_mdblist(2), [])
+        self.assertNotIn("radarr:2", self.index.entries)
+
+    def test_observe_records_one_history_point_per_day_and_compact_trims(self):
+        entry = self.index.get("radarr", 11)
+        entry["history"] = [[f"2025-01-{day:02d}", day] for day in range(1, 31)] * 3
+        self.index.observe(1, 500, items=40)
+        self.index.observe(1, 600)
+        self.assertEqual(entry["likes"], 600)
+        self.assertEqual(entry["items"], 40)
+        self.assertEqual(entry["history"][-1][1], 600)
+        self.assertEqual(entry["history"][-2][1], 30)
+        self.assertEqual(self.index.get("radarr-4k", 21)["likes"], 600)
+        self.index.compact()
+        self.assertEqual(len(entry["history"]), ms.STATE_HISTORY_POINTS)
+
+
+class StateFileTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "state.json"
+        self._state_path, ms.STATE_PATH = ms.STATE_PATH, str(self.path)
+        self.addCleanup(setattr, ms, "STATE_PATH", self._state_path)
+
+    def test_save_keeps_the_previous_state_as_backup(self):
+        ms.save_state(ms.SyncState({"managed_lists": {"radarr:1": managed("radarr", 1, 11)}}))
+        ms.save_state(ms.SyncState({"managed_lists": {}}))
+        self.assertEqual(ms.load_state()["managed_lists"], {})
+        with open(f"{self.path}.bak") as f:
+            self.assertIn("radarr:1", json.load(f)["managed_lists"])
+        self.assertEqual([p.name for p in self.path.parent.iterdir() if p.suffix == ".tmp"], [])
+
+    def test_corrupt_state_falls_back_to_backup(self):
+        ms.save_state(ms.SyncState({"managed_lists": {"radarr:1": managed("radarr", 1, 11)}}))
+        ms.save_state(ms.SyncState({"managed_lists": {"radarr:1": managed("radarr", 1, 11)}}))
+        self.path.write_text('{"managed_lists": {"radarr:1"')
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            state = ms.load_state()
+        self.assertIn("radarr:1", state["managed_lists"])
+        self.assertIn("restored from backup", out.getvalue())
+        self.assertEqual(state.managed.get("radarr", 11)["mdblist_id"], 1)
+
+    def test_failed_write_leaves_the_state_untouched(self):
+        ms.save_state(ms.SyncState({"managed_lists": {"radarr:1": managed("radarr", 1, 11)}}))
+        before = self.path.read_text()
+        with self.assertRaises(TypeError):
+            ms.save_state(ms.SyncState({"managed_lists": {}, "bad": object()}))
+        self.assertEqual(self.path.read_text(), before)
+        self.assertEqual([p.name for p in self.path.parent.iterdir() if p.suffix == ".tmp"], [])
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_prune_evicts_least_recently_read_entries_first(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ms.ResponseCache(tmp, {"list": 60}, max_bytes=10**6)
+            for key in ("read", "unread", "newest"):
+                cache.put(key, "/lists/1", {"key": key, "pad": "x" * 200})
+            for age, key in ((300, "read"), (200, "unread"), (100, "newest")):
+                path = Path(tmp) / f"{key}.json"
+                os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+            self.assertEqual(cache.get("read")["body"]["key"], "read")
+            cache.max_bytes = sum((Path(tmp) / f"{key}.json").stat().st_size for key in ("read", "newest"))
+            cache.prune()
+            self.assertEqual(sorted(p.stem for p in Path(tmp).glob("*.json")), ["newest", "read"])
+
+
+class NoBulkArr(FakeArr):
+    """FakeArr of an older version without DELETE /importlist/bulk."""
+
+    def handle(self, method, path, query, body, headers):
+        if path == "/api/v3/importlist/bulk":
+            return 405, {"message": "Method Not Allowed"}, {}
+        return super().handle(method, path, query, body, headers)
+
+
+class ImportListValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeArr("radarr")
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.api = ms.ArrAPI(self.server.url, self.server.api_key)
+
+    def payload(self, **defaults):
+        return ms.build_radarr_import_list(mdb_list(1), dict(RADARR_DEFAULTS, **defaults), "[MDB]")
+
+    def test_valid_payload_has_no_problems(self):
+        self.assertEqual(self.api.validate_import_list(self.payload()), [])
+        # Root folders compare without a trailing slash
+        self.assertEqual(self.api.validate_import_list(self.payload(rootFolderPath="/data/radarr/")), [])
+
+    def test_problems_are_reported(self):
+        self.assertEqual(self.api.validate_import_list(self.payload(qualityProfileId=9)),
+                         ["quality profile 9 does not exist"])
+        self.assertEqual(self.api.validate_import_list(self.payload(rootFolderPath="/elsewhere")),
+                         ["root folder /elsewhere does not exist"])
+        payload = self.payload()
+        payload["fields"].append({"name": "listId", "value": "1"})
+        self.assertEqual(self.api.validate_import_list(payload), ["unknown field 'listId'"])
+        payload = dict(self.payload(), implementation="TraktListImport")
+        self.assertEqual(self.api.validate_import_list(payload), ["implementation TraktListImport not available"])
+
+    def test_schema_is_fetched_once(self):
+        for _ in range(3):
+            self.api.validate_import_list(self.payload())
+        self.assertEqual(self.server.counts()["GET /api/v3/importlist/schema"], 1)
+
+    def sync(self, lists, defaults=RADARR_DEFAULTS):
+        state = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            added = ms.sync_lists_to_instance(
+                "radarr", self.api, lists, 10, defaults, ms.build_radarr_import_list, "[MDB]", state, dry_run=False,
+            )
+        return added, state["result"]
+
+    def test_invalid_lists_are_skipped_without_a_post(self):
+        added, result = self.sync([mdb_list(i) for i in range(1, 4)], dict(RADARR_DEFAULTS, qualityProfileId=9))
+        self.assertEqual((added, result["invalid"]), (0, 3))
+        self.assertNotIn("POST /api/v3/importlist", self.server.counts())
+
+    def test_list_whose_name_is_taken_is_skipped(self):
+        self.server._add_import_list({"name": "[MDB] List 2", "fields": []})
+        added, result = self.sync([mdb_list(i) for i in range(1, 4)])
+        self.assertEqual((added, result["invalid"]), (2, 1))
+        self.assertEqual(self.server.counts()["POST /api/v3/importlist"], 2)
+
+
+class DeleteImportListsTest(unittest.TestCase):
+
+    def delete(self, server, count=3):
+        ids = [server._add_import_list({"name": f"[MDB] {i}", "fields": []})["id"] for i in range(count)]
+        api = ms.ArrAPI(server.url, server.api_key)
+        errors = api.delete_import_lists(ids + [999])
+        return api, ids, errors
+
+    def test_bulk_delete_is_one_request(self):
+        with FakeArr("radarr") as server:
+            api, ids, errors = self.delete(server)
+            self.assertEqual(errors, dict.fromkeys(ids + [999]))
+            self.assertEqual(server.import_lists, {})
+            self.assertTrue(api.bulk_delete)
+            self.assertEqual(server.counts(), {"DELETE /api/v3/importlist/bulk": 1})
+
+    def test_falls_back_to_single_deletes_without_bulk_support(self):
+        with NoBulkArr("radarr") as server:
+            api, ids, errors = self.delete(server)
+            self.assertEqual(server.import_lists, {})
+            self.assertIs(api.bulk_delete, False)
+            self.assertEqual([i for i, error in errors.items() if error], [999])
+            self.assertEqual(server.counts()["DELETE /api/v3/importlist/{id}"], 4)
+            # Known unsupported: the next batch skips the bulk endpoint
+            server.reset_counts()
+            api.delete_import_lists([1, 2])
+            self.assertNotIn("DELETE /api/v3/importlist/bulk", server.counts())
+
+
+class FailingArr(FakeArr):
+    """FakeArr whose import list POSTs answer with `status`, after creating the list if `creates`."""
+
+    def __init__(self, status=500, creates=False, **kwargs):
+        super().__init__("radarr", **kwargs)
+        self.status = status
+        self.creates = creates
+
+    def handle(self, method, path, query, body, headers):
+        if method == "POST" and path == "/api/v3/importlist":
+            if self.creates:
+                self._add_import_list(body or {})
+            return self.status, {"message": "failed"}, {}
+        return super().handle(method, path, query, body, headers)
+
+
+class SyncListsToInstanceTest(unittest.TestCase):
+
+    def sync(self, server, lists, max_lists=10):
+        api = ms.ArrAPI(server.url, server.api_key)
+        state = {}
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            added = ms.sync_lists_to_instance(
+                "radarr", api, lists, max_lists, RADARR_DEFAULTS,
+                ms.build_radarr_import_list, "[MDB]", state, dry_run=False, workers=2,
+            )
+        return added, state
+
+    def test_adds_lists_up_to_the_slot_limit(self):
+        with FakeArr("radarr") as server:
+            added, state = self.sync(server, [mdb_list(i) for i in range(1, 6)], max_lists=3)
+            self.assertEqual(added, 3)
+            self.assertEqual(len(server.import_lists), 3)
+            self.assertEqual(len(state["managed_lists"]), 3)
+
+    def test_server_error_stops_additions_to_the_instance(self):
+        with FailingArr(status=500) as server:
+            added, state = self.sync(server, [mdb_list(i) for i in range(1, 9)])
+            self.assertEqual(added, 0)
+            # Only the first batch was sent
+            self.assertEqual(server.counts().get("POST /api/v3/importlist"), 2)
+            self.assertEqual(state["result"]["failed"], 2)
+            self.assertNotIn("managed_lists", state)
+
+    def test_list_created_by_a_failed_post_is_adopted(self):
+        with FailingArr(status=500, creates=True) as server:
+            added, state = self.sync(server, [mdb_list(i) for i in range(1, 9)])
+            self.assertEqual(added, 2)
+            self.assertEqual(len(server.import_lists), 2)
+            ids = sorted(entry["import_list_id"] for entry in state["managed_lists"].values())
+            self.assertEqual(ids, sorted(server.import_lists))
+            self.assertEqual(state["result"]["failed"], 0)
+
+
+class ApplyPlanTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self._state_path, ms.STATE_PATH = ms.STATE_PATH, str(self.tmp / "state.json")
+        self.addCleanup(setattr, ms, "STATE_PATH", self._state_path)
+        self._discover = ms.discover_instances
+        ms.discover_instances = lambda config: ([("radarr", ms.ArrAPI(self.server.url, self.server.api_key))], [])
+        self.addCleanup(setattr, ms, "discover_instances", self._discover)
+        self.server = FakeArr("radarr")
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.path = str(self.tmp / "plan.json")
+
+    def write_plan(self):
+        api = ms.ArrAPI(self.server.url, self.server.api_key)
+        plan = ms.SyncPlan("sync", "[MDB]")
+        plan.register("radarr", api)
+        lst = mdb_list(1)
+        url = ms.get_list_url(lst)
+        payload = ms.build_radarr_import_list(lst, RADARR_DEFAULTS, "[MDB]")
+        plan.add("radarr", lst, payload, ms.managed_entry("radarr", lst, url, None))
+        plan.write(self.path)
+        with open(self.path) as f:
+            return json.load(f)
+
+    def apply(self):
+        state = ms.SyncState({"managed_lists": {}})
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()) as err:
+            ok = ms.apply_plan(ms.DEFAULTS, state, self.path, dry_run=False)
+        return ok, state, err.getvalue()
+
+    def test_applies_a_valid_plan(self):
+        self.write_plan()
+        ok, state, _ = self.apply()
+        self.assertTrue(ok)
+        self.assertEqual(len(self.server.import_lists), 1)
+        import_list_id = next(iter(self.server.import_lists))
+        self.assertIsNotNone(state.managed.get("radarr", import_list_id))
+
+    def test_rejects_plan_when_the_instance_changed(self):
+        self.write_plan()
+        self.server._add_import_list({"name": "Added by hand", "fields": []})
+        ok, _, err = self.apply()
+        self.assertFalse(ok)
+        self.assertIn("changed since the plan was made", err)
+        self.assertNotIn("POST /api/v3/importlist", self.server.counts())
+
+    def test_rejects_malformed_plans(self):
+        plan = self.write_plan()
+        planned = plan["instances"]["radarr"]
+        broken = [
+            [],
+            dict(plan, mode=None),
+            dict(plan, instances=[]),
+            dict(plan, instances={"radarr": dict(planned, add=None)}),
+            dict(plan, instances={"radarr": dict(planned, add=[{"payload": {}}])}),
+            dict(plan, instances={"radarr": dict(planned, remove=[{"import_list_id": 3}])}),
+            dict(plan, instances={"radarr": {k: v for k, v in planned.items() if k != "fingerprint"}}),
+        ]
+        for shape in broken:
+            with self.subTest(shape=shape):
+                with open(self.path, "w") as f:
+                    json.dump(shape, f)
+                ok, _, err = self.apply()
+                self.assertFalse(ok)
+                self.assertIn("Malformed plan", err)
+        self.assertNotIn("POST /api/v3/importlist", self.server.counts())
+
+
+if __name__ == "__main__":
+    unittest.main()